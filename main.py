@@ -1,68 +1,163 @@
-from src.core.network import DynamicNetwork
-from src.simulation.engine import SimulationEngine
-from src.models.function_registry import MODEL_FUNCTIONS
-from src.config.config import BASE_DESIGNS, generate_weighting_scenarios
-from src.reporting.summary import print_iteration_summary
-from src.visualization.visualize_graph import visualize_network_graph, plot_domain_scores, plot_base_design_comparison, plot_weighting_impact
-from src.reporting.pdf_report import generate_pdf_report
+import argparse
+import os
 
-def run_scenario(config, model_functions, plot_hypergraph=True):
-    """Helper function to set up and run a single simulation scenario."""
-    scenario_name = config['name']
-    print("==========================================================")
-    print(f"RUNNING SCENARIO: {scenario_name}")
-    
-    network = DynamicNetwork()
-    network.load_from_config(config)
+from src.instrumentation.log import LEVELS, configure
+from src.instrumentation.profile import FORMATS as TRACE_FORMATS, NULL_PROFILER, Profiler, write_trace
+from src.simulation.runner import run_scenarios, iter_batches
+from src.simulation.cache import ModelCache, ResultCache
+from src.results.store import write_results
+from src.results.reducers import BestSoFar, Collect, ModelCacheCalls, Profiles, ToStore, reduce
+from src.config.config import BASE_DESIGNS, DESIGN_SPACE, META_SCORE_DEFINITIONS, SENSITIVITY_RANGES, UNCERTAINTIES, iter_weighting_scenarios
+from src.config.loader import load_designs
+from src.analysis.monte_carlo import run_monte_carlo, uncertainties_from_config
+from src.analysis.ranking import definitions_from_config, rank
+from src.analysis.sensitivity import METHODS as SENSITIVITY_METHODS, run_sensitivity
+from src.optimization.optimizer import optimize
+from src.optimization.space import space_from_config
+from src.optimization.strategies import STRATEGIES
+from src.visualization.plot_results import print_value_propagation
+from src.reporting.summary import print_iteration_summary, print_monte_carlo_summary, print_optimization_summary, print_ranking, print_sensitivity_summary
+# Plotting and the PDF report (hypernetx, matplotlib, seaborn, pandas, fpdf) are
+# imported where they are used, so --headless runs and worker processes only load NumPy.
 
-    engine = SimulationEngine(network, model_functions)
-    results = engine.run(scenario_name=scenario_name)
-    
-    safe_name = scenario_name.replace(' ', '_').replace('/', '_')
-    
-    # Only plot the hypergraph if requested (to avoid redundancy in the weighting study)
-    if plot_hypergraph:
-        visualize_network_graph(results['final_network'], safe_name)
-        
-    plot_domain_scores(results, safe_name)
-    
-    results['config'] = config
-    
-    return results
+def safe_file_name(scenario_name):
+    return scenario_name.replace(' ', '_').replace('/', '_')
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the MBSE design and weighting study.")
+    parser.add_argument('--designs', nargs='+', metavar='FILE', default=None, help="Base designs from JSON/YAML scenario files or network snapshots (.snap) instead of config.py")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for the simulations (default: all CPUs)")
+    parser.add_argument('--monte-carlo', type=int, default=0, metavar='SAMPLES', help="Also run a Monte Carlo uncertainty analysis with this many samples")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the Monte Carlo analysis, the sensitivity analysis and the design optimizer")
+    parser.add_argument('--sensitivity', type=int, default=0, metavar='SAMPLES', help="Also run a global sensitivity analysis over SENSITIVITY_RANGES (Sobol base samples or Morris trajectories)")
+    parser.add_argument('--sensitivity-method', choices=SENSITIVITY_METHODS, default='sobol', help="Sensitivity method: Sobol indices or Morris elementary effects")
+    parser.add_argument('--optimize', type=int, default=0, metavar='EVALUATIONS', help="Also search DESIGN_SPACE for the best variant of each base design with this many evaluations per design")
+    parser.add_argument('--optimizer', choices=tuple(STRATEGIES), default='cmaes', help="Search strategy of the design optimizer")
+    parser.add_argument('--log-level', choices=LEVELS, default='info', help="Detail of the simulation log ('debug' adds per-node and per-term lines)")
+    parser.add_argument('--log-json', action='store_true', help="Log structured JSON events to stderr instead of text")
+    parser.add_argument('--cache', metavar='FILE', default=None, help="Keep simulation results in this SQLite file and reuse them across runs")
+    parser.add_argument('--no-cache', action='store_true', help="Simulate every scenario, even repeated ones")
+    parser.add_argument('--no-model-cache', action='store_true', help="Run every model function, even for node attributes evaluated before (also kept in --cache)")
+    parser.add_argument('--results', metavar='DIR', default=None, help="Save the results as columnar result stores in this directory and report from them")
+    parser.add_argument('--results-format', choices=('arrow', 'parquet'), default='arrow', help="File format of the result stores")
+    parser.add_argument('--headless', action='store_true', help="Only simulate and print the summaries: no plots and no PDF report")
+    parser.add_argument('--report-summary-only', action='store_true', help="Summarize every scenario as one table row in the PDF report instead of per-scenario pages")
+    parser.add_argument('--report-batch-pages', type=int, default=None, metavar='PAGES', help="Write the PDF report as several files of about this many pages each")
+    parser.add_argument('--render-cache', metavar='DIR', default='.render_cache', help="Keep hypergraph layouts and figure hashes here, so unchanged figures are not redrawn")
+    parser.add_argument('--history', type=int, nargs='?', const=0, default=None, metavar='DEPTH', help="Record the base designs' scores after every iteration (only the last DEPTH iterations with a depth), print them and plot their convergence")
+    parser.add_argument('--profile', metavar='FILE', default=None, help="Time the stages, simulation phases, model functions and iterations and write a trace to this file")
+    parser.add_argument('--profile-format', choices=TRACE_FORMATS, default='chrome', help="Trace format: Chrome trace (chrome://tracing, Perfetto) or speedscope")
+    args = parser.parse_args()
+    configure(args.log_level, json_events=args.log_json)
+    profiler = Profiler() if args.profile else NULL_PROFILER
+    profile = args.profile is not None
+    # Identical scenarios (e.g. the Balanced variants of Stage 1 and Stage 2) are simulated once.
+    cache = None if args.no_cache else ResultCache(path=args.cache)
+    # Nodes shared between designs (the base nodes) have their models evaluated once.
+    model_cache = None if args.no_model_cache else ModelCache(path=args.cache)
+    model_calls = ModelCacheCalls()
+    base_designs = load_designs(args.designs) if args.designs else BASE_DESIGNS
+
     # --- PART 1: Compare the three main design concepts with BALANCED weights ---
     print("\n\n--- STAGE 1: COMPARING BASE DESIGNS (BALANCED WEIGHTS) ---\n")
-    base_design_results = []
-    for base_design_config in BASE_DESIGNS:
-        # Create the "Balanced" version for the base comparison
-        balanced_config = generate_weighting_scenarios(base_design_config)[0]
-        iteration_results = run_scenario(balanced_config, MODEL_FUNCTIONS, plot_hypergraph=True)
-        base_design_results.append(iteration_results)
-    
+    # Create the "Balanced" version for the base comparison
+    balanced_configs = [next(iter_weighting_scenarios(base_design_config)) for base_design_config in base_designs]
+    # Cached results carry no score history, so recorded runs skip the cache.
+    history = False if args.history is None else (args.history or True)
+    with profiler.phase('stage_1'):
+        base_design_results = run_scenarios(balanced_configs, workers=args.workers, cache=None if history else cache,
+                                            profile=profile, history=history, model_cache=model_cache)
+    for results in base_design_results:
+        model_calls.add(results)
+    histories = {results['scenario_name']: results['history'] for results in base_design_results if results.get('history')}
+
     # --- PART 2: Run uncertainty analysis on ALL base designs ---
     print("\n\n--- STAGE 2: UNCERTAINTY ANALYSIS (VARYING WEIGHTS) ---\n")
-    weighting_study_results = []
-    for base_design_config in BASE_DESIGNS:
-        # Generate all 4 weighting variations for the current base design
-        weighting_variations = generate_weighting_scenarios(base_design_config)
-        
-        for scenario_config in weighting_variations:
-            # We don't need to plot the hypergraph again for these variations
-            iteration_results = run_scenario(scenario_config, MODEL_FUNCTIONS, plot_hypergraph=False)
-            weighting_study_results.append(iteration_results)
-            
+    # All weighting variations of a design share its topology, so each design runs as one batch.
+    # The variants are lazy overlays on the base designs and their results stream into
+    # reducers: an on-disk store with --results, otherwise a plain list.
+    weighting_variations = (iter_weighting_scenarios(base_design_config) for base_design_config in base_designs)
+    weighting_sink = ToStore(os.path.join(args.results, 'weighting_study'), args.results_format) if args.results else Collect()
+    with profiler.phase('stage_2'):
+        weighting_study_results, (best_variant,), weighting_profiles, _ = reduce(
+            iter_batches(weighting_variations, workers=args.workers, cache=cache, profile=profile, model_cache=model_cache),
+            weighting_sink, BestSoFar(), Profiles(), model_calls)
+    print(f"\nBest weighting variant: '{best_variant['scenario_name']}' (meta score {best_variant['meta_score']:.4f})")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"\nResult cache: {stats['hits']} hits, {stats['misses']} misses")
+    if model_cache is not None:
+        stats = model_calls.result()
+        print(f"Model cache: {stats['hits']} hits, {stats['misses']} misses")
+
+    if args.results:
+        # Report from the saved stores, exactly as a later analysis session would.
+        base_design_results = write_results(base_design_results, os.path.join(args.results, 'base_designs'), args.results_format)
+
+    monte_carlo_study = None
+    if args.monte_carlo:
+        print("\n\n--- STAGE 2b: MONTE CARLO UNCERTAINTY ANALYSIS ---\n")
+        with profiler.phase('monte_carlo'):
+            monte_carlo_study = run_monte_carlo(base_designs, uncertainties_from_config(UNCERTAINTIES),
+                                                n_samples=args.monte_carlo, seed=args.seed)
+
+    optimization_studies = None
+    if args.optimize:
+        print("\n\n--- STAGE 2c: DESIGN OPTIMIZATION ---\n")
+        design_space = space_from_config(DESIGN_SPACE)
+        with profiler.phase('optimization'):
+            optimization_studies = [optimize(design, design_space, args.optimizer, budget=args.optimize,
+                                             seed=args.seed, workers=args.workers)
+                                    for design in base_designs]
+
+    sensitivity_study = None
+    if args.sensitivity:
+        print("\n\n--- STAGE 2d: GLOBAL SENSITIVITY ANALYSIS ---\n")
+        with profiler.phase('sensitivity'):
+            sensitivity_study = run_sensitivity(base_designs, space_from_config(SENSITIVITY_RANGES), args.sensitivity_method,
+                                                n_samples=args.sensitivity, seed=args.seed)
+
     # --- PART 3: Generate Final Report ---
-    # Print a summary of all 12 runs to the console
+    # Print the weighting study summaries, and those of the optional stages, to the console
     print_iteration_summary(weighting_study_results)
-    
-    # Create the plot for the initial base design comparison
-    base_comparison_chart_path = "base_design_comparison_chart.png"
-    plot_base_design_comparison(base_design_results, base_comparison_chart_path)
-    
-    # Create the plot for the weighting uncertainty study
-    weighting_chart_path = "weighting_impact_summary.png"
-    plot_weighting_impact(weighting_study_results, weighting_chart_path)
-    
-    # Generate the final PDF report with both sets of results
-    generate_pdf_report(base_design_results, base_comparison_chart_path, weighting_study_results, weighting_chart_path)
+    print_ranking(rank(weighting_study_results, definitions_from_config(META_SCORE_DEFINITIONS)))
+    for name, history in histories.items():
+        print_value_propagation(history, scenario_name=name)
+    if monte_carlo_study:
+        print_monte_carlo_summary(monte_carlo_study)
+    if sensitivity_study:
+        print_sensitivity_summary(sensitivity_study)
+    if optimization_studies:
+        print_optimization_summary(optimization_studies)
+
+    # --- PART 4: Render plots from the finished results and the PDF report ---
+    if not args.headless:
+        from src.visualization.render import render, scenario_jobs, summary
+        from src.reporting.pdf_report import generate_pdf_report
+
+        base_comparison_chart_path = "base_design_comparison_chart.png"
+        weighting_chart_path = "weighting_impact_summary.png"
+        figures = [('base_comparison', base_comparison_chart_path, summary(base_design_results)),
+                   ('weighting_impact', weighting_chart_path, summary(weighting_study_results))]
+        if not args.report_summary_only:
+            # We don't need to plot the hypergraph again for the weighting variations
+            figures = (scenario_jobs(base_design_results, plot_hypergraph=True, file_name=safe_file_name)
+                       + scenario_jobs(weighting_study_results, plot_hypergraph=False, file_name=safe_file_name)
+                       + figures)
+        figures += [('convergence', f"convergence_{safe_file_name(name)}.png", (history, name))
+                    for name, history in histories.items()]
+        with profiler.phase('render'):
+            render(figures, workers=args.workers, cache_dir=args.render_cache)
+
+        # Generate the final PDF report with both sets of results
+        with profiler.phase('pdf_report'):
+            generate_pdf_report(base_design_results, base_comparison_chart_path, weighting_study_results, weighting_chart_path,
+                                summary_only=args.report_summary_only, batch_pages=args.report_batch_pages)
+
+    if profile:
+        # One track for the stages of this run, one per simulated scenario or batch.
+        scenario_profiles = {f"Stage 1: {results['scenario_name']}": results['profile']
+                             for results in base_design_results if results.get('profile')}
+        scenario_profiles.update({f"Stage 2: {name}": report for name, report in weighting_profiles.items()})
+        write_trace({'main': profiler.report(), **scenario_profiles}, args.profile, args.profile_format)
+        print(f"\nWrote {args.profile_format} trace to {args.profile}")
@@ -0,0 +1,166 @@
+import numpy as np
+
+from ..core.graph_components import Node
+from ..core.network import DynamicNetwork
+from ..models.function_registry import MODEL_FUNCTIONS, VECTORIZED_MODEL_FUNCTIONS
+from ..simulation.engine import SimulationEngine
+from ..simulation.propagation import CompiledNetwork
+
+class AttributeParameter:
+    """An input attribute of one node, e.g. ('material_assessment', 'face_sheet_modulus')."""
+    def __init__(self, node_id, attribute):
+        self.node_id = node_id
+        self.attribute = attribute
+
+    @property
+    def name(self):
+        return f"{self.node_id}.{self.attribute}"
+
+    def __repr__(self):
+        return f"AttributeParameter({self.name})"
+
+class WeightParameter:
+    """The weight of every value/functionality edge source -> target carrying `label`."""
+    def __init__(self, kind, source, target, label):
+        if kind not in CompiledNetwork.KINDS:
+            raise ValueError(f"Unknown edge kind '{kind}', expected one of {CompiledNetwork.KINDS}")
+        self.kind = kind
+        self.source = source
+        self.target = target
+        self.label = label
+
+    @property
+    def name(self):
+        return f"{self.kind}:{self.source}->{self.target}:{self.label}"
+
+    def __repr__(self):
+        return f"WeightParameter({self.name})"
+
+class BatchEvaluator:
+    """
+    Evaluates many parameter samples of one scenario in vectorized batches.
+
+    The network is built and compiled once. Each batch of samples only rewrites the
+    internal scores of the nodes whose attributes are sampled and the sampled edge
+    weights, then propagates all samples together through `SimulationEngine`.
+    Models with a vectorized form run once per batch instead of once per sample.
+    """
+    def __init__(self, config, parameters, model_functions=None, meta_weights=None,
+                 vectorized_functions=None, **engine_options):
+        self.parameters = list(parameters)
+        self.meta_weights = meta_weights
+        self.engine_options = engine_options
+        self.network = DynamicNetwork()
+        self.network.load_from_config(config)
+        self.model_functions = model_functions or MODEL_FUNCTIONS
+        if vectorized_functions is None:
+            # Only trust a vectorized form if the scalar form it mirrors is the one in use.
+            vectorized_functions = {path: function for path, function in VECTORIZED_MODEL_FUNCTIONS.items()
+                                    if self.model_functions.get(path) is MODEL_FUNCTIONS.get(path)}
+        self.vectorized_functions = vectorized_functions
+        self.engine = SimulationEngine(self.network, self.model_functions)
+        self.engine.evaluate_models()
+        self.compiled = CompiledNetwork(self.network)
+        self.tables, self.internal = self.engine.batch_tables(self.compiled, 1)
+        self.base_weights = {kind: self.compiled.edges[kind].weights for kind in CompiledNetwork.KINDS}
+
+        # Resolve every parameter to the node row or edge positions it changes.
+        self.sampled_nodes = {}
+        self.edge_positions = []
+        for j, parameter in enumerate(self.parameters):
+            if isinstance(parameter, AttributeParameter):
+                node = self.network.get_node(parameter.node_id)
+                if node is None or node.function_path not in self.model_functions:
+                    raise ValueError(f"{parameter} does not refer to a node with a registered model function")
+                self.sampled_nodes.setdefault(parameter.node_id, []).append(j)
+                self.edge_positions.append(None)
+            else:
+                self.edge_positions.append(self._edge_positions(parameter))
+
+    def _edge_positions(self, parameter):
+        edges = self.compiled.edges[parameter.kind]
+        index = self.compiled.node_index
+        if parameter.label not in edges.label_index or parameter.source not in index or parameter.target not in index:
+            raise ValueError(f"{parameter} does not match any edge of the network")
+        positions = np.flatnonzero((edges.sources == index[parameter.source])
+                                   & (edges.targets == index[parameter.target])
+                                   & (edges.label_ids == edges.label_index[parameter.label]))
+        if not positions.size:
+            raise ValueError(f"{parameter} does not match any edge of the network")
+        return positions
+
+    def base_value(self, parameter):
+        """The value a parameter has in the scenario config."""
+        j = self.parameters.index(parameter)
+        if isinstance(parameter, AttributeParameter):
+            attributes = self.network.get_node(parameter.node_id).attributes
+            if parameter.attribute not in attributes:
+                raise ValueError(f"{parameter} is not set in the scenario config")
+            return attributes[parameter.attribute]
+        return self.base_weights[parameter.kind][self.edge_positions[j][0]]
+
+    def evaluate(self, columns):
+        """
+        Evaluates a batch of S samples, given as one array of S values per parameter
+        (in parameter order). Returns {'meta_score': (S,), 'overall_scores': {name: (S,)}}.
+        """
+        columns = [np.asarray(column) for column in columns]
+        if len(columns) != len(self.parameters):
+            raise ValueError(f"Expected {len(self.parameters)} sample columns, got {len(columns)}")
+        n_samples = len(columns[0]) if columns else 1
+
+        values = {kind: np.repeat(internal, n_samples, axis=0) for kind, internal in self.internal.items()}
+        for node_id, parameter_ids in self.sampled_nodes.items():
+            self._evaluate_node(node_id, [self.parameters[j].attribute for j in parameter_ids],
+                                [columns[j] for j in parameter_ids], values)
+
+        stack = {kind: np.repeat(weights[None], n_samples, axis=0) for kind, weights in self.base_weights.items()}
+        for j, positions in enumerate(self.edge_positions):
+            if positions is not None:
+                stack[self.parameters[j].kind][:, positions] = columns[j].astype(float)[:, None]
+
+        self.engine.propagate_batch(self.compiled, values, stack, **self.engine_options)
+        return {
+            "meta_score": self.engine.batch_meta_scores(self.compiled, self.tables, values, self.meta_weights),
+            "overall_scores": self.engine.batch_overall_scores(self.tables, values, exact=False),
+        }
+
+    def _evaluate_node(self, node_id, attributes, columns, values):
+        """Re-runs one node's model function for all samples and writes its internal scores."""
+        node = self.network.get_node(node_id)
+        i = self.compiled.node_index[node_id]
+        n_samples = len(columns[0])
+
+        vectorized = self.vectorized_functions.get(node.function_path)
+        if vectorized is not None:
+            outputs = vectorized({**node.attributes, **dict(zip(attributes, columns))})
+            for kind, scores in outputs.items():
+                for label, score in scores.items():
+                    column = self._label_column(kind, label, i, values)
+                    values[kind][:, i, column] = np.broadcast_to(score, (n_samples,))
+            return
+
+        function = self.model_functions[node.function_path]
+        for s in range(n_samples):
+            overrides = {attribute: column[s].item() for attribute, column in zip(attributes, columns)}
+            sample = Node(node.id, node.domain, node.type, {**node.attributes, **overrides}, node.function_path)
+            function(sample)
+            for kind in CompiledNetwork.KINDS:
+                for label, score in getattr(sample, f"{kind}_scores").items():
+                    column = self._label_column(kind, label, i, values)
+                    values[kind][s, i, column] = score
+
+    def _label_column(self, kind, label, i, values):
+        """
+        The column of `label` in the `kind` tables. A label the base run did not
+        produce gets a new zero column (kept for later batches) and joins node i's scores.
+        """
+        labels, key_order = self.tables[kind]
+        if label not in labels:
+            labels.append(label)
+            self.internal[kind] = np.pad(self.internal[kind], ((0, 0), (0, 0), (0, 1)))
+            values[kind] = np.pad(values[kind], ((0, 0), (0, 0), (0, 1)))
+        column = labels.index(label)
+        if column not in key_order[i]:
+            key_order[i].append(column)
+        return column
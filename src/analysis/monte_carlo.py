@@ -0,0 +1,112 @@
+import logging
+
+import numpy as np
+
+from .batch import AttributeParameter, WeightParameter, BatchEvaluator
+
+log = logging.getLogger(__name__)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+class Uncertainty:
+    """
+    A distribution declared on a node attribute or an edge weight.
+
+    `distribution` names a numpy.random.Generator method ('normal', 'uniform',
+    'triangular', 'lognormal', 'beta', 'choice', ...) called with `params`.
+    With relative=True the draws multiply the value the parameter has in each
+    design, so one declaration fits designs with different baselines.
+    `bounds` clips the final values, e.g. (0.0, 1.0) for edge weights.
+    """
+    def __init__(self, parameter, distribution, *params, relative=False, bounds=None):
+        self.parameter = parameter
+        self.distribution = distribution
+        self.params = params
+        self.relative = relative
+        self.bounds = bounds
+
+    def draw(self, rng, size):
+        return getattr(rng, self.distribution)(*self.params, size=size)
+
+    def apply(self, draws, base_value=None):
+        """Turns raw draws into parameter values for one design."""
+        values = draws * base_value if self.relative else draws
+        if self.bounds is not None:
+            values = np.clip(values, *self.bounds)
+        return values
+
+    def __repr__(self):
+        return f"Uncertainty({self.parameter.name} ~ {self.distribution}{self.params})"
+
+def uncertainties_from_config(entries):
+    """Builds Uncertainty objects from the declarative entries in src/config/config.py."""
+    uncertainties = []
+    for entry in entries:
+        if 'attribute' in entry:
+            parameter = AttributeParameter(*entry['attribute'])
+        else:
+            parameter = WeightParameter(*entry['weight'])
+        distribution, *params = entry['distribution']
+        uncertainties.append(Uncertainty(parameter, distribution, *params,
+                                         relative=entry.get('relative', False), bounds=entry.get('bounds')))
+    return uncertainties
+
+def run_monte_carlo(designs, uncertainties, n_samples=10000, seed=0, batch_size=4096,
+                    model_functions=None, **engine_options):
+    """
+    Monte Carlo uncertainty analysis of one or more design configs.
+
+    Every uncertainty is drawn once from its own seeded stream and shared by all
+    designs (common random numbers), so the designs are compared on the same
+    draws. Each design is evaluated in vectorized batches of `batch_size` samples
+    without copying its config. Returns the raw samples per design and a summary
+    with means, percentiles and the probability each design ranks best.
+    """
+    streams = np.random.SeedSequence(seed).spawn(len(uncertainties))
+    draws = [u.draw(np.random.default_rng(stream), n_samples) for u, stream in zip(uncertainties, streams)]
+    parameters = [u.parameter for u in uncertainties]
+
+    samples = {}
+    for design in designs:
+        log.info("--- Monte Carlo: %s (%d samples) ---", design['name'], n_samples)
+        evaluator = BatchEvaluator(design, parameters, model_functions, **engine_options)
+        columns = [u.apply(d, evaluator.base_value(u.parameter) if u.relative else None)
+                   for u, d in zip(uncertainties, draws)]
+        meta_scores = np.empty(n_samples)
+        overall_scores = {}
+        for start in range(0, n_samples, batch_size):
+            stop = min(start + batch_size, n_samples)
+            batch = evaluator.evaluate([column[start:stop] for column in columns])
+            meta_scores[start:stop] = batch['meta_score']
+            for name, scores in batch['overall_scores'].items():
+                overall_scores.setdefault(name, np.empty(n_samples))[start:stop] = scores
+        samples[design['name']] = {
+            "meta_score": meta_scores,
+            "overall_scores": overall_scores,
+            "parameters": {p.name: column for p, column in zip(parameters, columns)},
+        }
+
+    names = list(samples)
+    stacked = np.array([samples[name]['meta_score'] for name in names])
+    wins = np.bincount(np.argmax(stacked, axis=0), minlength=len(names)) / n_samples
+    summary = {}
+    for name, probability in zip(names, wins):
+        summary[name] = {
+            "meta_score": describe(samples[name]['meta_score']),
+            "overall_scores": {key: describe(scores) for key, scores in samples[name]['overall_scores'].items()},
+            "probability_best": float(probability),
+        }
+    return {
+        "n_samples": n_samples,
+        "seed": seed,
+        "uncertainties": [repr(u) for u in uncertainties],
+        "samples": samples,
+        "summary": summary,
+    }
+
+def describe(values):
+    """Mean, standard deviation and percentiles of a sample array."""
+    stats = {"mean": float(np.mean(values)), "std": float(np.std(values))}
+    for percentile, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        stats[f"p{percentile}"] = float(value)
+    return stats
@@ -0,0 +1,109 @@
+import numpy as np
+
+from ..results.store import ResultStore
+from ..simulation.engine import DEFAULT_META_WEIGHTS
+
+class MetaScoreDefinition:
+    """
+    A named meta score: the sum of weight * score over (node, label) terms.
+
+    `weights` maps node ids to {label: weight}, as in DEFAULT_META_WEIGHTS. A label
+    is looked up in the node's value scores first, then its functionality scores.
+    """
+    def __init__(self, name, weights):
+        self.name = name
+        self.weights = {node_id: dict(labels) for node_id, labels in weights.items()}
+
+    @property
+    def terms(self):
+        return [(node_id, label, weight) for node_id, labels in self.weights.items()
+                for label, weight in labels.items()]
+
+    def __repr__(self):
+        return f"MetaScoreDefinition({self.name})"
+
+DEFAULT_DEFINITION = MetaScoreDefinition('Default', DEFAULT_META_WEIGHTS)
+
+def definitions_from_config(entries):
+    """Builds MetaScoreDefinitions from a {name: weights} mapping such as META_SCORE_DEFINITIONS."""
+    return [MetaScoreDefinition(name, weights) for name, weights in entries.items()]
+
+def score_tensor(results, features):
+    """
+    The (results x features) matrix of final scores, one column per (node_id, label)
+    feature; scores a result does not have are 0.
+    """
+    tensor = np.zeros((len(results), len(features)))
+    for r, result in enumerate(results):
+        states = result['node_states']
+        for f, (node_id, label) in enumerate(features):
+            state = states.get(node_id)
+            if state is None:
+                continue
+            score = state['final_value_scores'].get(label)
+            if score is None:
+                score = state['final_functionality_scores'].get(label, 0.0)
+            tensor[r, f] = score
+    return tensor
+
+def weight_matrix(definitions):
+    """The (features x definitions) weight matrix of `definitions` and its feature list."""
+    features = list(dict.fromkeys((node_id, label) for d in definitions for node_id, label, _ in d.terms))
+    column = {feature: f for f, feature in enumerate(features)}
+    weights = np.zeros((len(features), len(definitions)))
+    for d, definition in enumerate(definitions):
+        for node_id, label, weight in definition.terms:
+            weights[column[node_id, label], d] += weight
+    return weights, features
+
+class Ranking:
+    """
+    Meta scores of many results under many definitions, with their ranks.
+
+    `scores[r, d]` is the meta score of result r under definition d and `ranks[r, d]`
+    its place among all results (1 = best; ties keep result order).
+    """
+    def __init__(self, names, definitions, scores):
+        self.names = list(names)
+        self.definitions = list(definitions)
+        self.scores = scores
+        order = np.argsort(-scores, axis=0, kind='stable')
+        self.ranks = np.empty_like(order)
+        np.put_along_axis(self.ranks, order, np.arange(1, len(scores) + 1)[:, None], axis=0)
+
+    def _column(self, definition):
+        if definition is None:
+            return 0
+        names = [d.name for d in self.definitions]
+        if definition not in names:
+            raise KeyError(f"Unknown meta score definition '{definition}'")
+        return names.index(definition)
+
+    def table(self, definition=None, top=None):
+        """Rows {'rank', 'scenario', 'meta_score'} best first, for one definition (default: the first)."""
+        d = self._column(definition)
+        order = np.argsort(self.ranks[:, d])[:top]
+        return [{"rank": int(self.ranks[r, d]), "scenario": self.names[r], "meta_score": float(self.scores[r, d])}
+                for r in order]
+
+    def best(self):
+        """{definition name: best scenario name}."""
+        winners = np.argmin(self.ranks, axis=0) if len(self.names) else []
+        return {definition.name: self.names[r] for definition, r in zip(self.definitions, winners)}
+
+    def mean_rank(self):
+        """{scenario name: mean rank over all definitions}, a robustness measure across weightings."""
+        return {name: float(rank) for name, rank in zip(self.names, self.ranks.mean(axis=1))}
+
+def rank(results, definitions=None):
+    """
+    Ranks result payloads (or results dicts, or a ResultStore) under meta score
+    definitions in one matrix product: (results x features) scores @ (features x
+    definitions) weights.
+    """
+    definitions = list(definitions) if definitions is not None else [DEFAULT_DEFINITION]
+    weights, features = weight_matrix(definitions)
+    if isinstance(results, ResultStore):
+        return Ranking(results.names, definitions, results.score_matrix(features) @ weights)
+    scores = score_tensor(results, features) @ weights
+    return Ranking([result['scenario_name'] for result in results], definitions, scores)
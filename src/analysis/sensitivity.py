@@ -0,0 +1,182 @@
+"""
+Global sensitivity analysis of the meta score and overall scores to node
+attributes and edge weights.
+
+Parameters and their ranges are a DesignSpace (src/optimization/space.py), so
+samples are drawn in the unit hypercube and decoded to parameter values.
+Two methods are available:
+
+- 'morris': elementary effects along random one-at-a-time trajectories on a
+  grid of `levels` levels. Cheap screening, r * (k + 1) evaluations for r
+  trajectories and k parameters; mu* ranks influence, sigma flags interactions
+  and nonlinearity.
+- 'sobol': Saltelli sample matrices A, B and AB_i from a scrambled Sobol
+  sequence, N * (k + 2) evaluations for N base samples. First-order indices
+  (Saltelli 2010) give the share of output variance a parameter explains on its
+  own, total-order indices (Jansen) include all its interactions.
+
+All samples of a design go through one BatchEvaluator in vectorized batches,
+so the network is built and compiled once per design, not once per sample.
+Elementary effects are per full parameter range (unit coordinates).
+"""
+import logging
+import warnings
+
+import numpy as np
+
+from .batch import BatchEvaluator
+from ..instrumentation.log import event
+
+log = logging.getLogger(__name__)
+
+METHODS = ('sobol', 'morris')
+
+def morris_trajectories(rng, n_trajectories, dimension, levels=4):
+    """
+    `n_trajectories` Morris trajectories in [0, 1]^dimension, as an
+    (n_trajectories x (dimension + 1) x dimension) array. Every step of a
+    trajectory moves one coordinate, in random order, by +-levels / (2 (levels - 1)).
+    """
+    if levels < 2 or levels % 2:
+        raise ValueError(f"Morris needs an even number of levels >= 2, got {levels}")
+    delta = levels / (2 * (levels - 1))
+    # Starting points on the lower half of the grid, so a step up stays within [0, 1].
+    low = rng.integers(0, levels // 2, size=(n_trajectories, dimension)) / (levels - 1)
+    signs = rng.choice((-1.0, 1.0), size=(n_trajectories, dimension))
+    orders = np.argsort(rng.random((n_trajectories, dimension)), axis=1)
+
+    points = np.empty((n_trajectories, dimension + 1, dimension))
+    points[:, 0] = low + delta * (signs < 0)
+    rows = np.arange(n_trajectories)
+    for step in range(dimension):
+        points[:, step + 1] = points[:, step]
+        factor = orders[:, step]
+        points[rows, step + 1, factor] += signs[rows, factor] * delta
+    return points
+
+def morris_indices(points, outputs):
+    """
+    mu, mu* (mean absolute effect) and sigma of the elementary effects per
+    parameter, given trajectories from morris_trajectories and the output at
+    every point (n_trajectories x (dimension + 1)).
+    """
+    steps = np.diff(points, axis=1)
+    factors = np.argmax(np.abs(steps), axis=2)
+    deltas = np.take_along_axis(steps, factors[:, :, None], axis=2)[:, :, 0]
+    changes = np.diff(outputs, axis=1) / deltas
+
+    effects = np.empty_like(changes)
+    np.put_along_axis(effects, factors, changes, axis=1)
+    return {
+        "mu": effects.mean(axis=0),
+        "mu_star": np.abs(effects).mean(axis=0),
+        "sigma": effects.std(axis=0, ddof=1) if len(effects) > 1 else np.zeros(effects.shape[1]),
+    }
+
+def saltelli_matrices(seed, n_samples, dimension):
+    """
+    The Saltelli design for `n_samples` base samples: a (n_samples x (dimension + 2)
+    x dimension) array whose rows per sample are A, B and AB_1 ... AB_k (A with
+    column i taken from B). A and B come from one scrambled Sobol sequence of
+    dimension 2k; `n_samples` should be a power of two for its balance properties.
+    """
+    from scipy.stats import qmc
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        base = qmc.Sobol(2 * dimension, scramble=True, seed=seed).random(n_samples)
+    a, b = base[:, :dimension], base[:, dimension:]
+    matrices = np.repeat(a[:, None], dimension + 2, axis=1)
+    matrices[:, 1] = b
+    columns = np.arange(dimension)
+    matrices[:, 2 + columns, columns] = b
+    return matrices
+
+def sobol_indices(outputs, rng=None, bootstrap=100):
+    """
+    First-order (S1) and total-order (ST) indices per parameter from the outputs
+    of a Saltelli design (n_samples x (dimension + 2), columns A, B, AB_1 ...).
+    With `rng`, adds 95% bootstrap half-widths (S1_conf, ST_conf) from
+    `bootstrap` resamples of the base samples.
+    """
+    def estimate(f):
+        # Centering leaves the indices unchanged but cuts the variance of the S1 estimator.
+        f = f - np.mean(f[..., :2], axis=(-2, -1), keepdims=True)
+        f_a, f_b, f_ab = f[..., 0], f[..., 1], f[..., 2:]
+        variance = np.var(np.concatenate([f_a, f_b], axis=-1), axis=-1)
+        variance = np.where(variance > 0, variance, np.nan)[..., None]
+        first = np.mean(f_b[..., None] * (f_ab - f_a[..., None]), axis=-2) / variance
+        total = 0.5 * np.mean((f_a[..., None] - f_ab) ** 2, axis=-2) / variance
+        return first, total
+
+    first, total = estimate(outputs)
+    indices = {"S1": first, "ST": total}
+    if rng is not None and bootstrap:
+        resamples = outputs[rng.integers(len(outputs), size=(bootstrap, len(outputs)))]
+        first_b, total_b = estimate(resamples)
+        indices["S1_conf"] = 1.96 * np.std(first_b, axis=0, ddof=1)
+        indices["ST_conf"] = 1.96 * np.std(total_b, axis=0, ddof=1)
+    return indices
+
+def _evaluate(evaluator, space, candidates, batch_size):
+    """The meta score and overall scores of (n x dimension) unit candidates, evaluated in batches."""
+    outputs = {}
+    for start in range(0, len(candidates), batch_size):
+        stop = min(start + batch_size, len(candidates))
+        batch = evaluator.evaluate(space.decode(candidates[start:stop]))
+        for name, scores in {"meta_score": batch['meta_score'], **batch['overall_scores']}.items():
+            outputs.setdefault(name, np.empty(len(candidates)))[start:stop] = scores
+    return outputs
+
+def run_sensitivity(designs, space, method='sobol', n_samples=1024, levels=4, seed=0, batch_size=4096,
+                    bootstrap=100, model_functions=None, meta_weights=None, **engine_options):
+    """
+    Global sensitivity analysis of one or more design configs over the
+    parameter ranges of `space` (a DesignSpace).
+
+    With method='sobol', `n_samples` is the number of Saltelli base samples
+    (rounded up to a power of two); with method='morris', the number of
+    trajectories on a grid of `levels` levels. All designs are evaluated on the
+    same seeded samples. Returns, per design and output ('meta_score' and each
+    overall score), {parameter name: indices}: S1, ST and their bootstrap
+    confidence for Sobol, mu, mu_star and sigma for Morris.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown sensitivity method '{method}', expected one of {METHODS}")
+    dimension = len(space)
+    rng = np.random.default_rng(seed)
+    if method == 'sobol':
+        n_samples = 1 << max(int(n_samples) - 1, 0).bit_length()
+        samples = saltelli_matrices(seed, n_samples, dimension)
+    else:
+        samples = morris_trajectories(rng, n_samples, dimension, levels)
+    candidates = samples.reshape(-1, dimension)
+    names = [parameter.name for parameter in space.parameters]
+
+    indices = {}
+    for design in designs:
+        log.info("--- Sensitivity analysis (%s): %s, %d parameters, %d evaluations ---",
+                 method, design['name'], dimension, len(candidates))
+        evaluator = BatchEvaluator(design, space.parameters, model_functions, meta_weights, **engine_options)
+        outputs = _evaluate(evaluator, space, candidates, batch_size)
+        indices[design['name']] = {}
+        for output, values in outputs.items():
+            values = values.reshape(samples.shape[:2])
+            if method == 'sobol':
+                # Every design and output gets the same bootstrap resamples.
+                result = sobol_indices(values, np.random.default_rng(seed), bootstrap)
+            else:
+                result = morris_indices(samples, values)
+            indices[design['name']][output] = {
+                name: {key: float(column[j]) for key, column in result.items()} for j, name in enumerate(names)
+            }
+        event(log, 'sensitivity_finished', "  - %(evaluations)d evaluations of %(design)s done.",
+              design=design['name'], method=method, evaluations=len(candidates))
+
+    return {
+        "method": method,
+        "n_samples": n_samples,
+        "seed": seed,
+        "parameters": names,
+        "evaluations": len(candidates),
+        "indices": indices,
+    }
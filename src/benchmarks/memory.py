@@ -0,0 +1,108 @@
+"""
+Memory benchmark of the graph components.
+
+Builds N nodes with three scores of each kind and E weighted edges, and reports
+the bytes they hold per node and per edge, next to the same objects built the
+way they were before the ScoreStore (a __dict__ and two defaultdicts per node).
+Also reports the footprint of a whole loaded DynamicNetwork.
+
+    python -m src.benchmarks.memory --nodes 50000 --edges 500000
+"""
+import argparse
+import collections
+import gc
+import json
+import tracemalloc
+
+from ..core.graph_components import Node, WeightedEdge
+from ..core.network import DynamicNetwork
+from .synthetic import synthetic_config
+
+LABELS = ('total_cost', 'sustainability', 'performance')
+
+class _DictNode:
+    def __init__(self, node_id, domain, node_type, attributes=None, function_path=None):
+        self.id = node_id
+        self.domain = domain
+        self.type = node_type
+        self.attributes = attributes if attributes else {}
+        self.function_path = function_path
+        self.functionality_scores = collections.defaultdict(float)
+        self.value_scores = collections.defaultdict(float)
+
+class _DictEdge:
+    def __init__(self, source, target, label, weight):
+        self.source = source
+        self.target = target
+        self.label = label
+        self.weight = weight
+
+def random_config(n_nodes, n_edges, seed=0):
+    """A synthetic config with about `n_edges` weighted edges and no dependency edges."""
+    config = synthetic_config(n_nodes, n_edges / (2 * n_nodes), len(LABELS), seed=seed, name='memory benchmark')
+    config['edges'] = [edge for edge in config['edges'] if edge['type'] != 'dependency']
+    return config
+
+def measure(build):
+    """Bytes still allocated by the object `build()` returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        gc.collect()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return allocated
+
+def _scored(nodes):
+    for node in nodes:
+        for i, label in enumerate(LABELS):
+            node.functionality_scores[label] = i / 10
+            node.value_scores[label] = i / 10
+    return nodes
+
+def run(n_nodes, n_edges, seed=0):
+    config = random_config(n_nodes, n_edges, seed)
+    n_edges = len(config['edges'])
+
+    def compact_nodes():
+        network = DynamicNetwork()
+        for data in config['nodes']:
+            network.add_node(Node(**data))
+        _scored(network.nodes.values())
+        return network
+
+    def loaded_network():
+        network = DynamicNetwork()
+        network.load_from_config(config)
+        _scored(network.nodes.values())
+        return network
+
+    node_bytes = {
+        "slots": measure(compact_nodes) / n_nodes,
+        "dict": measure(lambda: _scored([_DictNode(**data) for data in config['nodes']])) / n_nodes,
+    }
+    edge_bytes = {
+        "slots": measure(lambda: [WeightedEdge(e['source'], e['target'], e['label'], e['weight'])
+                                  for e in config['edges']]) / n_edges,
+        "dict": measure(lambda: [_DictEdge(e['source'], e['target'], e['label'], e['weight'])
+                                 for e in config['edges']]) / n_edges,
+    }
+    return {
+        "nodes": n_nodes,
+        "edges": n_edges,
+        "bytes_per_node": node_bytes,
+        "bytes_per_edge": edge_bytes,
+        "network_bytes": measure(loaded_network),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the memory held per node and per edge.")
+    parser.add_argument('--nodes', type=int, default=50000)
+    parser.add_argument('--edges', type=int, default=500000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.nodes, args.edges, args.seed), indent=2))
@@ -0,0 +1,60 @@
+"""
+Startup-time benchmark: how long a fresh interpreter takes to import each entry
+point, and which heavy third-party packages the import pulls in.
+
+The simulation core (DynamicNetwork + SimulationEngine) and the headless run
+should only load NumPy; plotting and the PDF report bring in hypernetx,
+matplotlib, seaborn, pandas and fpdf.
+
+    python -m src.benchmarks.startup --repeat 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+TARGETS = {
+    "python": "pass",
+    "simulation core": "import src.core.network, src.simulation.engine",
+    "runner": "import src.simulation.runner",
+    "main (headless)": "import main",
+    "visualization": "import src.visualization.visualize_graph",
+    "pdf report": "import src.reporting.pdf_report",
+}
+
+HEAVY_PACKAGES = ('numpy', 'pandas', 'matplotlib', 'seaborn', 'hypernetx', 'fpdf', 'scipy', 'networkx', 'pyarrow')
+
+# Run in the child: time the import and list the heavy packages it loaded.
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [p for p in {heavy!r} if p in sys.modules]}}))
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def time_import(statement, repeat=3):
+    """{'seconds' (best of `repeat` fresh interpreters, interpreter start included), 'import_seconds', 'loaded'}."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', _PROBE.format(statement=statement, heavy=HEAVY_PACKAGES)],
+                                cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        seconds = time.perf_counter() - start
+        probe = json.loads(output.splitlines()[-1])
+        if best is None or seconds < best['seconds']:
+            best = {"seconds": seconds, "import_seconds": probe['seconds'], "loaded": probe['loaded']}
+    return best
+
+def run(repeat=3, targets=TARGETS):
+    return {name: time_import(statement, repeat) for name, statement in targets.items()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the imports of the entry points in fresh interpreters.")
+    parser.add_argument('--repeat', type=int, default=3, help="Interpreters per target; the fastest counts.")
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat), indent=2))
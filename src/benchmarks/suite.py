@@ -0,0 +1,158 @@
+"""
+Timing benchmarks of the simulation phases across a ladder of network sizes.
+
+For each size a synthetic scenario (see synthetic.py) is timed through:
+
+- load: DynamicNetwork.load_from_config
+- load_snapshot: the same from a compiled snapshot file (src/core/snapshot.py)
+- evaluate_models: one pass of the model functions
+- propagate_scores: one dict-based `_propagate_scores` step (the reference backend)
+- propagate_compiled: the default compiled propagation (10 iterations)
+- meta_score: `_calculate_meta_score`
+- run_scenario: the whole of runner.run_scenario, from config to payload
+
+Each phase reports the best of `repeat` runs in seconds. The report is JSON with
+the environment it was taken in, so reports of two releases can be compared:
+
+    python -m src.benchmarks.suite --output bench.json
+    python -m src.benchmarks.suite --compare bench.json --threshold 0.25
+
+--compare exits with status 1 if any phase got slower than the baseline by more
+than the threshold (a fraction of the baseline time).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from ..core.network import DynamicNetwork
+from ..core.snapshot import Snapshot, write_snapshot
+from ..models.function_registry import MODEL_FUNCTIONS
+from ..simulation.engine import SimulationEngine
+from ..simulation.runner import run_scenario
+from .synthetic import synthetic_config
+
+SIZE_LADDER = (10, 100, 1000, 10000, 100000)
+PHASES = ('load', 'load_snapshot', 'evaluate_models', 'propagate_scores', 'propagate_compiled', 'meta_score', 'run_scenario')
+SCHEMA_VERSION = 1
+
+def best_of(function, repeat, setup=None):
+    """The fastest of `repeat` timed calls of `function(setup())` (or `function()`), in seconds."""
+    times = []
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        function(argument) if setup else function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def _loaded(config):
+    network = DynamicNetwork()
+    network.load_from_config(config)
+    return SimulationEngine(network, MODEL_FUNCTIONS)
+
+def _evaluated(config):
+    engine = _loaded(config)
+    engine.evaluate_models()
+    return engine
+
+def time_phases(config, repeat=3, alpha=0.5, beta=0.5):
+    """{phase: seconds} for one scenario config."""
+    propagated = _evaluated(config)
+    propagated._propagate_compiled(10, alpha, beta)
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_snapshot(config, os.path.join(directory, 'network.snap'))
+        load_snapshot = best_of(lambda: _loaded(Snapshot(path)), repeat)
+    return {
+        "load": best_of(_loaded, repeat, lambda: config),
+        "load_snapshot": load_snapshot,
+        "evaluate_models": best_of(lambda engine: engine.evaluate_models(), repeat, lambda: _loaded(config)),
+        "propagate_scores": best_of(lambda engine: engine._propagate_scores(alpha, beta), repeat,
+                                    lambda: _evaluated(config)),
+        "propagate_compiled": best_of(lambda engine: engine._propagate_compiled(10, alpha, beta), repeat,
+                                      lambda: _evaluated(config)),
+        "meta_score": best_of(propagated._calculate_meta_score, repeat),
+        "run_scenario": best_of(lambda: run_scenario(config), repeat),
+    }
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+def run(sizes=SIZE_LADDER, repeat=3, edge_density=2.0, n_labels=3, dependency_depth=5, seed=0):
+    """Times every phase at every size and returns the JSON-ready report."""
+    report = {
+        "schema": SCHEMA_VERSION,
+        "environment": environment(),
+        "parameters": {"edge_density": edge_density, "labels": n_labels,
+                       "dependency_depth": dependency_depth, "seed": seed, "repeat": repeat},
+        "results": [],
+    }
+    for n_nodes in sizes:
+        config = synthetic_config(n_nodes, edge_density, n_labels, dependency_depth, seed)
+        report["results"].append({
+            "nodes": n_nodes,
+            "edges": len(config['edges']),
+            "seconds": time_phases(config, repeat),
+        })
+        print(f"  {n_nodes:>7} nodes: " + ", ".join(f"{phase} {seconds:.4f}s"
+                                                    for phase, seconds in report["results"][-1]["seconds"].items()),
+              file=sys.stderr)
+    return report
+
+def compare(baseline, current, threshold=0.25):
+    """
+    Phases of `current` slower than `baseline` by more than `threshold` (a fraction
+    of the baseline time), as [{'nodes', 'phase', 'baseline', 'current', 'change'}].
+    Sizes or phases only one report has are skipped.
+    """
+    before = {entry['nodes']: entry['seconds'] for entry in baseline['results']}
+    regressions = []
+    for entry in current['results']:
+        for phase, seconds in entry['seconds'].items():
+            reference = before.get(entry['nodes'], {}).get(phase)
+            if not reference:
+                continue
+            change = seconds / reference - 1
+            if change > threshold:
+                regressions.append({"nodes": entry['nodes'], "phase": phase,
+                                    "baseline": reference, "current": seconds, "change": change})
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the simulation phases across network sizes.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZE_LADDER))
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per phase; the fastest counts.")
+    parser.add_argument('--edge-density', type=float, default=2.0, help="Edges of each weighted kind per node.")
+    parser.add_argument('--labels', type=int, default=3)
+    parser.add_argument('--depth', type=int, default=5, help="Dependency depth of the synthetic networks.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', metavar='FILE', help="Write the report here instead of stdout.")
+    parser.add_argument('--compare', metavar='FILE', help="Baseline report to check for regressions.")
+    parser.add_argument('--threshold', type=float, default=0.25)
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeat, args.edge_density, args.labels, args.depth, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['phase']} at {r['nodes']} nodes: {r['baseline']:.4f}s -> "
+                  f"{r['current']:.4f}s ({r['change']:+.0%})", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
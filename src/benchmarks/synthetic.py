@@ -0,0 +1,81 @@
+"""
+Synthetic scenario configs for benchmarks, in the schema `load_from_config` reads.
+
+Nodes run the registered system models with attributes drawn in the ranges the
+BASE_DESIGNS use. They are spread over `dependency_depth` levels: dependency
+hyperedges only point from one level to the next, and functionality/value edges
+only to a later level, so every graph is acyclic like the real designs.
+"""
+import random
+
+# function_path -> (domain, node type, {attribute: (low, high) or choices})
+MODELS = {
+    'models.system.design_creation': ('Design', 'Creation', {'panel_thickness': (10, 40), 'face_sheet_thickness': (0.5, 2.0)}),
+    'models.system.material_search': ('Material', 'Search', {'target_face_sheet_modulus': (50, 200)}),
+    'models.system.material_assessment': ('Material', 'Assessment', {
+        'face_sheet_modulus': (20, 180), 'core_density': (0.03, 0.15), 'cost_per_m2': (100, 400),
+        'thermal_conductivity': (0.03, 0.2), 'recyclability_score': (0.0, 1.0)}),
+    'models.system.design_assembly': ('Design', 'Assembly', {'disassembly_ease': (0.0, 1.0)}),
+    'models.system.design_prediction': ('Design', 'Prediction', {'max_deflection_mm': (0.2, 2.0)}),
+    'models.system.material_prediction': ('Material', 'Prediction', {'simulated_delamination_risk': (0.0, 0.5)}),
+    'models.system.technology_selection': ('Manufacturing', 'Selection', {'process': ['autoclave_curing', 'hand_layup']}),
+    'models.system.manufacturing_assessment': ('Manufacturing', 'Assessment', {'energy_per_part': (20, 100), 'scrap_rate': (0.0, 0.3)}),
+    'models.system.technology_simulation': ('Manufacturing', 'Simulation', {'curing_time_hours': (1, 12)}),
+}
+
+# Labels the models write first, so propagated scores are not all zero.
+LABELS = ('total_cost', 'sustainability', 'performance', 'structural_rigidity', 'thermal_resistance')
+
+# Node ids DEFAULT_META_WEIGHTS reads, given to the first node of their model.
+NAMED_NODES = {
+    'models.system.design_prediction': 'design_prediction',
+    'models.system.manufacturing_assessment': 'technology_assessment',
+}
+
+def labels(n_labels):
+    """The first `n_labels` labels: the model labels, then 'label_5', 'label_6', ..."""
+    return list(LABELS[:n_labels]) + [f"label_{i}" for i in range(len(LABELS), n_labels)]
+
+def synthetic_config(n_nodes, edge_density=2.0, n_labels=3, dependency_depth=5, seed=0, name=None):
+    """
+    A scenario config with `n_nodes` nodes and about `edge_density` functionality
+    plus `edge_density` value edges per node, carrying `n_labels` distinct labels,
+    and dependency chains `dependency_depth` levels deep.
+    """
+    rng = random.Random(seed)
+    depth = max(1, min(dependency_depth, n_nodes))
+    paths = list(MODELS)
+    nodes, levels = [], [[] for _ in range(depth)]
+    named = {}
+    for i in range(n_nodes):
+        path = paths[i % len(paths)]
+        domain, node_type, ranges = MODELS[path]
+        node_id = named[path] = NAMED_NODES[path] if path in NAMED_NODES and path not in named else f"n{i}_{path.rsplit('.', 1)[1]}"
+        attributes = {key: rng.choice(bounds) if isinstance(bounds, list) else round(rng.uniform(*bounds), 4)
+                      for key, bounds in ranges.items()}
+        nodes.append({'node_id': node_id, 'domain': domain, 'node_type': node_type,
+                      'attributes': attributes, 'function_path': path})
+        levels[i * depth // n_nodes].append(node_id)
+
+    edges = []
+    for level, members in enumerate(levels[1:], start=1):
+        for target in members:
+            sources = rng.sample(levels[level - 1], min(len(levels[level - 1]), rng.randint(1, 2)))
+            edges.append({'type': 'dependency', 'sources': sources, 'target': target})
+
+    edge_labels = labels(n_labels)
+    n_edges = round(edge_density * n_nodes) if depth > 1 else 0
+    level_of = {node_id: level for level, members in enumerate(levels) for node_id in members}
+    node_ids = [node['node_id'] for node in nodes]
+    for kind in ('functionality', 'value'):
+        for e in range(n_edges):
+            source = rng.choice(node_ids)
+            level = level_of[source]
+            if level == depth - 1:
+                source = rng.choice(levels[0])
+                level = 0
+            target = rng.choice(levels[rng.randint(level + 1, depth - 1)])
+            edges.append({'type': kind, 'source': source, 'target': target,
+                          'label': edge_labels[e % len(edge_labels)], 'weight': round(rng.uniform(0.1, 1.0), 3)})
+
+    return {'name': name or f"synthetic_{n_nodes}", 'nodes': nodes, 'edges': edges}
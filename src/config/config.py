@@ -1,4 +1,4 @@
-import copy
+from .overlay import weight_overlay
 
 # Define three distinct, baseline design scenarios to test against.
 BASE_DESIGNS = [
@@ -92,46 +92,110 @@ for scenario in BASE_DESIGNS:
         if base_node['node_id'] not in defined_nodes:
             scenario['nodes'].append(base_node)
 
-def generate_weighting_scenarios(base_scenario):
-    """
-    Generates different scenarios by applying various weighting strategies to a base design.
-    """
-    scenarios = []
-    base_name = base_scenario['name']
-    
-    # 1. Balanced (Default) Scenario
-    balanced = copy.deepcopy(base_scenario)
-    balanced['name'] = f"{base_name}_Balanced"
-    scenarios.append(balanced)
-    
-    # 2. Cost-Focused Scenario
-    cost_focused = copy.deepcopy(base_scenario)
-    cost_focused['name'] = f"{base_name}_Cost-Focused"
-    for edge in cost_focused['edges']:
-        if edge.get('label') == 'total_cost':
-            edge['weight'] = min(1.0, edge['weight'] * 1.5)
-        elif edge['type'] == 'functionality':
-            edge['weight'] = max(0.1, edge['weight'] * 0.7)
-    scenarios.append(cost_focused)
+# Distributions for the Monte Carlo uncertainty analysis (src/analysis/monte_carlo.py).
+# Each entry targets a node attribute (node_id, attribute) or an edge weight
+# (kind, source, target, label). Relative entries scale each design's own value.
+UNCERTAINTIES = [
+    {'attribute': ('material_assessment', 'face_sheet_modulus'), 'distribution': ('normal', 1.0, 0.08), 'relative': True, 'bounds': (0, None)},
+    {'attribute': ('material_assessment', 'cost_per_m2'), 'distribution': ('triangular', 0.9, 1.0, 1.3), 'relative': True},
+    {'attribute': ('technology_assessment', 'scrap_rate'), 'distribution': ('lognormal', 0.0, 0.3), 'relative': True, 'bounds': (0.0, 1.0)},
+    {'attribute': ('technology_assessment', 'energy_per_part'), 'distribution': ('normal', 1.0, 0.1), 'relative': True, 'bounds': (0, None)},
+    {'weight': ('value', 'material_assessment', 'technology_assessment', 'total_cost'), 'distribution': ('uniform', 0.7, 1.3), 'relative': True, 'bounds': (0.0, 1.0)},
+    {'weight': ('value', 'material_assessment', 'technology_assessment', 'sustainability'), 'distribution': ('uniform', 0.7, 1.3), 'relative': True, 'bounds': (0.0, 1.0)},
+    {'weight': ('functionality', 'material_assessment', 'design_prediction', 'structural_rigidity'), 'distribution': ('uniform', 0.7, 1.3), 'relative': True, 'bounds': (0.0, 1.0)},
+]
+
+# Parameters the design optimizer (src/optimization) may change, with their search
+# ranges or choices. Entries target a node attribute (node_id, attribute) or an edge
+# weight (kind, source, target, label), like UNCERTAINTIES.
+DESIGN_SPACE = [
+    {'attribute': ('design_creation', 'panel_thickness'), 'range': (10, 40)},
+    {'attribute': ('material_assessment', 'core_density'), 'range': (0.03, 0.15)},
+    {'attribute': ('material_assessment', 'recyclability_score'), 'range': (0.0, 1.0)},
+    {'attribute': ('technology_simulation', 'curing_time_hours'), 'range': (1, 12)},
+    {'attribute': ('technology_assessment', 'scrap_rate'), 'range': (0.0, 0.3)},
+    {'attribute': ('technology_assessment', 'energy_per_part'), 'range': (20, 100)},
+    {'attribute': ('technology_selection', 'process'), 'choices': ['autoclave_curing', 'hand_layup']},
+]
+
+# Parameter ranges of the global sensitivity analysis (src/analysis/sensitivity.py),
+# declared like DESIGN_SPACE: which attributes and edge weights drive the scores.
+SENSITIVITY_RANGES = [
+    {'attribute': ('material_assessment', 'face_sheet_modulus'), 'range': (60, 160)},
+    {'attribute': ('material_assessment', 'core_density'), 'range': (0.03, 0.15)},
+    {'attribute': ('material_assessment', 'cost_per_m2'), 'range': (80, 320)},
+    {'attribute': ('material_assessment', 'recyclability_score'), 'range': (0.0, 1.0)},
+    {'attribute': ('technology_assessment', 'energy_per_part'), 'range': (20, 100)},
+    {'attribute': ('technology_assessment', 'scrap_rate'), 'range': (0.0, 0.3)},
+    {'attribute': ('design_creation', 'panel_thickness'), 'range': (10, 40)},
+    {'weight': ('value', 'material_assessment', 'technology_assessment', 'total_cost'), 'range': (0.3, 1.0)},
+    {'weight': ('value', 'material_assessment', 'technology_assessment', 'sustainability'), 'range': (0.3, 1.0)},
+    {'weight': ('functionality', 'material_assessment', 'design_prediction', 'structural_rigidity'), 'range': (0.3, 1.0)},
+    {'weight': ('functionality', 'material_prediction', 'design_prediction', 'durability'), 'range': (0.3, 1.0)},
+]
+
+# Meta score definitions for ranking designs (src/analysis/ranking.py): each maps
+# node ids to {score label: weight}. 'Default' is the engine's DEFAULT_META_WEIGHTS.
+META_SCORE_DEFINITIONS = {
+    'Default': {
+        'technology_assessment': {'sustainability': 0.5, 'total_cost': 0.3},
+        'design_prediction': {'performance': 0.8, 'structural_rigidity': 0.6},
+    },
+    'Cost-Led': {
+        'technology_assessment': {'sustainability': 0.2, 'total_cost': 0.8},
+        'design_prediction': {'performance': 0.5, 'structural_rigidity': 0.3},
+    },
+    'Sustainability-Led': {
+        'technology_assessment': {'sustainability': 0.9, 'total_cost': 0.2},
+        'design_prediction': {'performance': 0.4, 'structural_rigidity': 0.3},
+    },
+}
+
+# --- Weighting strategies ---
+# Each rule returns an edge's new weight, or None to keep it.
+def _cost_focused(edge):
+    if edge.get('label') == 'total_cost':
+        return min(1.0, edge['weight'] * 1.5)
+    if edge['type'] == 'functionality':
+        return max(0.1, edge['weight'] * 0.7)
+    return None
+
+def _sustainability_focused(edge):
+    if edge.get('label') == 'sustainability':
+        return min(1.0, edge['weight'] * 1.5)
+    if edge.get('label') == 'total_cost':
+        return max(0.1, edge['weight'] * 0.8)
+    return None
+
+def _performance_focused(edge):
+    if edge['type'] == 'functionality':
+        return min(1.0, edge['weight'] * 1.5)
+    if edge.get('label') == 'total_cost':
+        return max(0.1, edge['weight'] * 0.5)
+    return None
 
-    # 3. Sustainability-Focused Scenario
-    sustainability_focused = copy.deepcopy(base_scenario)
-    sustainability_focused['name'] = f"{base_name}_Sustain-Focused"
-    for edge in sustainability_focused['edges']:
-        if edge.get('label') == 'sustainability':
-            edge['weight'] = min(1.0, edge['weight'] * 1.5)
-        elif edge.get('label') == 'total_cost':
-            edge['weight'] = max(0.1, edge['weight'] * 0.8)
-    scenarios.append(sustainability_focused)
+WEIGHTING_STRATEGIES = {
+    'Balanced': lambda edge: None,
+    'Cost-Focused': _cost_focused,
+    'Sustain-Focused': _sustainability_focused,
+    'Perf-Focused': _performance_focused,
+}
 
-    # 4. Performance-Focused Scenario
-    performance_focused = copy.deepcopy(base_scenario)
-    performance_focused['name'] = f"{base_name}_Perf-Focused"
-    for edge in performance_focused['edges']:
-        if edge['type'] == 'functionality':
-            edge['weight'] = min(1.0, edge['weight'] * 1.5)
-        elif edge.get('label') == 'total_cost':
-            edge['weight'] = max(0.1, edge['weight'] * 0.5)
-    scenarios.append(performance_focused)
+def iter_weighting_scenarios(base_scenario):
+    """
+    Lazily yields one scenario per weighting strategy as a ScenarioOverlay: the new
+    edge weights on top of the shared, unmodified base design.
+    """
+    for suffix, rule in WEIGHTING_STRATEGIES.items():
+        yield weight_overlay(base_scenario, f"{base_scenario['name']}_{suffix}", rule)
 
-    return scenarios
\ No newline at end of file
+def generate_weighting_scenarios(base_scenario, materialize=True):
+    """
+    Generates different scenarios by applying various weighting strategies to a base design.
+    Each scenario is an independent config dict; materialize=False returns the
+    read-only overlays of `iter_weighting_scenarios` instead.
+    """
+    scenarios = iter_weighting_scenarios(base_scenario)
+    if materialize:
+        return [scenario.materialize() for scenario in scenarios]
+    return list(scenarios)
@@ -0,0 +1,175 @@
+"""
+Scenario configs from JSON or YAML files, validated against the schema that
+DynamicNetwork.load_from_config reads (the one of BASE_DESIGNS in config.py).
+
+A file holds one scenario, a list of scenarios, or a mapping with 'scenarios'
+and optional 'base_nodes'. Base nodes are added to every scenario that does not
+define a node with the same id, like BASE_NODES in config.py.
+
+    designs = load_scenarios('designs.yaml')
+
+Validated scenarios can be compiled into snapshots (src/core/snapshot.py), which
+load_designs opens as well:
+
+    python -m src.config.loader designs.yaml --snapshot-dir snapshots/
+
+PyYAML is only imported for .yaml/.yml files.
+"""
+import argparse
+import json
+import math
+import os
+from collections.abc import Mapping
+
+from ..core.network import EDGE_KINDS
+from ..core.snapshot import SUFFIX, Snapshot, write_snapshot
+
+NODE_FIELDS = {'node_id': str, 'domain': str, 'node_type': str, 'attributes': Mapping, 'function_path': (str, type(None))}
+REQUIRED_NODE_FIELDS = ('node_id', 'domain', 'node_type')
+EDGE_FIELDS = {
+    'dependency': {'type': str, 'sources': list, 'target': str},
+    'value': {'type': str, 'source': str, 'target': str, 'label': str, 'weight': (int, float)},
+    'functionality': {'type': str, 'source': str, 'target': str, 'label': str, 'weight': (int, float)},
+}
+TYPE_NAMES = {str: "a string", list: "a list", Mapping: "a mapping", (int, float): "a number",
+              (str, type(None)): "a string or null"}
+
+class ConfigError(ValueError):
+    """Raised for scenario files that do not match the schema; `errors` lists every problem found."""
+    def __init__(self, source, errors):
+        self.source = source
+        self.errors = list(errors)
+        super().__init__(f"Invalid scenario config '{source}':\n  " + "\n  ".join(self.errors))
+
+def _check_fields(data, fields, required, where, errors):
+    for key in data:
+        if key not in fields:
+            errors.append(f"{where}: unknown field '{key}'")
+    for key in required:
+        if key not in data:
+            errors.append(f"{where}: missing field '{key}'")
+    for key, expected in fields.items():
+        if key not in data:
+            continue
+        value = data[key]
+        if not isinstance(value, expected) or (expected == (int, float) and isinstance(value, bool)):
+            errors.append(f"{where}.{key}: expected {TYPE_NAMES[expected]}, got {type(value).__name__}")
+        elif expected == (int, float) and not math.isfinite(value):
+            errors.append(f"{where}.{key}: expected a finite number, got {value}")
+
+def validate_scenario(config, where='scenario'):
+    """Every schema violation of one scenario config, as messages naming the offending field."""
+    if not isinstance(config, Mapping):
+        return [f"{where}: expected a mapping, got {type(config).__name__}"]
+    errors = []
+    if not isinstance(config.get('name'), str):
+        errors.append(f"{where}.name: expected a string")
+    for key in ('nodes', 'edges'):
+        if not isinstance(config.get(key, []), list):
+            errors.append(f"{where}.{key}: expected a list")
+    if errors:
+        return errors
+
+    for i, node in enumerate(config.get('nodes', [])):
+        node_where = f"{where}.nodes[{i}]"
+        if not isinstance(node, Mapping):
+            errors.append(f"{node_where}: expected a mapping, got {type(node).__name__}")
+            continue
+        _check_fields(node, NODE_FIELDS, REQUIRED_NODE_FIELDS, node_where, errors)
+        for name in node.get('attributes', {}) if isinstance(node.get('attributes'), Mapping) else ():
+            if not isinstance(name, str):
+                errors.append(f"{node_where}.attributes: attribute names must be strings, got {name!r}")
+
+    for i, edge in enumerate(config.get('edges', [])):
+        edge_where = f"{where}.edges[{i}]"
+        if not isinstance(edge, Mapping):
+            errors.append(f"{edge_where}: expected a mapping, got {type(edge).__name__}")
+            continue
+        if edge.get('type') not in EDGE_KINDS:
+            errors.append(f"{edge_where}.type: expected one of {EDGE_KINDS}, got {edge.get('type')!r}")
+            continue
+        fields = EDGE_FIELDS[edge['type']]
+        _check_fields(edge, fields, tuple(fields), edge_where, errors)
+        sources = edge.get('sources')
+        if edge['type'] == 'dependency' and isinstance(sources, list):
+            if not sources:
+                errors.append(f"{edge_where}.sources: expected at least one source")
+            elif not all(isinstance(source, str) for source in sources):
+                errors.append(f"{edge_where}.sources: expected a list of strings")
+    return errors
+
+def _read(path):
+    extension = os.path.splitext(path)[1].lower()
+    with open(path) as f:
+        if extension in ('.yaml', '.yml'):
+            import yaml
+            return yaml.safe_load(f)
+        if extension == '.json':
+            return json.load(f)
+    raise ValueError(f"Unknown scenario file type '{extension}', expected .json, .yaml or .yml")
+
+def load_scenarios(path):
+    """
+    The scenario configs in a JSON or YAML file, as plain dicts. Raises
+    ConfigError listing every schema violation.
+    """
+    document = _read(path)
+    base_nodes = []
+    if isinstance(document, Mapping) and 'scenarios' in document:
+        base_nodes = document.get('base_nodes', [])
+        scenarios = document['scenarios']
+    else:
+        scenarios = document if isinstance(document, list) else [document]
+
+    errors = []
+    if not isinstance(base_nodes, list):
+        errors.append("base_nodes: expected a list")
+        base_nodes = []
+    errors.extend(validate_scenario({'name': 'base_nodes', 'nodes': base_nodes}, 'base_nodes'))
+    if not isinstance(scenarios, list):
+        raise ConfigError(path, errors + ["scenarios: expected a list"])
+    for i, config in enumerate(scenarios):
+        errors.extend(validate_scenario(config, f"scenarios[{i}]"))
+    names = [config.get('name') for config in scenarios if isinstance(config, Mapping)]
+    errors.extend(f"scenarios: duplicate name {name!r}" for name in sorted(set(n for n in names if names.count(n) > 1)))
+    if errors:
+        raise ConfigError(path, errors)
+
+    for config in scenarios:
+        defined = {node['node_id'] for node in config.get('nodes', [])}
+        config.setdefault('nodes', []).extend(node for node in base_nodes if node['node_id'] not in defined)
+    return scenarios
+
+def load_designs(paths):
+    """
+    Scenario configs from scenario files and snapshots, in the order given:
+    snapshot files (SUFFIX) are opened memory-mapped, other files are read
+    with load_scenarios.
+    """
+    designs = []
+    for path in paths:
+        if os.path.splitext(path)[1] == SUFFIX:
+            designs.append(Snapshot(path))
+        else:
+            designs.extend(load_scenarios(path))
+    return designs
+
+def compile_snapshots(configs, directory):
+    """Writes one snapshot per config into `directory`, named after the scenario; returns the paths."""
+    os.makedirs(directory, exist_ok=True)
+    return [write_snapshot(config, os.path.join(directory, config['name'].replace(' ', '_').replace('/', '_') + SUFFIX))
+            for config in configs]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate scenario files and compile them into network snapshots.")
+    parser.add_argument('files', nargs='+', help="JSON or YAML scenario files")
+    parser.add_argument('--snapshot-dir', metavar='DIR', default=None, help="Write one snapshot per scenario into this directory")
+    args = parser.parse_args()
+    try:
+        configs = [config for path in args.files for config in load_scenarios(path)]
+    except ConfigError as error:
+        parser.exit(1, f"{error}\n")
+    print(f"{len(configs)} valid scenarios: {', '.join(config['name'] for config in configs)}")
+    if args.snapshot_dir:
+        for path in compile_snapshots(configs, args.snapshot_dir):
+            print(f"Wrote {path}")
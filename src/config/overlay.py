@@ -0,0 +1,79 @@
+import copy
+from collections.abc import Mapping
+
+class ScenarioOverlay(Mapping):
+    """
+    A scenario config defined as deltas on a shared base config.
+
+    Reads like the config dict it stands for ('name', 'nodes', 'edges', ...), but
+    only stores the new name, edge weights by position in base['edges'] and
+    attribute values by node id. 'nodes' and 'edges' are assembled on access: edges
+    and nodes without a delta are the base's own dicts, so the base and the lists
+    an overlay returns must be treated as read-only. `materialize()` gives an
+    independent plain dict.
+    """
+    def __init__(self, base, name, weights=None, attributes=None):
+        self.base = base
+        self.name = name
+        self.weights = dict(weights or {})
+        self.attributes = {node_id: dict(values) for node_id, values in (attributes or {}).items()}
+        unknown = set(self.attributes) - {node['node_id'] for node in base.get('nodes', [])}
+        if unknown:
+            raise KeyError(f"Attribute deltas for nodes not in '{base.get('name')}': {sorted(unknown)}")
+
+    def __getitem__(self, key):
+        if key == 'name':
+            return self.name
+        if key == 'edges' and 'edges' in self.base:
+            return self._edges()
+        if key == 'nodes' and 'nodes' in self.base:
+            return self._nodes()
+        return self.base[key]
+
+    def __iter__(self):
+        yield from self.base
+        if 'name' not in self.base:
+            yield 'name'
+
+    def __len__(self):
+        return len(self.base) + ('name' not in self.base)
+
+    def _edges(self):
+        edges = list(self.base['edges'])
+        for position, weight in self.weights.items():
+            edges[position] = {**edges[position], 'weight': weight}
+        return edges
+
+    def _nodes(self):
+        if not self.attributes:
+            return list(self.base['nodes'])
+        return [{**node, 'attributes': {**node.get('attributes', {}), **self.attributes[node['node_id']]}}
+                if node['node_id'] in self.attributes else node
+                for node in self.base['nodes']]
+
+    def overlay(self, name, weights=None, attributes=None):
+        """A new overlay on the same base with further deltas on top of this one's."""
+        merged = {node_id: dict(values) for node_id, values in self.attributes.items()}
+        for node_id, values in (attributes or {}).items():
+            merged.setdefault(node_id, {}).update(values)
+        return ScenarioOverlay(self.base, name, {**self.weights, **(weights or {})}, merged)
+
+    def materialize(self):
+        """The config as an independent plain dict."""
+        return copy.deepcopy(dict(self))
+
+    def __repr__(self):
+        return (f"ScenarioOverlay({self.name!r} on {self.base.get('name')!r}: "
+                f"{len(self.weights)} weights, {sum(map(len, self.attributes.values()))} attributes)")
+
+def weight_overlay(base, name, rule):
+    """
+    Applies `rule(edge) -> new weight or None` to every edge of `base` and returns
+    the overlay holding the new weights.
+    """
+    weights = {}
+    for position, edge in enumerate(base.get('edges', [])):
+        weight = rule(edge)
+        if weight is not None:
+            weights[position] = weight
+    return ScenarioOverlay(base, name, weights)
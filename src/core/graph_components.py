@@ -1,29 +1,290 @@
 import collections
+from collections.abc import MutableMapping, Sequence
+
+import numpy as np
+
+SCORE_KINDS = ('functionality', 'value')
+
+class ScoreStore:
+    """
+    Struct-of-arrays storage for the scores of many nodes.
+
+    Each score kind has one contiguous float64 (node x label) matrix. A parallel
+    rank matrix records which labels a node has and in which order they were set
+    (-1 = absent), so the per-node ScoreMap views iterate like the dicts they replace.
+    Rows and label columns grow geometrically.
+    """
+    def __init__(self, capacity=16, label_capacity=4):
+        self.n_rows = 0
+        self.labels = {kind: {} for kind in SCORE_KINDS}
+        self.label_names = {kind: [] for kind in SCORE_KINDS}
+        self.values = {kind: np.zeros((capacity, label_capacity)) for kind in SCORE_KINDS}
+        self.ranks = {kind: np.full((capacity, label_capacity), -1, dtype=np.int32) for kind in SCORE_KINDS}
+        self.next_rank = {kind: np.zeros(capacity, dtype=np.int32) for kind in SCORE_KINDS}
+
+    def __len__(self):
+        return self.n_rows
+
+    def add_row(self):
+        row = self.n_rows
+        capacity = len(self.next_rank['value'])
+        if row == capacity:
+            for kind in SCORE_KINDS:
+                self.values[kind] = _grow(self.values[kind], 2 * capacity, 0, 0.0)
+                self.ranks[kind] = _grow(self.ranks[kind], 2 * capacity, 0, -1)
+                self.next_rank[kind] = _grow(self.next_rank[kind], 2 * capacity, 0, 0)
+        self.n_rows += 1
+        return row
+
+    def column(self, kind, label):
+        """The column of `label`, added on first use."""
+        labels = self.labels[kind]
+        column = labels.get(label)
+        if column is None:
+            column = labels[label] = len(labels)
+            self.label_names[kind].append(label)
+            width = self.values[kind].shape[1]
+            if column == width:
+                self.values[kind] = _grow(self.values[kind], 2 * width, 1, 0.0)
+                self.ranks[kind] = _grow(self.ranks[kind], 2 * width, 1, -1)
+        return column
+
+    def row_labels(self, kind, row):
+        """The columns a node has scores in, in the order they were set."""
+        ranks = self.ranks[kind][row]
+        columns = np.flatnonzero(ranks >= 0)
+        return columns[np.argsort(ranks[columns], kind='stable')].tolist()
+
+    def clear_row(self, kind, row):
+        self.ranks[kind][row] = -1
+        self.values[kind][row] = 0.0
+        self.next_rank[kind][row] = 0
+
+    def nbytes(self):
+        """Bytes held by the score arrays (including spare capacity)."""
+        return sum(array[kind].nbytes for array in (self.values, self.ranks, self.next_rank) for kind in SCORE_KINDS)
+
+def _grow(array, size, axis, fill):
+    shape = list(array.shape)
+    shape[axis] = size - shape[axis]
+    return np.concatenate([array, np.full(shape, fill, dtype=array.dtype)], axis=axis)
+
+class ScoreMap(MutableMapping):
+    """
+    A dict-like view of one node's scores of one kind inside a ScoreStore.
+
+    Like the defaultdict(float) it replaces, reading a missing label with `[]`
+    adds it with 0.0; `get` and `in` do not. Scores are stored as float64.
+    """
+    __slots__ = ('_store', '_kind', '_row')
+
+    def __init__(self, store, kind, row):
+        self._store = store
+        self._kind = kind
+        self._row = row
+
+    def _column(self, label):
+        column = self._store.labels[self._kind].get(label)
+        if column is not None and self._store.ranks[self._kind][self._row, column] >= 0:
+            return column
+        return None
+
+    def __getitem__(self, label):
+        column = self._column(label)
+        if column is None:
+            self[label] = 0.0
+            return 0.0
+        return float(self._store.values[self._kind][self._row, column])
+
+    def __setitem__(self, label, score):
+        store, kind, row = self._store, self._kind, self._row
+        column = store.column(kind, label)
+        ranks = store.ranks[kind]
+        if ranks[row, column] < 0:
+            ranks[row, column] = store.next_rank[kind][row]
+            store.next_rank[kind][row] += 1
+        store.values[kind][row, column] = score
+
+    def __delitem__(self, label):
+        column = self._column(label)
+        if column is None:
+            raise KeyError(label)
+        self._store.ranks[self._kind][self._row, column] = -1
+        self._store.values[self._kind][self._row, column] = 0.0
+
+    def __contains__(self, label):
+        return self._column(label) is not None
+
+    def get(self, label, default=None):
+        column = self._column(label)
+        if column is None:
+            return default
+        return float(self._store.values[self._kind][self._row, column])
+
+    def __iter__(self):
+        names = self._store.label_names[self._kind]
+        return iter([names[column] for column in self._store.row_labels(self._kind, self._row)])
+
+    def __len__(self):
+        return int(np.count_nonzero(self._store.ranks[self._kind][self._row] >= 0))
+
+    def items(self):
+        store, kind, row = self._store, self._kind, self._row
+        names, values = store.label_names[kind], store.values[kind][row]
+        return [(names[column], float(values[column])) for column in store.row_labels(kind, row)]
+
+    def values(self):
+        return [score for _, score in self.items()]
+
+    def copy(self):
+        return collections.defaultdict(float, self.items())
+
+    def assign(self, scores):
+        """Replaces all scores with those of `scores`, keeping its order."""
+        items = list(scores.items())
+        self._store.clear_row(self._kind, self._row)
+        for label, score in items:
+            self[label] = score
+
+    def __reduce__(self):
+        return collections.defaultdict, (float, dict(self.items()))
+
+    def __repr__(self):
+        return repr(dict(self.items()))
 
 class Node:
-    """Represents a single model in the network."""
+    """
+    Represents a single model in the network.
+
+    The functionality/value scores live in a ScoreStore: the network's once the node
+    is added to it, or a private one for stand-alone nodes.
+    """
+    __slots__ = ('id', 'domain', 'type', 'attributes', 'function_path', '_store', '_row')
+
     def __init__(self, node_id, domain, node_type, attributes=None, function_path=None):
         self.id = node_id
         self.domain = domain
         self.type = node_type
         self.attributes = attributes if attributes else {}
         self.function_path = function_path
-        self.functionality_scores = collections.defaultdict(float)
-        self.value_scores = collections.defaultdict(float)
+        self._store = None
+        self._row = None
+
+    def bind(self, store):
+        """Moves this node's scores into `store`."""
+        if self._store is store:
+            return
+        old = (self.functionality_scores.items(), self.value_scores.items()) if self._store is not None else None
+        self._store, self._row = store, store.add_row()
+        if old is not None:
+            for kind, items in zip(SCORE_KINDS, old):
+                self._scores(kind).assign(dict(items))
+
+    def _scores(self, kind):
+        if self._store is None:
+            self.bind(ScoreStore(capacity=1))
+        return ScoreMap(self._store, kind, self._row)
+
+    @property
+    def functionality_scores(self):
+        return self._scores('functionality')
+
+    @functionality_scores.setter
+    def functionality_scores(self, scores):
+        self._scores('functionality').assign(scores)
+
+    @property
+    def value_scores(self):
+        return self._scores('value')
+
+    @value_scores.setter
+    def value_scores(self, scores):
+        self._scores('value').assign(scores)
+
+    def __getstate__(self):
+        # Pickle the scores, not the whole store they live in.
+        return (self.id, self.domain, self.type, self.attributes, self.function_path,
+                dict(self.functionality_scores.items()), dict(self.value_scores.items()))
+
+    def __setstate__(self, state):
+        *fields, functionality_scores, value_scores = state
+        self.__init__(*fields)
+        self.functionality_scores = functionality_scores
+        self.value_scores = value_scores
 
     def __repr__(self):
         return f"Node({self.id})"
 
 class WeightedEdge:
     """Defines a weighted connection for propagating scores (value or functionality)."""
+    __slots__ = ('source', 'target', 'label', 'weight')
+
     def __init__(self, source, target, label, weight):
         self.source = source
         self.target = target
         self.label = label
         self.weight = weight
 
+EDGE_FIELDS = ('source', 'target', 'label', 'weight')
+
+class EdgeList(Sequence):
+    """
+    The weighted edges of one kind, stored as one list per field (EDGE_FIELDS).
+
+    WeightedEdge objects are created on first access and kept, so changes made
+    through them (edge.weight = ...) stick and show in `column('weight')`. Bulk
+    consumers (loaders, EdgeIndex, AdjacencyIndex, snapshots) read the columns
+    and never create the objects.
+    """
+    def __init__(self, sources=(), targets=(), labels=(), weights=()):
+        self._columns = {'source': list(sources), 'target': list(targets), 'label': list(labels), 'weight': list(weights)}
+        self._edges = [None] * len(self._columns['source'])
+        self._created = 0
+
+    def __len__(self):
+        return len(self._edges)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        edge = self._edges[position]
+        if edge is None:
+            columns = self._columns
+            edge = self._edges[position] = WeightedEdge(columns['source'][position], columns['target'][position],
+                                                        columns['label'][position], columns['weight'][position])
+            self._created += 1
+        return edge
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+
+    def append(self, edge):
+        for name, column in self._columns.items():
+            column.append(getattr(edge, name))
+        self._edges.append(edge)
+        self._created += 1
+
+    def extend(self, edges):
+        if isinstance(edges, EdgeList):
+            for name, column in self._columns.items():
+                column.extend(edges.column(name))
+            self._edges.extend(edges._edges)
+            self._created += edges._created
+        else:
+            for edge in edges:
+                self.append(edge)
+
+    def column(self, name):
+        """One field of every edge, in edge order. Weights include changes made through edge objects."""
+        values = self._columns[name]
+        if name == 'weight' and self._created:
+            values = [value if edge is None else edge.weight for value, edge in zip(values, self._edges)]
+        return values
+
 class DependencyHyperedge:
     """Defines a workflow dependency: {A, B} -> C."""
+    __slots__ = ('sources', 'target')
+
     def __init__(self, sources, target):
         self.sources = set(sources)
-        self.target = target
\ No newline at end of file
+        self.target = target
@@ -1,56 +1,205 @@
-from .graph_components import Node, WeightedEdge, DependencyHyperedge
+import logging
+from operator import attrgetter, itemgetter
+
+import numpy as np
+
+from .graph_components import Node, DependencyHyperedge, EdgeList, ScoreStore
+from .snapshot import Snapshot
+from ..instrumentation.log import event
+
+log = logging.getLogger(__name__)
+
+EDGE_KINDS = ('value', 'functionality', 'dependency')
+
+class AdjacencyIndex:
+    """
+    CSR-style index of one kind's edges by node (their target or their source).
+
+    The edges of each node sit in one contiguous block of `order`, in edge list order,
+    so looking up a node's edges costs O(degree). Dependency hyperedges are indexed
+    under each of their sources.
+    """
+    def __init__(self, edges, node_index, side):
+        """
+        Indexes `edges` by their `side` ('target', 'source', or 'sources' for
+        hyperedges). An EdgeList is read from its columns. Node ids missing from
+        `node_index` are added to it.
+        """
+        labels = None
+        positions = None
+        if isinstance(edges, EdgeList):
+            ends = edges.column(side)
+            labels = edges.column('label')
+        elif side == 'sources':
+            ends = [source for edge in edges for source in edge.sources]
+            positions = np.repeat(np.arange(len(edges)), [len(edge.sources) for edge in edges])
+        else:
+            ends = list(map(attrgetter(side), edges))
+            if edges and hasattr(edges[0], 'label'):
+                labels = list(map(attrgetter('label'), edges))
+        for end in set(ends).difference(node_index):
+            node_index[end] = len(node_index)
+
+        if labels:
+            label_index = {label: i for i, label in enumerate(dict.fromkeys(labels))}
+            label_ids = list(map(label_index.__getitem__, labels))
+        else:
+            label_index = {None: 0}
+            label_ids = np.zeros(len(ends), dtype=np.intp)
+        self.edges = edges
+        self.node_index = node_index
+        self.label_index = label_index
+        keys = np.array(list(map(node_index.__getitem__, ends)), dtype=np.intp)
+        order = np.argsort(keys, kind='stable')
+        self.order = order if positions is None else positions[order]
+        self.label_ids = np.asarray(label_ids, dtype=np.intp)[order]
+        self.offsets = np.searchsorted(keys[order], np.arange(len(node_index) + 1))
+
+    def lookup(self, node_id, label=None):
+        i = self.node_index.get(node_id)
+        if i is None or i + 1 >= len(self.offsets):
+            return []
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        positions = self.order[start:stop]
+        if label is not None:
+            label_id = self.label_index.get(label)
+            if label_id is None:
+                return []
+            positions = positions[self.label_ids[start:stop] == label_id]
+        edges = self.edges
+        return [edges[p] for p in positions.tolist()]
 
 class DynamicNetwork:
     """Manages the overall graph structure."""
     def __init__(self):
         self.nodes = {}
-        self.value_edges = []
-        self.functionality_edges = []
+        self.scores = ScoreStore()
+        self.value_edges = EdgeList()
+        self.functionality_edges = EdgeList()
         self.dependencies = []
+        self._adjacency = None
 
     def add_node(self, node):
+        node.bind(self.scores)
         self.nodes[node.id] = node
+        self._adjacency = None
+
+    def add_edge(self, kind, edge):
+        """Adds a weighted edge ('value'/'functionality') or a dependency hyperedge."""
+        self.edge_list(kind).append(edge)
+        self._adjacency = None
+
+    def edge_list(self, kind):
+        if kind == 'value':
+            return self.value_edges
+        if kind == 'functionality':
+            return self.functionality_edges
+        if kind == 'dependency':
+            return self.dependencies
+        raise ValueError(f"Unknown edge kind '{kind}', expected one of {EDGE_KINDS}")
+
+    def in_edges(self, node_id, kind, label=None):
+        """Edges of one kind pointing at `node_id` (optionally only those carrying `label`), in edge order."""
+        return self.adjacency()[kind, 'in'].lookup(node_id, label)
+
+    def out_edges(self, node_id, kind, label=None):
+        """Edges of one kind leaving `node_id` (optionally only those carrying `label`), in edge order."""
+        return self.adjacency()[kind, 'out'].lookup(node_id, label)
+
+    def adjacency(self):
+        """
+        The per-target and per-source AdjacencyIndexes of every edge kind, keyed by
+        (kind, 'in'/'out'). They are rebuilt after the graph changes.
+        """
+        if self._adjacency is None:
+            node_index = {node_id: i for i, node_id in enumerate(self.nodes)}
+            self._adjacency = {}
+            for kind in EDGE_KINDS:
+                edges = self.edge_list(kind)
+                self._adjacency[kind, 'in'] = AdjacencyIndex(edges, node_index, 'target')
+                self._adjacency[kind, 'out'] = AdjacencyIndex(edges, node_index,
+                                                              'sources' if kind == 'dependency' else 'source')
+        return self._adjacency
 
     def load_from_config(self, config_data):
         """
         Builds the network from a scenario dictionary with robust, multi-pass logic.
+        Runs in O(nodes + edges): node configs are looked up through an id index,
+        weighted edges are read into EdgeList columns (their objects are created on
+        demand) and the adjacency indexes are built from those columns. A compiled
+        Snapshot is read straight from its arrays.
         """
-        print("--- Loading Network Configuration ---")
-        # 1. Discover ALL nodes that will be in the graph, from both 'nodes' and 'edges' lists.
-        all_node_ids = set()
+        log.info("--- Loading Network Configuration ---")
+        if isinstance(config_data, Snapshot):
+            config_data.load_into(self)
+            self._loaded(config_data)
+            return
+        node_configs = {}
         for node_data in config_data.get('nodes', []):
-            all_node_ids.add(node_data['node_id'])
+            # The first definition of a node wins, as before.
+            node_configs.setdefault(node_data['node_id'], node_data)
+
+        edge_configs = {kind: [] for kind in EDGE_KINDS}
         for edge_data in config_data.get('edges', []):
-            if 'source' in edge_data: all_node_ids.add(edge_data['source'])
-            if 'sources' in edge_data: all_node_ids.update(edge_data['sources'])
-            if 'target' in edge_data: all_node_ids.add(edge_data['target'])
+            # Edges of unknown types are skipped, as before.
+            edge_configs.get(edge_data['type'], []).append(edge_data)
+        columns = {kind: [list(map(itemgetter(field), edge_configs[kind])) for field in ('source', 'target', 'label', 'weight')]
+                   for kind in ('value', 'functionality')}
+
+        # 1. Discover ALL nodes that will be in the graph, from both 'nodes' and 'edges' lists.
+        all_node_ids = set(node_configs)
+        for sources, targets, _, _ in columns.values():
+            all_node_ids.update(sources, targets)
+        for edge_data in edge_configs['dependency']:
+            all_node_ids.update(edge_data['sources'])
+            all_node_ids.add(edge_data['target'])
 
         # 2. Create all Node objects based on the discovered set.
-        print("Step 1: Creating all nodes...")
-        for node_id in sorted(list(all_node_ids)): # Sorting for deterministic order
-            # Find this node's specific data in the config, if it exists.
-            node_data = next((n for n in config_data.get('nodes', []) if n['node_id'] == node_id), None)
+        log.info("Step 1: Creating all nodes...")
+        verbose = log.isEnabledFor(logging.DEBUG)
+        for node_id in sorted(all_node_ids): # Sorting for deterministic order
+            node_data = node_configs.get(node_id)
             if node_data:
-                print(f"  - Adding defined node: {node_id}")
+                if verbose:
+                    log.debug("  - Adding defined node: %s", node_id)
                 self.add_node(Node(**node_data))
             else:
                 # If a node is only mentioned in an edge, create a default object for it.
-                print(f"  - Creating default node for implicit node: {node_id}")
+                if verbose:
+                    log.debug("  - Creating default node for implicit node: %s", node_id)
                 self.add_node(Node(node_id=node_id, domain='Unknown', node_type='Unknown'))
-        
-        # 3. Now that all nodes exist, load the edges.
-        print("\nStep 2: Loading edges...")
-        for edge_data in config_data.get('edges', []):
-            edge_info = edge_data.copy()
-            edge_type = edge_info.pop('type')
-            
-            if edge_type == 'dependency':
-                self.dependencies.append(DependencyHyperedge(**edge_info))
-            elif edge_type == 'value':
-                self.value_edges.append(WeightedEdge(**edge_info))
-            elif edge_type == 'functionality':
-                self.functionality_edges.append(WeightedEdge(**edge_info))
-        print("--- Network Loading Complete ---\n")
+
+        # 3. Now that all nodes exist, load the edges; the adjacency indexes are built from their columns.
+        log.info("\nStep 2: Loading edges...")
+        for kind, kind_columns in columns.items():
+            self.edge_list(kind).extend(EdgeList(*kind_columns))
+        self.dependencies.extend(DependencyHyperedge(edge_data['sources'], edge_data['target'])
+                                 for edge_data in edge_configs['dependency'])
+        self._loaded(config_data)
+
+    def _loaded(self, config_data):
+        self._adjacency = None
+        self.adjacency()
+        event(log, 'network_loaded', "--- Network Loading Complete ---\n", scenario=config_data.get('name'),
+              nodes=len(self.nodes), value_edges=len(self.value_edges),
+              functionality_edges=len(self.functionality_edges), dependencies=len(self.dependencies))
 
     def get_node(self, node_id):
-        return self.nodes.get(node_id)
\ No newline at end of file
+        return self.nodes.get(node_id)
+
+    def with_weights(self, functionality_weights, value_weights):
+        """
+        Returns a copy of this topology with new edge weights, in edge list order.
+        Nodes are fresh objects with empty scores; dependencies are shared.
+        """
+        network = DynamicNetwork()
+        for node in self.nodes.values():
+            network.add_node(Node(node.id, node.domain, node.type, dict(node.attributes), node.function_path))
+        for kind, weights in (('functionality', functionality_weights), ('value', value_weights)):
+            edges = self.edge_list(kind)
+            weights = [float(w) for w in weights]
+            if len(weights) != len(edges):
+                raise ValueError(f"Expected {len(edges)} {kind} weights, got {len(weights)}.")
+            network.edge_list(kind).extend(EdgeList(*(edges.column(name) for name in ('source', 'target', 'label')), weights))
+        network.dependencies = list(self.dependencies)
+        return network
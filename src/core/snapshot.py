@@ -0,0 +1,314 @@
+"""
+Compiled binary snapshots of scenario networks.
+
+A snapshot holds one scenario in a single file that NumPy memory-maps. The file
+contains:
+
+- node ids, domains, types and function paths as string tables;
+- attribute columns;
+- value/functionality edges as CSR arrays per kind and label (rows are targets,
+  columns are sources);
+- dependency hyperedges as CSR over their sources.
+
+Opening a snapshot maps the file and views the arrays in place. Only a small
+JSON header is parsed.
+
+    write_snapshot(config, 'A_CFRP_Honeycomb.snap')
+    snapshot = Snapshot('A_CFRP_Honeycomb.snap')
+    network = DynamicNetwork()
+    network.load_from_config(snapshot)
+
+A Snapshot reads like the config it was written from ('name', 'nodes', 'edges',
+...), so it can be used wherever a config is: runners, overlays and the result
+cache. DynamicNetwork.load_from_config builds the network straight from its
+arrays. A Snapshot pickles as its path, so worker processes map the same file
+(and share its pages) instead of each receiving a pickled config.
+
+File layout: MAGIC, the header length as a little-endian uint64, the UTF-8 JSON
+header ({'version', 'metadata', 'attributes', 'arrays': {name: [dtype, shape,
+offset]}}), then the arrays, each aligned to ALIGNMENT bytes.
+"""
+import json
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+from .graph_components import DependencyHyperedge, EdgeList, Node
+
+MAGIC = b'MBSESNAP'
+VERSION = 1
+ALIGNMENT = 64
+SUFFIX = '.snap'
+
+WEIGHTED_KINDS = ('value', 'functionality')
+# Edge kinds by their code in the 'edges.kinds' array (the config's edge order).
+EDGE_KIND_CODES = ('dependency',) + WEIGHTED_KINDS
+
+def _string_table(strings):
+    """UTF-8 blob and offsets (len + 1) of a list of strings."""
+    encoded = [s.encode() for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+def _categories(values):
+    """int32 codes (-1 for None) and the string table of the distinct values."""
+    table = {}
+    codes = np.array([-1 if v is None else table.setdefault(v, len(table)) for v in values], dtype=np.int32)
+    return codes, list(table)
+
+def _column_kind(values):
+    types = set(map(type, values))
+    if types == {bool}:
+        return 'bool'
+    if types == {int}:
+        return 'int'
+    if types == {float}:
+        return 'float'
+    if types == {str}:
+        return 'str'
+    # Mixed or structured values keep their exact form as JSON text.
+    return 'json'
+
+def _collect(config):
+    """{array name: array}, attribute column descriptions and metadata of one scenario config."""
+    from .network import DynamicNetwork
+    network = DynamicNetwork()
+    network.load_from_config(config)
+    nodes = list(network.nodes.values())
+    node_index = {node.id: i for i, node in enumerate(nodes)}
+    n_nodes = len(nodes)
+    arrays = {}
+
+    def strings(name, values):
+        arrays[f'{name}.blob'], arrays[f'{name}.offsets'] = _string_table(values)
+
+    def categories(name, values):
+        arrays[f'{name}.codes'], table = _categories(values)
+        strings(f'{name}.table', table)
+
+    strings('nodes.id', [node.id for node in nodes])
+    categories('nodes.domain', [node.domain for node in nodes])
+    categories('nodes.type', [node.type for node in nodes])
+    categories('nodes.function_path', [node.function_path for node in nodes])
+
+    # One column per attribute name, in order of first appearance.
+    names = list(dict.fromkeys(name for node in nodes for name in node.attributes))
+    positions = [{name: place for place, name in enumerate(node.attributes)} for node in nodes]
+    attributes = []
+    for j, name in enumerate(names):
+        rows = [i for i, node in enumerate(nodes) if name in node.attributes]
+        values = [nodes[i].attributes[name] for i in rows]
+        kind = _column_kind(values)
+        arrays[f'attributes.{j}.rows'] = np.array(rows, dtype=np.int64)
+        # The attribute's place in each node's dict, so every node keeps its own key order.
+        arrays[f'attributes.{j}.places'] = np.array([positions[i][name] for i in rows], dtype=np.int32)
+        if kind in ('bool', 'int', 'float'):
+            arrays[f'attributes.{j}.values'] = np.array(values, dtype={'bool': np.bool_, 'int': np.int64, 'float': np.float64}[kind])
+        elif kind == 'str':
+            categories(f'attributes.{j}', values)
+        else:
+            strings(f'attributes.{j}.json', [json.dumps(value) for value in values])
+        attributes.append({"name": name, "kind": kind})
+
+    for kind in WEIGHTED_KINDS:
+        edges = network.edge_list(kind)
+        labels = list(dict.fromkeys(edges.column('label')))
+        label_index = {label: i for i, label in enumerate(labels)}
+        label_ids = np.array(list(map(label_index.__getitem__, edges.column('label'))), dtype=np.int64)
+        targets = np.array(list(map(node_index.__getitem__, edges.column('target'))), dtype=np.int64)
+        sources = np.array(list(map(node_index.__getitem__, edges.column('source'))), dtype=np.int64)
+        weights = np.array(edges.column('weight'), dtype=np.float64)
+        # CSR rows are (label, target) pairs: label l's matrix is indptr[l * n : (l + 1) * n + 1].
+        rows = label_ids * n_nodes + targets
+        order = np.lexsort((np.arange(len(edges)), rows))
+        arrays[f'{kind}.indptr'] = np.searchsorted(rows[order], np.arange(len(labels) * n_nodes + 1)).astype(np.int64)
+        arrays[f'{kind}.sources'] = sources[order]
+        arrays[f'{kind}.weights'] = weights[order]
+        arrays[f'{kind}.positions'] = order.astype(np.int64)
+        strings(f'{kind}.labels', labels)
+
+    # Hyperedge sources in config order, so the config view lists them as written.
+    edge_configs = [e for e in config.get('edges', []) if e['type'] in EDGE_KIND_CODES]
+    dependency_sources = [list(dict.fromkeys(e['sources'])) for e in edge_configs if e['type'] == 'dependency']
+    indptr = np.zeros(len(dependency_sources) + 1, dtype=np.int64)
+    np.cumsum([len(sources) for sources in dependency_sources], out=indptr[1:])
+    arrays['dependency.indptr'] = indptr
+    arrays['dependency.sources'] = np.array([node_index[s] for sources in dependency_sources for s in sources], dtype=np.int64)
+    arrays['dependency.targets'] = np.array([node_index[edge.target] for edge in network.dependencies], dtype=np.int64)
+    arrays['edges.kinds'] = np.array([EDGE_KIND_CODES.index(e['type']) for e in edge_configs], dtype=np.int8)
+
+    metadata = {key: value for key, value in config.items() if key not in ('nodes', 'edges')}
+    return arrays, attributes, metadata
+
+def write_snapshot(config, path):
+    """
+    Compiles a scenario config (a dict, ScenarioOverlay or Snapshot) into a
+    snapshot file at `path` and returns the path. Keys other than 'nodes' and
+    'edges' (name, image_path, ...) are kept as JSON metadata.
+    """
+    arrays, attributes, metadata = _collect(config)
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        layout[name] = [array.dtype.str, list(array.shape), offset]
+        offset += array.nbytes
+    header = json.dumps({"version": VERSION, "metadata": metadata, "attributes": attributes,
+                         "arrays": layout}).encode()
+    start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(np.array(len(header), dtype='<u8').tobytes())
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(start + layout[name][2])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(start + offset)
+    return path
+
+def _place(entry):
+    return entry[0]
+
+def _decode(blob, offsets):
+    data = blob.tobytes()
+    bounds = offsets.tolist()
+    return [data[a:b].decode() for a, b in zip(bounds[:-1], bounds[1:])]
+
+class Snapshot(Mapping):
+    """
+    A memory-mapped snapshot file (see write_snapshot). Arrays are read-only views
+    of the mapped file; the config views ('nodes', 'edges') are assembled on access.
+    """
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        buffer = np.memmap(self.path, dtype=np.uint8, mode='r')
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"'{self.path}' is not a network snapshot")
+        length = int(buffer[len(MAGIC):len(MAGIC) + 8].view('<u8')[0])
+        header = json.loads(bytes(buffer[len(MAGIC) + 8:len(MAGIC) + 8 + length]))
+        if header['version'] != VERSION:
+            raise ValueError(f"Snapshot '{self.path}' has version {header['version']}, expected {VERSION}")
+        start = -(-(len(MAGIC) + 8 + length) // ALIGNMENT) * ALIGNMENT
+        self.metadata = header['metadata']
+        self.attribute_columns = header['attributes']
+        self.arrays = {}
+        for name, (dtype, shape, offset) in header['arrays'].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape, dtype=np.int64))
+            self.arrays[name] = buffer[start + offset:start + offset + count * dtype.itemsize].view(dtype).reshape(shape)
+        self._node_ids = None
+
+    def __reduce__(self):
+        # Workers map the file themselves.
+        return Snapshot, (self.path,)
+
+    # --- Mapping interface: the scenario config ---
+
+    def __getitem__(self, key):
+        if key == 'nodes':
+            return self.node_configs()
+        if key == 'edges':
+            return self.edge_configs()
+        return self.metadata[key]
+
+    def __iter__(self):
+        yield from self.metadata
+        yield from ('nodes', 'edges')
+
+    def __len__(self):
+        return len(self.metadata) + 2
+
+    def materialize(self):
+        """The config as an independent plain dict."""
+        return dict(self)
+
+    def __repr__(self):
+        return f"Snapshot({self.metadata.get('name')!r} at {self.path!r}: {len(self.node_ids())} nodes)"
+
+    # --- Columns ---
+
+    def strings(self, name):
+        return _decode(self.arrays[f'{name}.blob'], self.arrays[f'{name}.offsets'])
+
+    def categories(self, name):
+        """Per-row values of a categorical string column (None where unset)."""
+        table = self.strings(f'{name}.table')
+        return [table[code] if code >= 0 else None for code in self.arrays[f'{name}.codes'].tolist()]
+
+    def node_ids(self):
+        if self._node_ids is None:
+            self._node_ids = self.strings('nodes.id')
+        return self._node_ids
+
+    def attributes(self):
+        """One attribute dict per node, in node order."""
+        entries = [[] for _ in self.node_ids()]
+        for j, column in enumerate(self.attribute_columns):
+            name, kind = column['name'], column['kind']
+            if kind == 'str':
+                values = self.categories(f'attributes.{j}')
+            elif kind == 'json':
+                values = [json.loads(text) for text in self.strings(f'attributes.{j}.json')]
+            else:
+                values = self.arrays[f'attributes.{j}.values'].tolist()
+            for row, place, value in zip(self.arrays[f'attributes.{j}.rows'].tolist(),
+                                         self.arrays[f'attributes.{j}.places'].tolist(), values):
+                entries[row].append((place, name, value))
+        return [{name: value for _, name, value in sorted(node, key=_place)} for node in entries]
+
+    def edge_arrays(self, kind):
+        """Source and target node indices, label ids and weights of one kind's edges, in edge list order."""
+        indptr, positions = self.arrays[f'{kind}.indptr'], self.arrays[f'{kind}.positions']
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        label_ids, targets = np.divmod(rows, max(len(self.node_ids()), 1))
+        inverse = np.empty_like(positions)
+        inverse[positions] = np.arange(len(positions))
+        return self.arrays[f'{kind}.sources'][inverse], targets[inverse], label_ids[inverse], self.arrays[f'{kind}.weights'][inverse]
+
+    def weighted_edges(self, kind):
+        """(source, target, label, weight) of every edge of one kind, in edge list order."""
+        ids, labels = self.node_ids(), self.strings(f'{kind}.labels')
+        sources, targets, label_ids, weights = self.edge_arrays(kind)
+        return list(zip(map(ids.__getitem__, sources.tolist()), map(ids.__getitem__, targets.tolist()),
+                        map(labels.__getitem__, label_ids.tolist()), weights.tolist()))
+
+    def dependencies(self):
+        """(sources, target) of every dependency hyperedge, in edge list order."""
+        ids = self.node_ids()
+        bounds = self.arrays['dependency.indptr'].tolist()
+        sources = list(map(ids.__getitem__, self.arrays['dependency.sources'].tolist()))
+        return [(sources[a:b], ids[t]) for a, b, t in
+                zip(bounds[:-1], bounds[1:], self.arrays['dependency.targets'].tolist())]
+
+    def node_configs(self):
+        return [{'node_id': node_id, 'domain': domain, 'node_type': node_type,
+                 'attributes': attributes, 'function_path': function_path}
+                for node_id, domain, node_type, attributes, function_path in zip(
+                    self.node_ids(), self.categories('nodes.domain'), self.categories('nodes.type'),
+                    self.attributes(), self.categories('nodes.function_path'))]
+
+    def edge_configs(self):
+        pending = {
+            'dependency': iter([{'type': 'dependency', 'sources': sources, 'target': target}
+                                for sources, target in self.dependencies()]),
+        }
+        for kind in WEIGHTED_KINDS:
+            pending[kind] = iter([{'type': kind, 'source': source, 'target': target, 'label': label, 'weight': weight}
+                                  for source, target, label, weight in self.weighted_edges(kind)])
+        return [next(pending[EDGE_KIND_CODES[code]]) for code in self.arrays['edges.kinds'].tolist()]
+
+    def load_into(self, network):
+        """Adds the snapshot's nodes and edges to an empty DynamicNetwork."""
+        ids = self.node_ids()
+        for node_id, domain, node_type, attributes, function_path in zip(
+                ids, self.categories('nodes.domain'), self.categories('nodes.type'),
+                self.attributes(), self.categories('nodes.function_path')):
+            network.add_node(Node(node_id, domain, node_type, attributes, function_path))
+        for kind in WEIGHTED_KINDS:
+            labels = self.strings(f'{kind}.labels')
+            sources, targets, label_ids, weights = self.edge_arrays(kind)
+            network.edge_list(kind).extend(EdgeList(map(ids.__getitem__, sources.tolist()), map(ids.__getitem__, targets.tolist()),
+                                                    map(labels.__getitem__, label_ids.tolist()), weights.tolist()))
+        network.dependencies.extend(DependencyHyperedge(sources, target) for sources, target in self.dependencies())
@@ -0,0 +1,100 @@
+"""
+Per-iteration score history of a propagation.
+
+A ScoreHistory records the (node x label) score matrix of each kind after every
+propagation iteration. Iteration 0 holds the models' internal scores. The
+matrices go into preallocated float32 arrays, optionally with a leading scenario
+axis for batched runs.
+
+With depth=None every iteration is kept, up to `capacity`. Pages of the array
+that are never written are never touched, so sizing it for max_iterations is
+cheap. With a depth, the history is a ring buffer of the last `depth`
+iterations, so memory stays bounded however long a run takes.
+
+Methods that solve directly ('fixed_point', 'sweep') record the starting and the
+solved state only.
+
+`columns` ({kind: column indices per node}) says which labels each node has a
+score in at all; reports carry it as a (nodes x labels) 'present' mask, so a
+score that is genuinely 0.0 is told apart from an empty cell.
+
+SimulationEngine.run(history=True or depth) and run_batch attach `report()` as
+results['history']. Without a history the engine passes None and records
+nothing. Reports are plain data; node_series and convergence read them.
+"""
+import numpy as np
+
+class ScoreHistory:
+    def __init__(self, node_ids, labels, capacity, depth=None, scenarios=None, columns=None):
+        if depth is not None and depth < 1:
+            raise ValueError(f"A score history needs a depth of at least 1, got {depth}")
+        self.node_ids = list(node_ids)
+        self.labels = {kind: list(kind_labels) for kind, kind_labels in labels.items()}
+        self.size = capacity if depth is None else min(depth, capacity)
+        self.scenarios = scenarios
+        leading = (self.size,) if scenarios is None else (self.size, scenarios)
+        self.scores = {kind: np.empty(leading + (len(self.node_ids), len(kind_labels)), dtype=np.float32)
+                       for kind, kind_labels in self.labels.items()}
+        self.iterations = np.empty(self.size, dtype=np.int32)
+        self.recorded = 0
+        self.present = {}
+        for kind, kind_labels in self.labels.items():
+            present = np.ones((len(self.node_ids), len(kind_labels)), dtype=bool)
+            if columns is not None:
+                present[:] = False
+                for i, node_columns in enumerate(columns[kind]):
+                    present[i, node_columns] = True
+            self.present[kind] = present
+
+    def record(self, iteration, values):
+        """Stores {kind: score array} as the state after `iteration`, over the oldest entry once full."""
+        slot = self.recorded % self.size
+        for kind, scores in self.scores.items():
+            scores[slot] = values[kind]
+        self.iterations[slot] = iteration
+        self.recorded += 1
+
+    def _order(self):
+        # Slots in chronological order.
+        if self.recorded <= self.size:
+            return np.arange(self.recorded)
+        return (self.recorded + np.arange(self.size)) % self.size
+
+    def report(self, scenario=None):
+        """
+        The history as plain, picklable data: node ids, labels, the recorded
+        iteration numbers, {kind: (iterations x nodes x labels) float32 array}, of
+        one scenario for batched histories, and the {kind: (nodes x labels)} mask
+        of the scores that exist.
+        """
+        order = self._order()
+        if self.scenarios is None:
+            scores = {kind: array[order] for kind, array in self.scores.items()}
+        else:
+            scores = {kind: array[order, scenario] for kind, array in self.scores.items()}
+        return {
+            "node_ids": self.node_ids,
+            "labels": self.labels,
+            "iterations": self.iterations[order],
+            "scores": scores,
+            "present": self.present,
+            "dropped": max(self.recorded - self.size, 0),
+        }
+
+def node_series(history, node_id, kind='value'):
+    """{label: scores over the recorded iterations} of one node, for the labels it has a score in."""
+    i = history['node_ids'].index(node_id)
+    scores = history['scores'][kind][:, i]
+    present = history['present'][kind][i]
+    return {label: scores[:, j] for j, label in enumerate(history['labels'][kind]) if present[j]}
+
+def convergence(history):
+    """
+    The largest score change per kind between consecutive recorded iterations:
+    (iteration numbers, {kind: changes}), one entry per recorded iteration but the first.
+    """
+    changes = {}
+    for kind, scores in history['scores'].items():
+        steps = np.abs(np.diff(scores, axis=0)).reshape(max(len(scores) - 1, 0), -1)
+        changes[kind] = steps.max(axis=1) if steps.shape[1] else np.zeros(len(steps))
+    return history['iterations'][1:], changes
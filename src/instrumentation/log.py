@@ -0,0 +1,65 @@
+"""
+Logging for the simulation packages.
+
+Every module logs through `logging.getLogger(__name__)`, below the package logger
+`src`. Nothing is shown until `configure` is called (warnings aside), so library
+and batch use is silent. Hot paths guard their messages with `isEnabledFor`, so a
+disabled level costs one cached check and no string formatting.
+
+Structured events are log records whose arguments are a dict of fields:
+`event(log, 'scenario_finished', "...%(meta_score).4f", meta_score=...)` renders
+the message for text output, or the fields as one JSON object per line with
+`configure(json_events=True)`.
+"""
+import json
+import logging
+import sys
+
+PACKAGE_LOGGER = __name__.split('.')[0]
+LEVELS = ('debug', 'info', 'warning', 'error')
+
+def event(logger, name, message, level=logging.INFO, **fields):
+    """Logs a named event with its fields; does nothing when `level` is disabled."""
+    if logger.isEnabledFor(level):
+        args = (fields,) if fields else ()
+        logger.log(level, message, *args, extra={'event': name})
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: events keep their fields, other records their message."""
+    def format(self, record):
+        payload = {"time": record.created, "level": record.levelname, "logger": record.name}
+        name = getattr(record, 'event', None)
+        if name is not None:
+            payload["event"] = name
+            payload.update(record.args)
+        else:
+            payload["message"] = record.getMessage().strip()
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=_to_json)
+
+def _to_json(value):
+    # NumPy scalars and arrays.
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+def configure(level='info', json_events=False, stream=None):
+    """
+    Shows the package's log records at `level` ('debug', 'info', 'warning', 'error')
+    on `stream` (default stderr for JSON, stdout for text), as plain messages or as
+    JSON lines. Replaces the handler of an earlier call.
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Unknown log level '{level}', expected one of {LEVELS}")
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    for handler in list(logger.handlers):
+        if getattr(handler, '_configured_here', False):
+            logger.removeHandler(handler)
+    handler = logging.StreamHandler(stream or (sys.stderr if json_events else sys.stdout))
+    handler.setFormatter(JsonFormatter() if json_events else logging.Formatter('%(message)s'))
+    handler._configured_here = True
+    logger.addHandler(handler)
+    logger.setLevel(level.upper())
+    logger.propagate = False
+    return logger
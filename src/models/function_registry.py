@@ -1,3 +1,6 @@
+import hashlib
+import types
+
 from .system_functions import (
     material_search,
     material_assessment,
@@ -9,6 +12,11 @@ from .system_functions import (
     manufacturing_assessment,
     technology_simulation
 )
+from . import vectorized_functions as vectorized
+
+# Bump when model behaviour changes in a way the function code does not show
+# (e.g. data files they read), so cached results computed with it are not reused.
+MODEL_REGISTRY_VERSION = 1
 
 MODEL_FUNCTIONS = {
     'models.system.material_search': material_search,
@@ -21,3 +29,81 @@ MODEL_FUNCTIONS = {
     'models.system.manufacturing_assessment': manufacturing_assessment,
     'models.system.technology_simulation': technology_simulation,
 }
+
+
+# Array-in/array-out forms of the models above (see vectorized_functions.py).
+# Batch evaluators use these instead of calling the scalar form once per sample.
+VECTORIZED_MODEL_FUNCTIONS = {
+    'models.system.material_search': vectorized.material_search,
+    'models.system.material_assessment': vectorized.material_assessment,
+    'models.system.material_prediction': vectorized.material_prediction,
+    'models.system.design_creation': vectorized.design_creation,
+    'models.system.design_assembly': vectorized.design_assembly,
+    'models.system.design_prediction': vectorized.design_prediction,
+    'models.system.technology_selection': vectorized.technology_selection,
+    'models.system.manufacturing_assessment': vectorized.manufacturing_assessment,
+    'models.system.technology_simulation': vectorized.technology_simulation,
+}
+
+def impure(function):
+    """
+    Marks a model function whose scores depend on more than its node's attributes
+    (random draws, files, external services, the node id), so a ModelCache never
+    memoizes it. Usable as a decorator.
+    """
+    function.pure = False
+    return function
+
+def is_pure(function):
+    """False for functions marked `impure`."""
+    return getattr(function, 'pure', True)
+
+def register_model(function_path, function, vectorized_function=None, pure=True):
+    """
+    Registers a model function under `function_path`, optionally together with its
+    vectorized form: a function taking a dict of attribute arrays and returning
+    {'functionality': {label: scores}, 'value': {label: scores}}. pure=False marks
+    it `impure`.
+    """
+    if not pure:
+        impure(function)
+    MODEL_FUNCTIONS[function_path] = function
+    if vectorized_function is not None:
+        VECTORIZED_MODEL_FUNCTIONS[function_path] = vectorized_function
+    else:
+        VECTORIZED_MODEL_FUNCTIONS.pop(function_path, None)
+
+def code_digest(code):
+    """
+    A hash of what a code object does: its bytecode, the names it uses and its
+    constants, nested code objects included. Unlike the whole marshalled code it
+    ignores the file name and line numbers, so moving a function does not change it.
+    """
+    digest = hashlib.sha256(code.co_code)
+    digest.update(repr((code.co_names, tuple(map(_constant_key, code.co_consts)))).encode())
+    return digest.hexdigest()
+
+def _constant_key(constant):
+    if isinstance(constant, types.CodeType):
+        return code_digest(constant)
+    if isinstance(constant, tuple):
+        return tuple(map(_constant_key, constant))
+    if isinstance(constant, frozenset):
+        # Set order follows string hashing, which differs between processes.
+        return ('frozenset', sorted(map(repr, map(_constant_key, constant))))
+    return (type(constant).__name__, repr(constant))
+
+def registry_version(model_functions=None):
+    """
+    A tag identifying a model function registry: MODEL_REGISTRY_VERSION plus the
+    path, qualified name and code digest (see code_digest) of every function. It
+    changes when a model is added, replaced or edited.
+    """
+    digest = hashlib.sha256(f"v{MODEL_REGISTRY_VERSION}".encode())
+    for path, function in sorted((model_functions or MODEL_FUNCTIONS).items()):
+        code = getattr(function, '__code__', None)
+        name = f"{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', repr(function))}"
+        digest.update(f"\0{path}\0{name}\0".encode())
+        if code is not None:
+            digest.update(code_digest(code).encode())
+    return digest.hexdigest()[:16]
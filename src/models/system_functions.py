@@ -1,10 +1,14 @@
+import logging
+
+log = logging.getLogger(__name__)
+
 # --- Material Domain Functions ---
 def material_search(node):
     modulus = node.attributes.get('target_face_sheet_modulus', 0)
     node.functionality_scores['performance'] = max(0, 1 - (modulus / 500.0))
     node.value_scores['total_cost'] = 0.95
     node.value_scores['sustainability'] = 0.5
-    print(f"  - Executed material_search for '{node.id}'")
+    log.debug("  - Executed material_search for '%s'", node.id)
 
 def material_assessment(node):
     # Value
@@ -21,14 +25,14 @@ def material_assessment(node):
     
     conductivity = node.attributes.get('thermal_conductivity', 1)
     node.functionality_scores['thermal_resistance'] = max(0, 1 - (conductivity / 0.2))
-    print(f"  - Executed material_assessment for '{node.id}'")
+    log.debug("  - Executed material_assessment for '%s'", node.id)
 
 def material_prediction(node):
     delamination_risk = node.attributes.get('simulated_delamination_risk', 1.0)
     node.functionality_scores['performance'] = 1.0 - delamination_risk
     node.value_scores['total_cost'] = 1.0
     node.value_scores['sustainability'] = 1.0
-    print(f"  - Executed material_prediction for '{node.id}'")
+    log.debug("  - Executed material_prediction for '%s'", node.id)
 
 # ... (rest of the functions are the same)
 def design_creation(node):
@@ -36,28 +40,28 @@ def design_creation(node):
     node.functionality_scores['performance'] = min(1, thickness / 25.0)
     node.value_scores['total_cost'] = max(0, 1 - (thickness / 50.0))
     node.value_scores['sustainability'] = max(0, 1 - (thickness / 50.0))
-    print(f"  - Executed design_creation for '{node.id}'")
+    log.debug("  - Executed design_creation for '%s'", node.id)
 
 def design_assembly(node):
     ease = node.attributes.get('disassembly_ease', 0)
     node.value_scores['sustainability'] = ease
     node.functionality_scores['performance'] = 0.9
     node.value_scores['total_cost'] = 0.9
-    print(f"  - Executed design_assembly for '{node.id}'")
+    log.debug("  - Executed design_assembly for '%s'", node.id)
 
 def design_prediction(node):
     deflection = node.attributes.get('max_deflection_mm', 10)
     node.functionality_scores['performance'] = max(0, 1 - (deflection / 2.0))
     node.value_scores['total_cost'] = 1.0
     node.value_scores['sustainability'] = 1.0
-    print(f"  - Executed design_prediction for '{node.id}'")
+    log.debug("  - Executed design_prediction for '%s'", node.id)
 
 def technology_selection(node):
     process = node.attributes.get('process', 'hand_layup')
     node.functionality_scores['performance'] = 0.9 if process == 'autoclave_curing' else 0.6
     node.value_scores['total_cost'] = 0.6 if process == 'autoclave_curing' else 0.8
     node.value_scores['sustainability'] = 0.5
-    print(f"  - Executed technology_selection for '{node.id}'")
+    log.debug("  - Executed technology_selection for '%s'", node.id)
 
 def manufacturing_assessment(node):
     energy = node.attributes.get('energy_per_part', 100)
@@ -65,11 +69,11 @@ def manufacturing_assessment(node):
     node.value_scores['sustainability'] = max(0, 1 - ((energy / 100.0) + scrap) / 2)
     node.value_scores['total_cost'] = max(0, 1 - ((energy / 150.0) + scrap) / 2)
     node.functionality_scores['performance'] = 1.0
-    print(f"  - Executed manufacturing_assessment for '{node.id}'")
+    log.debug("  - Executed manufacturing_assessment for '%s'", node.id)
 
 def technology_simulation(node):
     curing_time = node.attributes.get('curing_time_hours', 8)
     node.value_scores['total_cost'] = max(0, 1 - (curing_time / 12.0))
     node.functionality_scores['performance'] = max(0, 1 - (curing_time / 24.0))
     node.value_scores['sustainability'] = max(0, 1 - (curing_time / 12.0))
-    print(f"  - Executed technology_simulation for '{node.id}'")
\ No newline at end of file
+    log.debug("  - Executed technology_simulation for '%s'", node.id)
\ No newline at end of file
@@ -0,0 +1,91 @@
+# Array-in/array-out forms of the models in system_functions.py.
+# Each takes a dict of attribute arrays (or scalars) and returns
+# {'functionality': {label: scores}, 'value': {label: scores}}. Scores broadcast
+# against the attribute arrays and equal the scalar form element for element.
+import numpy as np
+
+# --- Material Domain Functions ---
+def material_search(attributes):
+    modulus = np.asarray(attributes.get('target_face_sheet_modulus', 0))
+    return {
+        'functionality': {'performance': np.maximum(0, 1 - (modulus / 500.0))},
+        'value': {'total_cost': 0.95, 'sustainability': 0.5},
+    }
+
+def material_assessment(attributes):
+    cost = np.asarray(attributes.get('cost_per_m2', 1000))
+    core_density = np.asarray(attributes.get('core_density', 1))
+    recyclability = np.asarray(attributes.get('recyclability_score', 0))
+    face_modulus = np.asarray(attributes.get('face_sheet_modulus', 0))
+    conductivity = np.asarray(attributes.get('thermal_conductivity', 1))
+    return {
+        'functionality': {
+            'structural_rigidity': np.minimum(1.0, face_modulus / 180.0),
+            'thermal_resistance': np.maximum(0, 1 - (conductivity / 0.2)),
+        },
+        'value': {
+            'total_cost': np.maximum(0, 1 - (cost / 500.0)),
+            'sustainability': ((np.maximum(0, 1 - (core_density / 0.1))) + recyclability) / 2,
+        },
+    }
+
+def material_prediction(attributes):
+    delamination_risk = np.asarray(attributes.get('simulated_delamination_risk', 1.0))
+    return {
+        'functionality': {'performance': 1.0 - delamination_risk},
+        'value': {'total_cost': 1.0, 'sustainability': 1.0},
+    }
+
+# --- Design Domain Functions ---
+def design_creation(attributes):
+    thickness = np.asarray(attributes.get('panel_thickness', 0))
+    return {
+        'functionality': {'performance': np.minimum(1, thickness / 25.0)},
+        'value': {
+            'total_cost': np.maximum(0, 1 - (thickness / 50.0)),
+            'sustainability': np.maximum(0, 1 - (thickness / 50.0)),
+        },
+    }
+
+def design_assembly(attributes):
+    ease = np.asarray(attributes.get('disassembly_ease', 0))
+    return {
+        'functionality': {'performance': 0.9},
+        'value': {'sustainability': ease, 'total_cost': 0.9},
+    }
+
+def design_prediction(attributes):
+    deflection = np.asarray(attributes.get('max_deflection_mm', 10))
+    return {
+        'functionality': {'performance': np.maximum(0, 1 - (deflection / 2.0))},
+        'value': {'total_cost': 1.0, 'sustainability': 1.0},
+    }
+
+# --- Manufacturing Domain Functions ---
+def technology_selection(attributes):
+    autoclave = np.asarray(attributes.get('process', 'hand_layup')) == 'autoclave_curing'
+    return {
+        'functionality': {'performance': np.where(autoclave, 0.9, 0.6)},
+        'value': {'total_cost': np.where(autoclave, 0.6, 0.8), 'sustainability': 0.5},
+    }
+
+def manufacturing_assessment(attributes):
+    energy = np.asarray(attributes.get('energy_per_part', 100))
+    scrap = np.asarray(attributes.get('scrap_rate', 1.0))
+    return {
+        'functionality': {'performance': 1.0},
+        'value': {
+            'sustainability': np.maximum(0, 1 - ((energy / 100.0) + scrap) / 2),
+            'total_cost': np.maximum(0, 1 - ((energy / 150.0) + scrap) / 2),
+        },
+    }
+
+def technology_simulation(attributes):
+    curing_time = np.asarray(attributes.get('curing_time_hours', 8))
+    return {
+        'functionality': {'performance': np.maximum(0, 1 - (curing_time / 24.0))},
+        'value': {
+            'total_cost': np.maximum(0, 1 - (curing_time / 12.0)),
+            'sustainability': np.maximum(0, 1 - (curing_time / 12.0)),
+        },
+    }
@@ -0,0 +1,134 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..analysis.batch import AttributeParameter, BatchEvaluator
+from ..config.overlay import ScenarioOverlay
+from ..instrumentation.log import event
+from .strategies import STRATEGIES
+
+log = logging.getLogger(__name__)
+
+# The evaluator of a worker process, built once by _start_worker.
+_worker_evaluator = None
+
+def _start_worker(design, parameters, model_functions, meta_weights, engine_options):
+    global _worker_evaluator
+    _worker_evaluator = BatchEvaluator(design, parameters, model_functions, meta_weights, **engine_options)
+
+def _evaluate_chunk(columns):
+    return _worker_evaluator.evaluate(columns)['meta_score']
+
+def _strategy(strategy):
+    if isinstance(strategy, str):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown optimization strategy '{strategy}', expected one of {tuple(STRATEGIES)}")
+        return STRATEGIES[strategy]()
+    return strategy
+
+def _start_point(evaluator, space):
+    """The design's own parameter values in unit coordinates (0.5 where a value is not set)."""
+    x0 = np.full(len(space), 0.5)
+    for j, dimension in enumerate(space.dimensions):
+        try:
+            x0[j] = np.clip(dimension.encode(evaluator.base_value(dimension.parameter)), 0.0, 1.0)
+        except ValueError:
+            pass
+    return x0
+
+def design_overlay(design, space, values, name):
+    """The design with optimized parameter values, as a ScenarioOverlay on `design`."""
+    attributes, weights = {}, {}
+    for dimension in space.dimensions:
+        parameter, value = dimension.parameter, values[dimension.parameter.name]
+        if isinstance(parameter, AttributeParameter):
+            attributes.setdefault(parameter.node_id, {})[parameter.attribute] = value
+            continue
+        for position, edge in enumerate(design.get('edges', [])):
+            if (edge.get('type'), edge.get('source'), edge.get('target'), edge.get('label')) == \
+                    (parameter.kind, parameter.source, parameter.target, parameter.label):
+                weights[position] = value
+    return ScenarioOverlay(design, name, weights, attributes)
+
+def optimize(design, space, strategy='cmaes', budget=100000, batch_size=4096, seed=0, patience=10, tol=1e-9,
+             workers=1, model_functions=None, meta_weights=None, **engine_options):
+    """
+    Searches `space` (a DesignSpace) for the parameter values maximizing the meta
+    score of `design`.
+
+    `strategy` is a Strategy instance or a name in STRATEGIES ('cmaes', 'surrogate',
+    'random'). Candidates are evaluated in vectorized batches of about `batch_size`
+    through a BatchEvaluator; with workers > 1 every batch is split over a process
+    pool with one evaluator per process. The search stops once `budget` evaluations
+    are spent (a generation in progress completes) or after `patience` generations
+    that improve the best score by less than `tol`. The same seed gives the same
+    search, with any number of workers.
+
+    Returns the best score and parameter values, the best design as a
+    ScenarioOverlay, the design's own (baseline) score and a per-generation history.
+    """
+    strategy = _strategy(strategy)
+    parameters = space.parameters
+    evaluator = BatchEvaluator(design, parameters, model_functions, meta_weights, **engine_options)
+    rng = np.random.default_rng(seed)
+    x0 = _start_point(evaluator, space)
+    strategy.start(len(space), rng, x0)
+    baseline = float(evaluator.evaluate(space.decode(x0))['meta_score'][0])
+
+    pool = None
+    if workers and workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                                   initargs=(design, parameters, model_functions, meta_weights, engine_options))
+
+    def evaluate(candidates):
+        columns = space.decode(candidates)
+        if pool is None:
+            return evaluator.evaluate(columns)['meta_score']
+        bounds = np.linspace(0, len(candidates), min(workers, len(candidates)) + 1).astype(int)
+        chunks = [[column[start:stop] for column in columns] for start, stop in zip(bounds[:-1], bounds[1:])]
+        return np.concatenate(list(pool.map(_evaluate_chunk, chunks)))
+
+    log.info("--- Optimizing %s: %d parameters, %s, budget %d ---",
+             design['name'], len(space), type(strategy).__name__, budget)
+    best_score, best_candidate = baseline, x0
+    history, evaluations, stale, stopped = [], 0, 0, 'budget'
+    try:
+        while evaluations < budget:
+            candidates = strategy.ask(min(batch_size, budget - evaluations))
+            scores = evaluate(candidates)
+            strategy.tell(candidates, scores)
+            evaluations += len(candidates)
+
+            top = int(np.argmax(scores))
+            improved = scores[top] > best_score + tol
+            if scores[top] > best_score:
+                best_score, best_candidate = float(scores[top]), candidates[top]
+            history.append({"generation": len(history) + 1, "evaluations": evaluations,
+                            "best": best_score, "mean": float(np.mean(scores))})
+            event(log, 'optimizer_generation', "  - generation %(generation)d: best %(best).6f (%(evaluations)d evaluations)",
+                  logging.DEBUG, design=design['name'], **history[-1])
+            stale = 0 if improved else stale + 1
+            if stale >= patience:
+                stopped = 'no_improvement'
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    values = space.values(best_candidate)
+    event(log, 'optimizer_finished', "  - Best meta score %(best_score).4f (baseline %(baseline).4f) after %(evaluations)d evaluations.",
+          design=design['name'], best_score=best_score, baseline=baseline, evaluations=evaluations, stopped=stopped)
+    return {
+        "design": design['name'],
+        "strategy": type(strategy).__name__,
+        "seed": seed,
+        "evaluations": evaluations,
+        "generations": len(history),
+        "stopped": stopped,
+        "baseline_score": baseline,
+        "best_score": best_score,
+        "best_values": values,
+        "best_design": design_overlay(design, space, values, f"{design['name']}_Optimized"),
+        "history": history,
+    }
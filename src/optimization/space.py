@@ -0,0 +1,88 @@
+import numpy as np
+
+from ..analysis.batch import AttributeParameter, WeightParameter
+
+class Real:
+    """A continuous parameter searched within [low, high]."""
+    def __init__(self, parameter, low, high):
+        if not low < high:
+            raise ValueError(f"Empty range [{low}, {high}] for {parameter}")
+        self.parameter = parameter
+        self.low = low
+        self.high = high
+
+    def decode(self, unit):
+        return self.low + np.clip(unit, 0.0, 1.0) * (self.high - self.low)
+
+    def encode(self, value):
+        return (value - self.low) / (self.high - self.low)
+
+    def __repr__(self):
+        return f"Real({self.parameter.name} in [{self.low}, {self.high}])"
+
+class Categorical:
+    """A parameter taking one of `choices`, e.g. the manufacturing `process`."""
+    def __init__(self, parameter, choices):
+        if not choices:
+            raise ValueError(f"No choices for {parameter}")
+        self.parameter = parameter
+        self.choices = list(choices)
+
+    def decode(self, unit):
+        # [0, 1] is cut into one equal interval per choice.
+        index = np.minimum((np.clip(unit, 0.0, 1.0) * len(self.choices)).astype(int), len(self.choices) - 1)
+        return np.asarray(self.choices)[index]
+
+    def encode(self, value):
+        return (self.choices.index(value) + 0.5) / len(self.choices)
+
+    def __repr__(self):
+        return f"Categorical({self.parameter.name} in {self.choices})"
+
+class DesignSpace:
+    """
+    The parameters an optimizer may change. Strategies search the unit hypercube,
+    one coordinate per dimension; `decode` maps candidates to parameter values.
+    """
+    def __init__(self, dimensions):
+        self.dimensions = list(dimensions)
+        names = [d.parameter.name for d in self.dimensions]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Parameters appear more than once in the design space: {names}")
+
+    def __len__(self):
+        return len(self.dimensions)
+
+    @property
+    def parameters(self):
+        return [d.parameter for d in self.dimensions]
+
+    def decode(self, candidates):
+        """One value array per parameter, for (n x dimensions) unit candidates (BatchEvaluator columns)."""
+        candidates = np.atleast_2d(candidates)
+        return [dimension.decode(candidates[:, j]) for j, dimension in enumerate(self.dimensions)]
+
+    def encode(self, values):
+        """The unit coordinates of {parameter name: value}, e.g. a design's current attributes."""
+        return np.array([d.encode(values[d.parameter.name]) for d in self.dimensions], dtype=float)
+
+    def values(self, candidate):
+        """{parameter name: value} of one unit candidate, as plain Python values."""
+        return {d.parameter.name: column[0].item() for d, column in zip(self.dimensions, self.decode(candidate))}
+
+    def __repr__(self):
+        return f"DesignSpace({self.dimensions})"
+
+def space_from_config(entries):
+    """Builds a DesignSpace from the declarative entries in src/config/config.py."""
+    dimensions = []
+    for entry in entries:
+        if 'attribute' in entry:
+            parameter = AttributeParameter(*entry['attribute'])
+        else:
+            parameter = WeightParameter(*entry['weight'])
+        if 'choices' in entry:
+            dimensions.append(Categorical(parameter, entry['choices']))
+        else:
+            dimensions.append(Real(parameter, *entry['range']))
+    return DesignSpace(dimensions)
@@ -0,0 +1,176 @@
+"""
+Search strategies for the design optimizer.
+
+A strategy proposes candidates in the unit hypercube of a DesignSpace and learns
+from their scores (higher is better) through an ask/tell interface:
+
+    strategy.start(dimension, rng, x0)
+    candidates = strategy.ask(n)      # (n x dimension) array in [0, 1]
+    strategy.tell(candidates, scores)
+
+`ask` may return fewer or more rows than `n` when the strategy works in
+generations of its own size. New strategies only need these three methods.
+"""
+import numpy as np
+
+class Strategy:
+    def start(self, dimension, rng, x0=None):
+        self.dimension = dimension
+        self.rng = rng
+        self.x0 = None if x0 is None else np.clip(np.asarray(x0, dtype=float), 0.0, 1.0)
+
+    def ask(self, n):
+        raise NotImplementedError
+
+    def tell(self, candidates, scores):
+        pass
+
+def latin_hypercube(rng, n, dimension):
+    """`n` points in [0, 1]^dimension, one per stratum of every coordinate."""
+    strata = np.argsort(rng.random((dimension, n)), axis=1).T
+    return (strata + rng.random((n, dimension))) / n
+
+class RandomSearch(Strategy):
+    """Uniform random candidates, drawn as Latin hypercube batches."""
+    def ask(self, n):
+        return latin_hypercube(self.rng, n, self.dimension)
+
+class EvolutionStrategy(Strategy):
+    """
+    CMA-ES (mu/mu_w, lambda) maximizing the score in the unit hypercube.
+
+    Each generation samples `population` candidates from a multivariate normal
+    around the mean, then moves the mean towards the best half and adapts the
+    covariance and step size. A large population (the default is the batch size
+    the optimizer asks for) suits vectorized evaluation and rugged objectives.
+    Candidates are clipped to the hypercube, and the clipped steps drive the update.
+    """
+    def __init__(self, population=None, sigma=0.3):
+        self.population = population
+        self.sigma0 = sigma
+
+    def start(self, dimension, rng, x0=None):
+        super().start(dimension, rng, x0)
+        n = dimension
+        self.mean = self.x0 if self.x0 is not None else np.full(n, 0.5)
+        self.sigma = self.sigma0
+        self.covariance = np.eye(n)
+        self.basis = np.eye(n)
+        self.scales = np.ones(n)
+        self.path_sigma = np.zeros(n)
+        self.path_c = np.zeros(n)
+        self.generation = 0
+        self.chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+        self._steps = None
+        self._lambda = None
+
+    def _constants(self, lam):
+        n = self.dimension
+        mu = lam // 2
+        weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        weights /= weights.sum()
+        mueff = 1 / np.sum(weights ** 2)
+        cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+        cs = (mueff + 2) / (n + mueff + 5)
+        c1 = 2 / ((n + 1.3) ** 2 + mueff)
+        cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2) ** 2 + mueff))
+        damps = 1 + 2 * max(0.0, np.sqrt((mueff - 1) / (n + 1)) - 1) + cs
+        return weights, mueff, cc, cs, c1, cmu, damps
+
+    def ask(self, n):
+        lam = self.population or max(n, 4 + int(3 * np.log(self.dimension)))
+        z = self.rng.standard_normal((lam, self.dimension))
+        candidates = np.clip(self.mean + self.sigma * (z * self.scales) @ self.basis.T, 0.0, 1.0)
+        self._steps = (candidates - self.mean) / self.sigma
+        self._lambda = lam
+        return candidates
+
+    def tell(self, candidates, scores):
+        weights, mueff, cc, cs, c1, cmu, damps = self._constants(self._lambda)
+        order = np.argsort(-np.asarray(scores), kind='stable')[:len(weights)]
+        steps = self._steps[order]
+        step = weights @ steps
+        self.mean = self.mean + self.sigma * step
+        self.generation += 1
+
+        inverse_sqrt = self.basis @ np.diag(1 / self.scales) @ self.basis.T
+        self.path_sigma = (1 - cs) * self.path_sigma + np.sqrt(cs * (2 - cs) * mueff) * inverse_sqrt @ step
+        norm = np.linalg.norm(self.path_sigma)
+        hsig = norm / np.sqrt(1 - (1 - cs) ** (2 * self.generation)) / self.chi_n < 1.4 + 2 / (self.dimension + 1)
+        self.path_c = (1 - cc) * self.path_c + hsig * np.sqrt(cc * (2 - cc) * mueff) * step
+        rank_mu = (steps * weights[:, None]).T @ steps
+        self.covariance = ((1 - c1 - cmu) * self.covariance
+                           + c1 * (np.outer(self.path_c, self.path_c) + (1 - hsig) * cc * (2 - cc) * self.covariance)
+                           + cmu * rank_mu)
+        self.sigma = min(self.sigma * np.exp((cs / damps) * (norm / self.chi_n - 1)), 1.0)
+
+        self.covariance = np.triu(self.covariance) + np.triu(self.covariance, 1).T
+        eigenvalues, self.basis = np.linalg.eigh(self.covariance)
+        self.scales = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+class SurrogateSearch(Strategy):
+    """
+    Surrogate-assisted search: a quadratic response surface, fitted by ridge
+    regression to every candidate evaluated so far, screens a large pool of
+    proposals (perturbations of the best candidates plus uniform points) and only
+    the most promising ones are evaluated. A share `explore` of each batch is
+    taken from the pool at random to keep the surface honest.
+    """
+    def __init__(self, initial=256, pool_factor=8, explore=0.2, elite=32, spread=0.1, ridge=1e-6):
+        self.initial = initial
+        self.pool_factor = pool_factor
+        self.explore = explore
+        self.elite = elite
+        self.spread = spread
+        self.ridge = ridge
+
+    def start(self, dimension, rng, x0=None):
+        super().start(dimension, rng, x0)
+        self.points = np.empty((0, dimension))
+        self.scores = np.empty(0)
+        self.model = None
+
+    def _features(self, x):
+        pairs = np.triu_indices(self.dimension)
+        return np.hstack([np.ones((len(x), 1)), x, (x[:, :, None] * x[:, None, :])[:, pairs[0], pairs[1]]])
+
+    def _fit(self):
+        features = self._features(self.points)
+        gram = features.T @ features + self.ridge * np.eye(features.shape[1])
+        self.model = np.linalg.solve(gram, features.T @ self.scores)
+
+    def predict(self, x):
+        """The surrogate's predicted scores of unit candidates."""
+        return self._features(np.atleast_2d(x)) @ self.model
+
+    def ask(self, n):
+        if len(self.scores) < self.initial or self.model is None:
+            candidates = latin_hypercube(self.rng, n, self.dimension)
+            if self.x0 is not None and not len(self.scores):
+                candidates[0] = self.x0
+            return candidates
+
+        pool_size = n * self.pool_factor
+        best = self.points[np.argsort(-self.scores, kind='stable')[:self.elite]]
+        local = best[self.rng.integers(len(best), size=pool_size // 2)]
+        local = np.clip(local + self.spread * self.rng.standard_normal(local.shape), 0.0, 1.0)
+        pool = np.vstack([local, latin_hypercube(self.rng, pool_size - len(local), self.dimension)])
+
+        n_explore = int(round(n * self.explore))
+        ranked = np.argsort(-self.predict(pool), kind='stable')
+        chosen = ranked[:n - n_explore]
+        rest = ranked[n - n_explore:]
+        explore = self.rng.choice(rest, size=min(n_explore, len(rest)), replace=False)
+        return pool[np.concatenate([chosen, explore])]
+
+    def tell(self, candidates, scores):
+        self.points = np.vstack([self.points, candidates])
+        self.scores = np.concatenate([self.scores, scores])
+        if len(self.scores) >= self.initial:
+            self._fit()
+
+STRATEGIES = {
+    'cmaes': EvolutionStrategy,
+    'surrogate': SurrogateSearch,
+    'random': RandomSearch,
+}
@@ -1,6 +1,11 @@
 from fpdf import FPDF
+import hashlib
+import io
+import logging
 import os
 
+log = logging.getLogger(__name__)
+
 class PDF(FPDF):
     def header(self):
         self.set_font('Arial', 'B', 12)
@@ -22,54 +27,165 @@ def add_summary_placeholder(pdf):
     pdf.set_y(y_before + box_height)
     pdf.set_font('Arial', '', 12)
 
-def generate_pdf_report(base_design_results, summary_chart_path, weighting_study_results, weighting_chart_path):
-    """Generates a multi-page PDF report summarizing all simulation runs."""
-    pdf = PDF()
-    
+class ReportBuilder:
+    """
+    Builds a PDF report from image files or in-memory PNG buffers (bytes or BytesIO).
+
+    An image is embedded once per document, however often and under whatever name
+    it is placed: sources are identified by their content. With `batch_pages`, the
+    report is written as a series of files (`<stem>_part001.pdf`, ...) of about that
+    many pages each, so a large report never holds more than one batch in memory.
+    """
+    def __init__(self, path="Simulation_Report.pdf", batch_pages=None):
+        self.path = path
+        self.batch_pages = batch_pages
+        self.files = []
+        self.pdf = None
+        self._images = {}
+        self._digests = {}
+        self._new_document()
+
+    def _new_document(self):
+        self.pdf = PDF()
+        self._images = {}
+
+    def _image_buffer(self, source):
+        # Files are read once; identical content shares one buffer, so FPDF embeds it once.
+        if isinstance(source, (str, os.PathLike)):
+            digest = self._digests.get(source)
+            if digest is None or digest not in self._images:
+                with open(source, 'rb') as f:
+                    data = f.read()
+                digest = self._digests[source] = hashlib.sha256(data).hexdigest()
+                self._images.setdefault(digest, io.BytesIO(data))
+            return self._images[digest]
+        data = source.getvalue() if isinstance(source, io.BytesIO) else bytes(source)
+        return self._images.setdefault(hashlib.sha256(data).hexdigest(), io.BytesIO(data))
+
+    def image(self, source, **placement):
+        """Places an image (a path, PNG bytes or a BytesIO) with FPDF.image's placement arguments."""
+        self.pdf.image(self._image_buffer(source), **placement)
+
+    def section(self):
+        """Marks a point where the report may be split into the next file."""
+        if self.batch_pages and self.pdf.page_no() >= self.batch_pages:
+            self._write()
+            self._new_document()
+
+    def page(self, title, size=14, height=10):
+        self.pdf.add_page()
+        self.pdf.set_font('Arial', 'B', size)
+        self.pdf.cell(0, height, title, 0, 1, 'C')
+
+    def _write(self):
+        if not self.pdf.page_no():
+            return
+        if self.batch_pages:
+            stem, extension = os.path.splitext(self.path)
+            filename = f"{stem}_part{len(self.files) + 1:03d}{extension}"
+        else:
+            filename = self.path
+        self.pdf.output(filename)
+        self.files.append(filename)
+
+    def close(self):
+        """Writes the (last) document and returns the files written."""
+        self._write()
+        self.pdf = None
+        self._images = {}
+        return self.files
+
+SUMMARY_COLUMNS = (('Scenario', 0.46), ('Meta Score', 0.135), ('Functionality', 0.135), ('Value', 0.135), ('Sustainability', 0.135))
+
+def add_results_table(report, all_results):
+    """
+    A table of one row per scenario (meta and overall scores), continued over as
+    many pages as needed; `all_results` may be any iterable of results, such as a
+    ResultStore.
+    """
+    def header_row():
+        pdf.set_font('Arial', 'B', 9)
+        for title, share in SUMMARY_COLUMNS:
+            pdf.cell(width * share, 6, title, 1, 0, 'C')
+        pdf.ln()
+        pdf.set_font('Arial', '', 8)
+
+    pdf = report.pdf
+    width = pdf.w - pdf.l_margin - pdf.r_margin
+    header_row()
+    for res in all_results:
+        if pdf.get_y() + 5 > pdf.h - pdf.b_margin:
+            report.section()
+            pdf = report.pdf
+            pdf.add_page()
+            header_row()
+        overall = res['overall_scores']
+        values = [res['scenario_name'], res['meta_score'], overall['Functionality'], overall['Value'], overall['Sustainability']]
+        for (_, share), value in zip(SUMMARY_COLUMNS, values):
+            text = value if isinstance(value, str) else f"{value:.4f}"
+            pdf.cell(width * share, 5, text, 1, 0, 'L' if isinstance(value, str) else 'R')
+        pdf.ln()
+
+def generate_pdf_report(base_design_results, summary_chart_path, weighting_study_results, weighting_chart_path,
+                        images=None, summary_only=False, filename="Simulation_Report.pdf", batch_pages=None):
+    """
+    Generates a multi-page PDF report summarizing all simulation runs.
+
+    The charts may be paths or in-memory PNG buffers; `images` maps the per-scenario
+    figure file names ('detailed_scores_<name>.png', 'network_<name>.png') to
+    buffers, which are used instead of files on disk. summary_only=True replaces the
+    per-scenario pages with tables of one row per scenario, which scales to
+    thousands of scenarios. `batch_pages` splits the report into several files (see
+    ReportBuilder). Returns the files written.
+    """
+    images = images or {}
+    report = ReportBuilder(filename, batch_pages)
+
     # --- Title Page with Base Design Comparison ---
-    pdf.add_page()
-    pdf.set_font('Arial', 'B', 16)
-    pdf.cell(0, 15, 'Part 1: Base Design Concept Comparison', 0, 1, 'C')
-    pdf.image(summary_chart_path, x=10, w=pdf.w - 20)
-    add_summary_placeholder(pdf)
-    
+    report.page('Part 1: Base Design Concept Comparison', size=16, height=15)
+    report.image(summary_chart_path, x=10, w=report.pdf.w - 20)
+    add_summary_placeholder(report.pdf)
+
+    if summary_only:
+        report.pdf.ln(5)
+        add_results_table(report, base_design_results)
+
     # --- Detailed Pages for Each Base Design (Balanced Weights) ---
-    for res in base_design_results:
+    for res in ([] if summary_only else base_design_results):
+        report.section()
         scenario_name = res['scenario_name']
         safe_name = scenario_name.replace(' ', '_').replace('/', '_')
-        
-        pdf.add_page()
-        pdf.set_font('Arial', 'B', 16)
-        pdf.cell(0, 15, f"Detailed Analysis for: {scenario_name}", 0, 1, 'C')
-        
-        pdf.add_page()
-        pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, f"Design Variation for: {scenario_name}", 0, 1, 'C')
+
+        report.page(f"Detailed Analysis for: {scenario_name}", size=16, height=15)
+
+        report.page(f"Design Variation for: {scenario_name}")
+        pdf = report.pdf
         image_path = res['config'].get('image_path')
         if image_path and os.path.exists(image_path):
-            pdf.image(image_path, x=10, y=30, w=pdf.w - 20)
+            report.image(image_path, x=10, y=30, w=pdf.w - 20)
         else:
             pdf.set_font('Arial', 'I', 12)
             pdf.set_xy(10, 30)
             pdf.cell(pdf.w - 20, 20, f"[Image not found at path: {image_path}]", 1, 1, 'C')
-            
-        pdf.add_page()
-        pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, f"Detailed Domain Scores for: {scenario_name}", 0, 1, 'C')
-        pdf.image(f"detailed_scores_{safe_name}.png", x=10, y=30, w=pdf.w - 20)
-        
-        pdf.add_page()
-        pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, f"Network Graph for: {scenario_name}", 0, 1, 'C')
-        pdf.image(f"network_{safe_name}.png", x=10, y=30, w=pdf.w - 20)
+
+        scores_image = f"detailed_scores_{safe_name}.png"
+        report.page(f"Detailed Domain Scores for: {scenario_name}")
+        report.image(images.get(scores_image, scores_image), x=10, y=30, w=pdf.w - 20)
+
+        network_image = f"network_{safe_name}.png"
+        report.page(f"Network Graph for: {scenario_name}")
+        report.image(images.get(network_image, network_image), x=10, y=30, w=pdf.w - 20)
 
     # --- New Section for Weighting Analysis ---
-    pdf.add_page()
-    pdf.set_font('Arial', 'B', 16)
-    pdf.cell(0, 15, 'Part 2: Weighting Strategy Uncertainty Analysis', 0, 1, 'C')
-    pdf.image(weighting_chart_path, x=10, w=pdf.w - 20)
-    add_summary_placeholder(pdf)
-        
-    filename = "Simulation_Report.pdf"
-    pdf.output(filename)
-    print(f"\nGenerated final PDF report: {filename}")
\ No newline at end of file
+    report.section()
+    report.page('Part 2: Weighting Strategy Uncertainty Analysis', size=16, height=15)
+    report.image(weighting_chart_path, x=10, w=report.pdf.w - 20)
+    add_summary_placeholder(report.pdf)
+
+    if summary_only:
+        report.pdf.ln(5)
+        add_results_table(report, weighting_study_results)
+
+    files = report.close()
+    log.info("\nGenerated final PDF report: %s", ", ".join(files))
+    return files
@@ -33,4 +33,84 @@ def print_iteration_summary(all_results):
 
     print("\n==========================================================")
     print(f"🏆 Best Performing Iteration: '{best_iteration}' with a Meta Score of {best_score:.4f}")
-    print("==========================================================")
\ No newline at end of file
+    print("==========================================================")
+
+def print_monte_carlo_summary(study):
+    """
+    Prints the meta-score distribution of every design in a Monte Carlo study and
+    the probability that each design ranks best.
+    """
+    print("==========================================================")
+    print("            MONTE CARLO UNCERTAINTY ANALYSIS              ")
+    print("==========================================================")
+    print(f"  Samples: {study['n_samples']} (seed {study['seed']})")
+    for uncertainty in study['uncertainties']:
+        print(f"    - {uncertainty}")
+
+    for name, summary in study['summary'].items():
+        stats = summary['meta_score']
+        print(f"\n--- {name} ---")
+        print(f"  Meta Score: mean {stats['mean']:.4f}, std {stats['std']:.4f}, "
+              f"p5 {stats['p5']:.4f}, median {stats['p50']:.4f}, p95 {stats['p95']:.4f}")
+        for key, overall in summary['overall_scores'].items():
+            print(f"  {key}: mean {overall['mean']:.4f} [p5 {overall['p5']:.4f}, p95 {overall['p95']:.4f}]")
+        print(f"  Probability of ranking best: {summary['probability_best']:.1%}")
+
+    best = max(study['summary'], key=lambda name: study['summary'][name]['probability_best'])
+    print("\n==========================================================")
+    print(f"🏆 Most likely best design: '{best}' ({study['summary'][best]['probability_best']:.1%} of samples)")
+    print("==========================================================")
+
+def print_optimization_summary(studies):
+    """Prints, per design, the best meta score the optimizer found and the parameter values behind it."""
+    print("==========================================================")
+    print("                   DESIGN OPTIMIZATION                    ")
+    print("==========================================================")
+    for study in studies:
+        print(f"\n--- {study['design']} ({study['strategy']}, seed {study['seed']}) ---")
+        print(f"  Meta Score: {study['best_score']:.4f} (baseline {study['baseline_score']:.4f}, "
+              f"{study['evaluations']} evaluations in {study['generations']} generations, stopped on {study['stopped']})")
+        for name, value in study['best_values'].items():
+            print(f"  {name}: {value:.4f}" if isinstance(value, float) else f"  {name}: {value}")
+
+    best = max(studies, key=lambda study: study['best_score'])
+    print("\n==========================================================")
+    print(f"🏆 Best optimized design: '{best['design']}' (meta score {best['best_score']:.4f})")
+    print("==========================================================")
+
+def print_sensitivity_summary(study, output='meta_score', top=None):
+    """
+    Prints, per design, the sensitivity indices of `output` (the meta score by
+    default) for every parameter, most influential first.
+    """
+    method = study['method']
+    key, columns = ('ST', ('S1', 'S1_conf', 'ST', 'ST_conf')) if method == 'sobol' else ('mu_star', ('mu', 'mu_star', 'sigma'))
+    print("==========================================================")
+    print("                 SENSITIVITY ANALYSIS                     ")
+    print("==========================================================")
+    print(f"Method: {method}, {study['evaluations']} evaluations per design (seed {study['seed']}), output: {output}")
+    width = max(len(name) for name in study['parameters'])
+    for design, outputs in study['indices'].items():
+        print(f"\n--- {design} ---")
+        print(f"  {'Parameter':<{width}}" + "".join(f"{column:>10}" for column in columns))
+        ranked = sorted(outputs[output].items(), key=lambda item: abs(item[1][key]), reverse=True)
+        for name, indices in ranked[:top]:
+            print(f"  {name:<{width}}" + "".join(f"{indices[column]:>10.4f}" for column in columns))
+    print("==========================================================")
+
+def print_ranking(ranking, top=None):
+    """
+    Prints the ranked table of every meta score definition in a Ranking and each
+    scenario's mean rank across them.
+    """
+    print("==========================================================")
+    print("              META SCORE RANKING BY DEFINITION            ")
+    print("==========================================================")
+    for definition in ranking.definitions:
+        print(f"\n--- {definition.name} ---")
+        for row in ranking.table(definition.name, top):
+            print(f"  {row['rank']:>3}. {row['scenario']:<45} {row['meta_score']:.4f}")
+
+    print("\n--- Mean rank across definitions ---")
+    for name, mean_rank in sorted(ranking.mean_rank().items(), key=lambda item: item[1])[:top]:
+        print(f"  {mean_rank:6.2f}  {name}")
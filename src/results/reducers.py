@@ -0,0 +1,148 @@
+"""
+Reducers consume result payloads as a sweep produces them, so nothing has to
+keep the whole sweep in memory. A reducer has `add(results)` and `result()`;
+`reduce` feeds one stream of payloads to several of them.
+"""
+import heapq
+import math
+
+from .store import ResultStore, ResultWriter
+
+def reduce(all_results, *reducers):
+    """Feeds every result to each reducer and returns their results, in order."""
+    for results in all_results:
+        for reducer in reducers:
+            reducer.add(results)
+    return [reducer.result() for reducer in reducers]
+
+class Collect:
+    """Keeps every result, like the plain lists it replaces (for small studies)."""
+    def __init__(self):
+        self.results = []
+
+    def add(self, results):
+        self.results.append(results)
+
+    def result(self):
+        return self.results
+
+class BestSoFar:
+    """
+    The `n` results with the highest `key(results)` (default: meta score), best first.
+    Ties keep the earlier result. Only the n results are held.
+    """
+    def __init__(self, n=1, key=None):
+        self.n = n
+        self.key = key or (lambda results: results['meta_score'])
+        self._heap = []
+        self._count = 0
+
+    def add(self, results):
+        # Min-heap of (score, -arrival): the root is the worst kept result.
+        entry = (self.key(results), -self._count, results)
+        self._count += 1
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def result(self):
+        return [results for _, _, results in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+class _Running:
+    """Count, mean, variance (Welford), min and max of a stream of numbers."""
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def summary(self):
+        std = math.sqrt(self.m2 / self.count) if self.count else 0.0
+        return {"count": self.count, "mean": self.mean, "std": std, "min": self.min, "max": self.max}
+
+class Aggregate:
+    """
+    Running statistics of the meta score and the overall scores, optionally per
+    group (`group(results)`, e.g. the base design a variant belongs to).
+    """
+    def __init__(self, group=None):
+        self.group = group
+        self._stats = {}
+
+    def add(self, results):
+        stats = self._stats.setdefault(self.group(results) if self.group else None, {})
+        stats.setdefault('meta_score', _Running()).add(float(results['meta_score']))
+        for name, score in results['overall_scores'].items():
+            stats.setdefault(name, _Running()).add(float(score))
+
+    def result(self):
+        """{metric: summary}, or {group: {metric: summary}} with a `group` function."""
+        summaries = {group: {metric: running.summary() for metric, running in stats.items()}
+                     for group, stats in self._stats.items()}
+        return summaries if self.group else summaries.get(None, {})
+
+class ToStore:
+    """Streams results into a result store and opens it for reading at the end."""
+    def __init__(self, directory, format='arrow', row_group_size=65536):
+        self.writer = ResultWriter(directory, format, row_group_size)
+
+    def add(self, results):
+        self.writer.append(results)
+
+    def result(self):
+        self.writer.close()
+        return ResultStore(self.writer.directory)
+
+class Profiles:
+    """
+    {scenario name: profile report} of results run with profile=True, for
+    instrumentation.profile.write_trace. A batch shares one profile, which is kept
+    once, under its first scenario.
+    """
+    def __init__(self):
+        self.profiles = {}
+        self._seen = set()
+
+    def add(self, results):
+        profile = results.get('profile')
+        if profile is None or id(profile) in self._seen:
+            return
+        self._seen.add(id(profile))
+        self.profiles[results['scenario_name']] = profile
+
+    def result(self):
+        return self.profiles
+
+class ModelCacheCalls:
+    """
+    Total model cache hits and misses of results run with a ModelCache. A batch
+    shares one count, which is added once.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        # Holds the counts it has seen, so their ids are not reused by later ones.
+        self._seen = {}
+
+    def add(self, results):
+        calls = results.get('model_cache')
+        if calls is None or id(calls) in self._seen:
+            return
+        self._seen[id(calls)] = calls
+        self.hits += calls['hits']
+        self.misses += calls['misses']
+
+    def result(self):
+        return {"hits": self.hits, "misses": self.misses}
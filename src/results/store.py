@@ -0,0 +1,253 @@
+"""
+Columnar storage of simulation results.
+
+A result store is a directory with two tables, written as Arrow IPC files
+(format='arrow', memory-mapped on reading) or Parquet files (format='parquet'):
+
+- scores: one row per final score, with the columns
+  scenario, node, domain, kind ('functionality'/'value'), label, score.
+- scenarios: one row per run, with the meta score, one 'overall.<name>' column
+  per overall score, the convergence report, the nodes' domains and attributes,
+  the scenario config (as JSON) and the run's slice of the scores table.
+
+ResultWriter appends result payloads (see simulation.runner.to_payload) and
+writes them out in row groups, so a sweep never holds more than one group.
+ResultStore reads a store back; iterating it yields result payloads, so the
+reporting functions accept it in place of a list of results.
+Both need pyarrow, which is only imported when a store is used.
+"""
+import json
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+FORMATS = ('arrow', 'parquet')
+SCORE_KINDS = ('functionality', 'value')
+OVERALL_PREFIX = 'overall.'
+
+def _paths(directory, format):
+    extension = 'arrow' if format == 'arrow' else 'parquet'
+    return {table: os.path.join(directory, f"{table}.{extension}") for table in ('scores', 'scenarios')}
+
+def _score_schema():
+    import pyarrow as pa
+    return pa.schema([
+        ('scenario', pa.string()), ('node', pa.string()), ('domain', pa.string()),
+        ('kind', pa.string()), ('label', pa.string()), ('score', pa.float64()),
+    ])
+
+def _scenario_schema(overall_names):
+    import pyarrow as pa
+    return pa.schema(
+        [('scenario', pa.string()), ('meta_score', pa.float64())]
+        + [(OVERALL_PREFIX + name, pa.float64()) for name in overall_names]
+        + [('method', pa.string()), ('iterations', pa.int64()), ('residual', pa.float64()),
+           ('converged', pa.bool_()), ('first_score', pa.int64()), ('n_scores', pa.int64()),
+           ('nodes', pa.string()), ('config', pa.string())]
+    )
+
+class ResultWriter:
+    """
+    Appends result payloads to a result store in `directory`, flushing every
+    `row_group_size` scores. Use as a context manager, or call `close()`.
+    """
+    def __init__(self, directory, format='arrow', row_group_size=65536):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown result store format '{format}', expected one of {FORMATS}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.format = format
+        self.row_group_size = row_group_size
+        self.paths = _paths(directory, format)
+        self.n_scores = 0
+        self.n_scenarios = 0
+        self._overall_names = None
+        self._writers = {}
+        self._scores = {name: [] for name in _score_schema().names}
+        self._scenarios = []
+
+    def append(self, results):
+        """Adds one run (a payload or a results dict from SimulationEngine.run)."""
+        scenario = results['scenario_name']
+        overall = {name: float(score) for name, score in results['overall_scores'].items()}
+        if self._overall_names is None:
+            self._overall_names = list(overall)
+        elif list(overall) != self._overall_names:
+            raise ValueError(f"Scenario '{scenario}' has overall scores {list(overall)}, "
+                             f"expected {self._overall_names}")
+
+        first = self.n_scores + len(self._scores['score'])
+        columns = self._scores
+        nodes = {}
+        for node_id, state in results['node_states'].items():
+            nodes[node_id] = {"domain": state['domain'], "attributes": dict(state['attributes'])}
+            for kind in SCORE_KINDS:
+                for label, score in state[f"final_{kind}_scores"].items():
+                    columns['scenario'].append(scenario)
+                    columns['node'].append(node_id)
+                    columns['domain'].append(state['domain'])
+                    columns['kind'].append(kind)
+                    columns['label'].append(label)
+                    columns['score'].append(float(score))
+
+        convergence = results.get('convergence') or {}
+        row = {"scenario": scenario, "meta_score": float(results['meta_score'])}
+        row.update({OVERALL_PREFIX + name: score for name, score in overall.items()})
+        row.update({
+            "method": convergence.get('method'),
+            "iterations": convergence.get('iterations'),
+            "residual": convergence.get('residual'),
+            "converged": convergence.get('converged'),
+            "first_score": first,
+            "n_scores": self.n_scores + len(columns['score']) - first,
+            "nodes": json.dumps(nodes, default=_to_json),
+            "config": json.dumps(results.get('config'), default=_to_json),
+        })
+        self._scenarios.append(row)
+        if len(columns['score']) >= self.row_group_size:
+            self.flush()
+
+    def extend(self, all_results):
+        for results in all_results:
+            self.append(results)
+
+    def flush(self):
+        """Writes the buffered rows as one row group (record batch) per table."""
+        import pyarrow as pa
+        if not self._scenarios:
+            return
+        scores = pa.table(self._scores, schema=_score_schema())
+        scenarios = pa.Table.from_pylist(self._scenarios, schema=_scenario_schema(self._overall_names))
+        for name, table in (('scores', scores), ('scenarios', scenarios)):
+            self._writer(name, table.schema).write_table(table)
+        self.n_scores += scores.num_rows
+        self.n_scenarios += scenarios.num_rows
+        self._scores = {name: [] for name in self._scores}
+        self._scenarios = []
+
+    def _writer(self, name, schema):
+        writer = self._writers.get(name)
+        if writer is None:
+            if self.format == 'arrow':
+                from pyarrow import ipc
+                writer = ipc.new_file(self.paths[name], schema)
+            else:
+                from pyarrow import parquet
+                writer = parquet.ParquetWriter(self.paths[name], schema)
+            self._writers[name] = writer
+        return writer
+
+    def close(self):
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _to_json(value):
+    # Config overlays, NumPy scalars and arrays.
+    if isinstance(value, Mapping):
+        return dict(value)
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+def write_results(all_results, directory, format='arrow', row_group_size=65536):
+    """Writes an iterable of results to a new result store and returns it opened."""
+    with ResultWriter(directory, format, row_group_size) as writer:
+        writer.extend(all_results)
+    return ResultStore(directory)
+
+class ResultStore:
+    """
+    A result store opened for reading. Arrow files are memory-mapped, so opening a
+    large store is cheap and only the columns and rows a query touches are read.
+
+    `scores` and `scenarios` are pyarrow Tables. Iterating the store yields one
+    result payload per scenario, in the order they were written.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        for format in FORMATS:
+            paths = _paths(directory, format)
+            if os.path.exists(paths['scenarios']):
+                break
+        else:
+            raise FileNotFoundError(f"No result store in '{directory}'")
+        self.format = format
+        self.scores = self._read(paths['scores'])
+        self.scenarios = self._read(paths['scenarios'])
+
+    def _read(self, path):
+        if self.format == 'arrow':
+            import pyarrow as pa
+            from pyarrow import ipc
+            return ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        from pyarrow import parquet
+        return parquet.read_table(path, memory_map=True)
+
+    def __len__(self):
+        return self.scenarios.num_rows
+
+    @property
+    def names(self):
+        return self.scenarios.column('scenario').to_pylist()
+
+    @property
+    def overall_names(self):
+        return [name[len(OVERALL_PREFIX):] for name in self.scenarios.column_names if name.startswith(OVERALL_PREFIX)]
+
+    def meta_scores(self):
+        """{scenario: meta score}, read from the scenarios table only."""
+        return dict(zip(self.names, self.scenarios.column('meta_score').to_numpy()))
+
+    def score_matrix(self, features):
+        """
+        The (scenarios x features) array of final scores for (node, label) features,
+        value scores shadowing functionality scores; missing scores are 0.
+        """
+        from pyarrow import compute
+        rows = np.repeat(np.arange(len(self)), self.scenarios.column('n_scores').to_numpy())
+        values = self.scores.column('score').to_numpy()
+        matrix = np.zeros((len(self), len(features)))
+        for kind in SCORE_KINDS:  # value scores overwrite functionality scores of the same label
+            of_kind = compute.equal(self.scores.column('kind'), kind)
+            for f, (node_id, label) in enumerate(features):
+                mask = compute.and_(of_kind, compute.and_(compute.equal(self.scores.column('node'), node_id),
+                                                          compute.equal(self.scores.column('label'), label)))
+                selected = np.asarray(mask.to_numpy(zero_copy_only=False), dtype=bool)
+                matrix[rows[selected], f] = values[selected]
+        return matrix
+
+    def result(self, index):
+        """The result payload of the `index`-th scenario."""
+        row = self.scenarios.slice(index, 1).to_pylist()[0]
+        scores = self.scores.slice(row['first_score'], row['n_scores']).to_pydict()
+        node_states = {
+            node_id: {
+                "domain": node['domain'],
+                "attributes": node['attributes'],
+                "final_value_scores": {},
+                "final_functionality_scores": {},
+            } for node_id, node in json.loads(row['nodes']).items()
+        }
+        for node_id, kind, label, score in zip(scores['node'], scores['kind'], scores['label'], scores['score']):
+            node_states[node_id][f"final_{kind}_scores"][label] = score
+        return {
+            "scenario_name": row['scenario'],
+            "meta_score": row['meta_score'],
+            "overall_scores": {name: row[OVERALL_PREFIX + name] for name in self.overall_names},
+            "convergence": {key: row[key] for key in ('method', 'iterations', 'residual', 'converged')},
+            "node_states": node_states,
+            "config": json.loads(row['config']),
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.result(index)
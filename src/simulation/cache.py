@@ -0,0 +1,208 @@
+import collections
+import hashlib
+import inspect
+import json
+import pickle
+import sqlite3
+import threading
+
+from ..core.graph_components import SCORE_KINDS, Node
+from ..models.function_registry import is_pure, registry_version
+from .engine import DEFAULT_META_WEIGHTS, SimulationEngine
+
+# Engine options that change how a run executes but not its results.
+EXECUTION_OPTIONS = ('schedule', 'workers', 'executor', 'profile', 'history', 'model_cache')
+# Result entries that describe the run that computed a payload, not a later cache hit.
+RUN_REPORTS = ('profile', 'history', 'model_cache')
+
+def _run_defaults():
+    parameters = inspect.signature(SimulationEngine.run).parameters
+    return {name: p.default for name, p in parameters.items()
+            if p.default is not inspect.Parameter.empty and name not in EXECUTION_OPTIONS}
+
+ENGINE_DEFAULTS = _run_defaults()
+
+def _canonical(value):
+    # NumPy scalars/arrays; anything else by its repr.
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return repr(value)
+
+def scenario_key(config, engine_options=None, registry_tag=None):
+    """
+    A stable hash of everything a scenario's results depend on: the config's nodes,
+    attributes and edges (not its name), the engine options with defaults filled
+    in, and the model registry version tag.
+    """
+    options = dict(ENGINE_DEFAULTS)
+    options.update({name: value for name, value in (engine_options or {}).items() if name not in EXECUTION_OPTIONS})
+    options['meta_weights'] = options['meta_weights'] or DEFAULT_META_WEIGHTS
+    content = {
+        "scenario": {key: value for key, value in config.items() if key != 'name'},
+        "engine": options,
+        "registry": registry_tag if registry_tag is not None else registry_version(),
+    }
+    text = json.dumps(content, sort_keys=True, separators=(',', ':'), default=_canonical)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+class ResultCache:
+    """
+    Content-addressed store of scenario result payloads (see runner.to_payload).
+
+    Payloads are kept pickled in an in-memory LRU of `maxsize` entries and, with
+    `path`, in an SQLite file that persists across runs. Every `get` returns a fresh
+    copy. Keys come from `scenario_key`.
+    """
+    TABLE = 'results'
+
+    def __init__(self, maxsize=1024, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE} (key TEXT PRIMARY KEY, payload BLOB NOT NULL)")
+            self._db.commit()
+
+    def get(self, key):
+        """The cached payload for `key`, or None."""
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(f"SELECT payload FROM {self.TABLE} WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    blob = row[0]
+                    self._remember(key, blob)
+            if blob is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return pickle.loads(blob)
+
+    def put(self, key, payload):
+        if any(name in payload for name in RUN_REPORTS):
+            payload = {name: value for name, value in payload.items() if name not in RUN_REPORTS}
+        self._write(key, payload)
+
+    def _write(self, key, payload):
+        blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, blob)
+            if self._db is not None:
+                self._db.execute(f"INSERT OR REPLACE INTO {self.TABLE} (key, payload) VALUES (?, ?)", (key, blob))
+                self._db.commit()
+
+    def _remember(self, key, blob):
+        self._memory[key] = blob
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._memory:
+                return True
+            return self._db is not None and self._db.execute(
+                f"SELECT 1 FROM {self.TABLE} WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            if self._db is not None:
+                return self._db.execute(f"SELECT COUNT(*) FROM {self.TABLE}").fetchone()[0]
+            return len(self._memory)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self.TABLE}")
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+def model_key(function_path, version, attributes):
+    """
+    A stable hash of one model function call: its registry path, the function's
+    version tag (see registry_version) and the node's attributes in canonical
+    form (sorted names, so attribute order does not matter).
+    """
+    text = json.dumps(attributes, sort_keys=True, separators=(',', ':'), default=_canonical)
+    return hashlib.sha256(f"{function_path}\0{version}\0{text}".encode()).hexdigest()
+
+class ModelCache(ResultCache):
+    """
+    Memoized model function outputs: the functionality and value scores a model
+    function assigns to a node, stored by `model_key`, so a node whose function
+    and attributes were seen before (shared base nodes, repeated designs) is not
+    evaluated again. Same LRU, SQLite persistence and hit/miss counts as
+    ResultCache; it can share the ResultCache's file.
+
+    Pass it to SimulationEngine.run/run_batch as model_cache. Functions marked
+    with function_registry.impure always run. A ModelCache sent to a worker
+    process opens that process's own cache on the same file.
+    """
+    TABLE = 'model_scores'
+
+    def __init__(self, maxsize=65536, path=None):
+        super().__init__(maxsize, path)
+        self._versions = {}
+
+    def __reduce__(self):
+        return (_open_model_cache, (self.maxsize, self.path))
+
+    def put(self, key, scores):
+        self._write(key, scores)
+
+    def version(self, function_path, function):
+        """The version tag of one registered function, computed once."""
+        if (function_path, function) not in self._versions:
+            self._versions[function_path, function] = registry_version({function_path: function})
+        return self._versions[function_path, function]
+
+    def memoized(self, model_functions):
+        """`model_functions` with every pure function answered from this cache."""
+        return {path: _MemoizedModel(self, path, function, self.version(path, function)) if is_pure(function) else function
+                for path, function in model_functions.items()}
+
+# The ModelCache of each (maxsize, path) in this process, for caches sent to workers.
+_MODEL_CACHES = {}
+
+def _open_model_cache(maxsize, path):
+    if (maxsize, path) not in _MODEL_CACHES:
+        _MODEL_CACHES[maxsize, path] = ModelCache(maxsize, path)
+    return _MODEL_CACHES[maxsize, path]
+
+class _MemoizedModel:
+    __slots__ = ('cache', 'path', 'function', 'version')
+
+    def __init__(self, cache, path, function, version):
+        self.cache = cache
+        self.path = path
+        self.function = function
+        self.version = version
+
+    def __call__(self, node):
+        key = model_key(self.path, self.version, node.attributes)
+        scores = self.cache.get(key)
+        if scores is None:
+            # Evaluated on a bare copy, so only the scores the function assigns are stored.
+            fresh = Node(node.id, node.domain, node.type, node.attributes, node.function_path)
+            self.function(fresh)
+            scores = tuple(tuple(getattr(fresh, f"{kind}_scores").items()) for kind in SCORE_KINDS)
+            self.cache.put(key, scores)
+        for kind, items in zip(SCORE_KINDS, scores):
+            node_scores = getattr(node, f"{kind}_scores")
+            for label, score in items:
+                node_scores[label] = score
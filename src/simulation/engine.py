@@ -1,42 +1,355 @@
 import collections
+import logging
+
 import numpy as np
 
+from ..core.graph_components import Node
+from ..instrumentation.history import ScoreHistory
+from ..instrumentation.log import event
+from ..instrumentation.profile import NULL_PROFILER, Profiler
+from .propagation import CompiledNetwork, propagate, solve_fixed_point, sweep, max_change
+from .scheduler import DependencyScheduler
+
+log = logging.getLogger(__name__)
+
+BACKENDS = ('compiled', 'reference')
+METHODS = ('iterate', 'fixed_point', 'sweep')
+
+DEFAULT_META_WEIGHTS = {
+    'technology_assessment': {'sustainability': 0.5, 'total_cost': 0.3},
+    'design_prediction': {'performance': 0.8, 'structural_rigidity': 0.6}
+}
+
 class SimulationEngine:
     def __init__(self, network, model_functions):
         self.network = network
         self.model_functions = model_functions
+        self.meta_weights = DEFAULT_META_WEIGHTS
+        self.profiler = NULL_PROFILER
+        self.history = None
+        self.model_cache = None
 
-    def run(self, scenario_name, iterations=10, alpha=0.5, beta=0.5):
-        print("--- Starting Simulation ---")
-        print("Step 1: Calculating initial internal scores...")
-        for node in self.network.nodes.values():
-            if node.function_path and node.function_path in self.model_functions:
-                self.model_functions[node.function_path](node)
+    def run(self, scenario_name, iterations=10, alpha=0.5, beta=0.5, backend='compiled',
+            tol=None, max_iterations=1000, method='iterate', schedule=False, workers=None,
+            executor='thread', meta_weights=None, profile=False, history=False, model_cache=None):
+        """
+        Runs the model functions and propagates the scores through the network.
 
-        print("\nStep 2: Running score propagation...")
-        for i in range(iterations):
-            self._propagate_scores(alpha, beta)
-        print("  - Propagation complete.")
+        backend='compiled' propagates over NumPy index arrays; backend='reference'
+        keeps the original dict-based `_propagate_scores` loop.
 
-        meta_score = self._calculate_meta_score()
-        overall_scores = self._calculate_overall_scores()
-        print("--- Simulation Finished ---")
+        method='iterate' runs `iterations` propagation steps, or, if `tol` is given,
+        steps until the largest score change drops below `tol` (at most
+        `max_iterations` steps). method='fixed_point' solves for the converged
+        scores directly and method='sweep' reaches the same scores in one pass in
+        topological order, for acyclic propagation graphs (both compiled backend only).
+        The iteration count and the final residual are reported under
+        results['convergence'].
+
+        schedule=True runs the model functions level by level in dependency order
+        (see DependencyScheduler), on `workers` threads or processes per level.
+
+        meta_weights ({node_id: {label: weight}}) replaces DEFAULT_META_WEIGHTS for
+        the meta score, here and in later incremental updates.
+
+        profile=True times the phases, the model functions and every propagation
+        iteration and adds the report under results['profile'] (see
+        instrumentation.profile).
+
+        history=True records the node x label scores after every propagation
+        iteration as float32 arrays under results['history']; an integer keeps only
+        that many of the latest iterations (see instrumentation.history).
+
+        With a ModelCache (simulation.cache) as model_cache, pure model functions
+        are answered from it for attributes seen before; results['model_cache']
+        counts this run's hits and misses.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown propagation backend '{backend}', expected one of {BACKENDS}")
+        if method not in METHODS:
+            raise ValueError(f"Unknown propagation method '{method}', expected one of {METHODS}")
+        if method != 'iterate' and backend != 'compiled':
+            raise ValueError(f"method='{method}' requires the compiled backend")
+        self.meta_weights = meta_weights or DEFAULT_META_WEIGHTS
+        self.profiler = profiler = Profiler() if profile else NULL_PROFILER
+        self.history = None
+        self.model_cache = model_cache
+        calls = self._model_cache_calls()
+        event(log, 'scenario_started', "--- Starting Simulation ---", scenario=scenario_name,
+              backend=backend, method=method)
+        with profiler.phase('evaluate_models'):
+            self.evaluate_models(schedule, workers, executor)
+
+        log.info("\nStep 2: Running score propagation...")
+        limit = iterations if tol is None else max_iterations
+        with profiler.phase('propagate'):
+            if backend == 'compiled':
+                convergence = self._propagate_compiled(limit, alpha, beta, tol, method, history)
+            else:
+                convergence = self._propagate_reference(limit, alpha, beta, tol, history)
+        event(log, 'propagation_finished',
+              "  - Propagation complete after %(iterations)d iterations (residual %(residual).2e).",
+              scenario=scenario_name, **convergence)
+
+        with profiler.phase('meta_score'):
+            meta_score = self._calculate_meta_score()
+        with profiler.phase('overall_scores'):
+            overall_scores = self._calculate_overall_scores()
+        event(log, 'scenario_finished', "--- Simulation Finished ---", scenario=scenario_name,
+              meta_score=meta_score, overall_scores=overall_scores, convergence=convergence)
         
         results = {
             "scenario_name": scenario_name,
             "meta_score": meta_score,
             "overall_scores": overall_scores, # Added overall scores
+            "convergence": convergence,
             "final_network": self.network,
             "node_states": {
                 node.id: {
+                    "domain": node.domain,
                     "attributes": node.attributes,
-                    "final_value_scores": node.value_scores,
-                    "final_functionality_scores": node.functionality_scores
+                    # Copies, so later updates or re-runs of this engine leave these results alone.
+                    "final_value_scores": dict(node.value_scores.items()),
+                    "final_functionality_scores": dict(node.functionality_scores.items())
                 } for node in self.network.nodes.values()
             }
         }
+        if profile:
+            results["profile"] = profiler.report()
+        if self.history is not None:
+            results["history"] = self.history.report()
+        if model_cache is not None:
+            results["model_cache"] = self._model_cache_report(calls)
         return results
 
+    def run_batch(self, scenario_names, weight_stack, iterations=10, alpha=0.5, beta=0.5,
+                  tol=None, max_iterations=1000, method='iterate', meta_weights=None, profile=False,
+                  history=False, model_cache=None):
+        """
+        Runs K weighting variants of this network's topology in one vectorized pass.
+
+        `weight_stack` maps each edge kind to a (K x edges) weight array, as built by
+        `stack_weights`. The model functions run once, since the variants only differ
+        in edge weights, and all scenarios propagate together as a
+        (K x nodes x labels) array. Returns one results dict per scenario, shaped like
+        the one `run` returns, with a copy of the network carrying that scenario's
+        weights as 'final_network'. `history` works as in `run`; all scenarios are
+        recorded in one (iterations x K x nodes x labels) array. `model_cache` works as
+        in `run`; its counts are shared by all scenarios of the batch.
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown propagation method '{method}', expected one of {METHODS}")
+        scenario_names = list(scenario_names)
+        n_scenarios = len(scenario_names)
+        self.profiler = profiler = Profiler() if profile else NULL_PROFILER
+        self.model_cache = model_cache
+        calls = self._model_cache_calls()
+        event(log, 'batch_started', "--- Starting Batched Simulation (%(scenarios)d scenarios) ---",
+              scenarios=n_scenarios, method=method)
+        with profiler.phase('evaluate_models'):
+            self.evaluate_models()
+
+        log.info("\nStep 2: Running batched score propagation...")
+        with profiler.phase('propagate'):
+            compiled = CompiledNetwork(self.network)
+            tables, values = self.batch_tables(compiled, n_scenarios)
+            stack = {kind: np.asarray(weight_stack[kind], dtype=float).reshape(n_scenarios, -1) for kind in tables}
+            self.history = self._score_history(history, compiled, {kind: table[0] for kind, table in tables.items()},
+                                               iterations if tol is None else max_iterations, n_scenarios)
+            counts, residuals = self.propagate_batch(compiled, values, stack, iterations, alpha, beta,
+                                                     tol, max_iterations, method, self.history)
+        log.info("  - Propagation complete.")
+
+        self.meta_weights = meta_weights or DEFAULT_META_WEIGHTS
+        with profiler.phase('meta_score'):
+            meta_scores = self.batch_meta_scores(compiled, tables, values)
+        with profiler.phase('overall_scores'):
+            overall_scores = self.batch_overall_scores(tables, values)
+        # One profile covers the whole batch; each scenario's results carry it.
+        report = profiler.report()
+        model_calls = self._model_cache_report(calls) if model_cache is not None else None
+        log.info("--- Batched Simulation Finished ---")
+
+        all_results = []
+        for k, scenario_name in enumerate(scenario_names):
+            network = self.network.with_weights(stack['functionality'][k], stack['value'][k])
+            for kind, (labels, key_order) in tables.items():
+                for i, node_id in enumerate(compiled.node_ids):
+                    row = values[kind][k, i]
+                    scores = collections.defaultdict(float)
+                    for column in key_order[i]:
+                        scores[labels[column]] = float(row[column])
+                    setattr(network.nodes[node_id], f"{kind}_scores", scores)
+            convergence = self._convergence_report(method, int(counts[k]), float(residuals[k]), tol)
+            scenario_scores = {name: scores[k] for name, scores in overall_scores.items()}
+            event(log, 'scenario_finished', "  - %(scenario)s: meta score %(meta_score).4f",
+                  scenario=scenario_name, meta_score=meta_scores[k], overall_scores=scenario_scores,
+                  convergence=convergence)
+            all_results.append({
+                "scenario_name": scenario_name,
+                "meta_score": meta_scores[k],
+                "overall_scores": scenario_scores,
+                "convergence": convergence,
+                "final_network": network,
+                "node_states": {
+                    node.id: {
+                        "domain": node.domain,
+                        "attributes": node.attributes,
+                        "final_value_scores": dict(node.value_scores.items()),
+                        "final_functionality_scores": dict(node.functionality_scores.items())
+                    } for node in network.nodes.values()
+                }
+            })
+            if profile:
+                all_results[-1]["profile"] = report
+            if self.history is not None:
+                all_results[-1]["history"] = self.history.report(k)
+            if model_calls is not None:
+                all_results[-1]["model_cache"] = model_calls
+        return all_results
+
+    def batch_tables(self, compiled, n_scenarios):
+        """
+        Gathers the current (internal) node scores into per-kind batch arrays.
+
+        Returns ({kind: (labels, key_order)}, {kind: (K x nodes x labels) array}) with
+        every scenario starting from the same scores.
+        """
+        tables, values = {}, {}
+        for kind in CompiledNetwork.KINDS:
+            labels, internal = compiled.gather(self.network, kind)
+            tables[kind] = (labels, compiled.key_order(self.network, kind, labels))
+            values[kind] = np.repeat(internal[None], n_scenarios, axis=0)
+        return tables, values
+
+    def propagate_batch(self, compiled, values, weight_stack, iterations=10, alpha=0.5, beta=0.5,
+                        tol=None, max_iterations=1000, method='iterate', history=None):
+        """
+        Propagates (K x nodes x labels) score arrays in place, one weight vector per scenario.
+        Returns the per-scenario iteration counts and final residuals. A ScoreHistory
+        `history` records the arrays before and after every iteration.
+        """
+        rates = {'functionality': alpha, 'value': beta}
+        n_scenarios = len(values['value'])
+        counts = np.zeros(n_scenarios, dtype=int)
+        residuals = np.zeros(n_scenarios)
+        if history is not None:
+            history.record(0, values)
+        if method in ('fixed_point', 'sweep'):
+            solve = solve_fixed_point if method == 'fixed_point' else sweep
+            for kind, rate in rates.items():
+                for k in range(n_scenarios):
+                    values[kind][k] = solve(values[kind][k], compiled.edges[kind], rate, weight_stack[kind][k])
+            counts[:] = 1 if method == 'sweep' else 0
+            for kind, rate in rates.items():
+                updated = compiled.step(kind, values[kind], rate, weight_stack[kind])
+                residuals = np.maximum(residuals, _batch_change(values[kind], updated))
+            if self.profiler.enabled:
+                self.profiler.residual(int(counts.max(initial=0)), residuals.max(initial=0.0))
+            if history is not None:
+                history.record(int(counts.max(initial=0)), values)
+            return counts, residuals
+
+        limit = iterations if tol is None else max_iterations
+        active = np.ones(n_scenarios, dtype=bool)
+        for i in range(limit):
+            if active.all():
+                selected = slice(None)
+            else:
+                selected = np.flatnonzero(active)
+                if not selected.size:
+                    break
+            change = np.zeros(n_scenarios)[selected]
+            for kind, rate in rates.items():
+                updated = compiled.step(kind, values[kind][selected], rate, weight_stack[kind][selected])
+                change = np.maximum(change, _batch_change(values[kind][selected], updated))
+                values[kind][selected] = updated
+            counts[selected] += 1
+            residuals[selected] = change
+            if self.profiler.enabled:
+                # The largest residual of the scenarios still iterating.
+                self.profiler.residual(i + 1, change.max(initial=0.0))
+            if history is not None:
+                history.record(i + 1, values)
+            if tol is not None:
+                active[np.arange(n_scenarios)[selected][change < tol]] = False
+        return counts, residuals
+
+    def stack_weights(self, configs):
+        """Stacks the edge weights of scenario configs sharing this topology for `run_batch`."""
+        compiled = CompiledNetwork(self.network)
+        weights = [compiled.weights_from_config(config) for config in configs]
+        return {kind: np.array([w[kind] for w in weights]).reshape(len(weights), -1)
+                for kind in CompiledNetwork.KINDS}
+
+    def evaluate_models(self, schedule=False, workers=None, executor='thread'):
+        log.info("Step 1: Calculating initial internal scores...")
+        model_functions = self.model_functions
+        if self.model_cache is not None:
+            model_functions = self.model_cache.memoized(model_functions)
+        if self.profiler.enabled and not (schedule and executor == 'process'):
+            # Model calls in worker processes are not timed, only the phase.
+            model_functions = self.profiler.timed(model_functions)
+        if schedule:
+            scheduler = DependencyScheduler(self.network)
+            log.info("  - Scheduled %d models in %d dependency levels.", len(self.network.nodes), len(scheduler.levels))
+            scheduler.run(model_functions, workers, executor)
+            return
+        for node in self.network.nodes.values():
+            if node.function_path and node.function_path in model_functions:
+                model_functions[node.function_path](node)
+
+    def batch_meta_scores(self, compiled, tables, values, weights=None):
+        """Vectorized `_calculate_meta_score` over the scenario axis."""
+        if weights is None:
+            weights = self.meta_weights
+        n_scenarios = len(values['value'])
+        meta_scores = np.zeros(n_scenarios)
+        for node_id, value_weights in weights.items():
+            if node_id not in compiled.node_index:
+                continue
+            i = compiled.node_index[node_id]
+            for value_label, weight in value_weights.items():
+                score = np.zeros(n_scenarios)
+                # Value scores shadow functionality scores of the same label.
+                for kind in ('value', 'functionality'):
+                    labels, key_order = tables[kind]
+                    present = [c for c in key_order[i] if labels[c] == value_label]
+                    if present:
+                        score = values[kind][:, i, present[0]]
+                        break
+                meta_scores = meta_scores + weight * score
+        return meta_scores
+
+    def batch_overall_scores(self, tables, values, exact=True):
+        """
+        Vectorized `_calculate_overall_scores` over the scenario axis.
+
+        exact=True averages scenario by scenario so every mean matches the single-run
+        path bit for bit; exact=False averages all scenarios at once, for large
+        sample batches where the last bit does not matter.
+        """
+        def mean_of(kind, label=None):
+            labels, key_order = tables[kind]
+            rows, columns = [], []
+            for i, order in enumerate(key_order):
+                for column in order:
+                    if label is None or labels[column] == label:
+                        rows.append(i)
+                        columns.append(column)
+            if not rows:
+                return np.zeros(len(values[kind])) if not exact else [0] * len(values[kind])
+            if not exact:
+                return np.mean(values[kind][:, rows, columns], axis=1)
+            # Row by row, so each mean sums in the same order as the per-scenario path.
+            return [np.mean(row) for row in np.ascontiguousarray(values[kind][:, rows, columns])]
+
+        return {
+            "Functionality": mean_of('functionality'),
+            "Value": mean_of('value'),
+            "Sustainability": mean_of('value', 'sustainability'),
+        }
+
     def _calculate_overall_scores(self):
         """Calculates the average Functionality, Value, and Sustainability scores for the whole network."""
         all_func = []
@@ -54,8 +367,186 @@ class SimulationEngine:
             "Value": np.mean(all_val) if all_val else 0,
             "Sustainability": np.mean(all_sus) if all_sus else 0,
         }
-    
-    # ... (the rest of the engine file is the same)
+
+    def _propagate_compiled(self, iterations, alpha, beta, tol=None, method='iterate', history=False):
+        """Propagates on dense arrays and writes the scores back once at the end."""
+        compiled = CompiledNetwork(self.network)
+        rates = {'functionality': alpha, 'value': beta}
+        tables = {kind: compiled.gather(self.network, kind) for kind in rates}
+        internal = {kind: table[1] for kind, table in tables.items()}
+
+        on_iteration = self.profiler.residual if self.profiler.enabled else None
+        self.history = self._score_history(history, compiled, {kind: table[0] for kind, table in tables.items()},
+                                           iterations)
+        record = self.history.record if self.history is not None else None
+        values, count, residual = _propagate_arrays(compiled.edges, internal, rates, iterations, tol, method,
+                                                    on_iteration, record)
+        for kind, (labels, _) in tables.items():
+            compiled.scatter(self.network, kind, labels, values[kind])
+
+        # Kept for incremental updates (update_attribute / update_edge_weight).
+        self._state = {
+            "compiled": compiled,
+            "labels": {kind: table[0] for kind, table in tables.items()},
+            "internal": internal,
+            "values": values,
+            "options": (iterations, rates, tol, method),
+        }
+        return self._convergence_report(method, count, residual, tol)
+
+    def update_attribute(self, node_id, key, value):
+        """
+        Changes one node attribute after a compiled `run` and updates the results.
+
+        Only that node's model function runs again, and only the nodes downstream of
+        it (along value/functionality edges) are re-propagated. The scores match a
+        full re-run of the changed scenario. Returns the updated meta score.
+        """
+        state = self._require_state()
+        node = self.network.get_node(node_id)
+        if node is None:
+            raise KeyError(f"Unknown node '{node_id}'")
+        node.attributes[key] = value
+
+        fresh = Node(node.id, node.domain, node.type, node.attributes, node.function_path)
+        if node.function_path and node.function_path in self.model_functions:
+            self.model_functions[node.function_path](fresh)
+        row = state['compiled'].node_index[node_id]
+        for kind in CompiledNetwork.KINDS:
+            scores = getattr(fresh, f"{kind}_scores")
+            labels = state['labels'][kind]
+            new_labels = [label for label in scores if label not in labels]
+            if new_labels:
+                labels.extend(new_labels)
+                for store in ('internal', 'values'):
+                    array = state[store][kind]
+                    state[store][kind] = np.hstack([array, np.zeros((len(array), len(new_labels)))])
+            state['internal'][kind][row] = 0.0
+            for label, score in scores.items():
+                state['internal'][kind][row, labels.index(label)] = score
+            # The node's own scores restart from its model output, like in a fresh run.
+            setattr(node, f"{kind}_scores", scores)
+        return self._repropagate([row])
+
+    def update_edge_weight(self, kind, source, target, label, weight):
+        """
+        Changes the weight of the `kind` edge(s) source -> target carrying `label` after
+        a compiled `run`, re-propagates the nodes downstream of `target` and returns the
+        updated meta score.
+        """
+        state = self._require_state()
+        compiled = state['compiled']
+        edges = [edge for edge in self.network.in_edges(target, kind, label) if edge.source == source]
+        if not edges:
+            raise KeyError(f"No {kind} edge {source} -> {target} carrying '{label}'")
+        for edge in edges:
+            edge.weight = weight
+        edge_index = compiled.edges[kind]
+        edge_index.weights[(edge_index.sources == compiled.node_index[source])
+                           & (edge_index.targets == compiled.node_index[target])
+                           & (edge_index.label_ids == edge_index.label_index[label])] = weight
+        return self._repropagate([compiled.node_index[target]])
+
+    def _require_state(self):
+        state = getattr(self, '_state', None)
+        if state is None:
+            raise RuntimeError("Incremental updates need a previous run() with the compiled backend")
+        return state
+
+    def _repropagate(self, rows):
+        """Re-propagates the downstream cone of `rows` and refreshes the meta score."""
+        state = self._state
+        compiled = state['compiled']
+        iterations, rates, tol, method = state['options']
+        # The cone's scores depend on everything upstream of it. With a tolerance the
+        # stopping point depends on the whole network, so everything is re-propagated.
+        if tol is None:
+            cone = compiled.reachable(rows, downstream=True)
+            region = compiled.reachable(cone, downstream=False)
+        else:
+            cone = region = np.arange(len(compiled))
+        edges = {kind: edge_index.restrict(region) for kind, edge_index in compiled.edges.items()}
+        internal = {kind: values[region] for kind, values in state['internal'].items()}
+
+        values, count, residual = _propagate_arrays(edges, internal, rates, iterations, tol, method)
+        in_region = np.searchsorted(region, cone)
+        for kind, labels in state['labels'].items():
+            state['values'][kind][cone] = values[kind][in_region]
+            compiled.scatter(self.network, kind, labels, state['values'][kind], rows=cone)
+        event(log, 'repropagated', "  - Re-propagated %(nodes)d of %(total)d nodes.",
+              nodes=len(cone), total=len(compiled))
+
+        self.last_convergence = self._convergence_report(method, count, residual, tol)
+        return self._calculate_meta_score()
+
+    def _propagate_reference(self, iterations, alpha, beta, tol=None, history=False):
+        """Runs the dict-based `_propagate_scores` loop with the same stopping rule."""
+        count = 0
+        residual = 0.0
+        if history:
+            # The labels of the compiled tables: every edge label, then the nodes' own.
+            compiled = CompiledNetwork(self.network)
+            labels = {kind: compiled.gather(self.network, kind)[0] for kind in CompiledNetwork.KINDS}
+            self.history = self._score_history(history, compiled, labels, iterations)
+            self.history.record(0, self._score_tables(labels))
+        for i in range(iterations):
+            # Copies: the ScoreMaps are views that _propagate_scores overwrites in place.
+            before = {nid: (dict(n.functionality_scores.items()), dict(n.value_scores.items()))
+                      for nid, n in self.network.nodes.items()}
+            self._propagate_scores(alpha, beta)
+            residual = 0.0
+            for nid, node in self.network.nodes.items():
+                for old, new in zip(before[nid], (node.functionality_scores, node.value_scores)):
+                    for label, score in new.items():
+                        residual = max(residual, abs(score - old.get(label, 0.0)))
+            count += 1
+            if self.profiler.enabled:
+                self.profiler.residual(count, residual)
+            if self.history is not None:
+                self.history.record(count, self._score_tables(self.history.labels))
+            if tol is not None and residual < tol:
+                break
+        return self._convergence_report('iterate', count, residual, tol)
+
+    def _score_tables(self, labels):
+        """The nodes' current scores as {kind: (nodes x labels) array}, columns in `labels` order."""
+        tables = {}
+        for kind, kind_labels in labels.items():
+            columns = {label: j for j, label in enumerate(kind_labels)}
+            table = np.zeros((len(self.network.nodes), len(kind_labels)))
+            for i, node in enumerate(self.network.nodes.values()):
+                for label, score in getattr(node, f"{kind}_scores").items():
+                    if label in columns:
+                        table[i, columns[label]] = score
+            tables[kind] = table
+        return tables
+
+    def _model_cache_calls(self):
+        return (self.model_cache.hits, self.model_cache.misses) if self.model_cache is not None else None
+
+    def _model_cache_report(self, calls):
+        """The model cache hits and misses since `calls` (from _model_cache_calls)."""
+        hits, misses = self._model_cache_calls()
+        return {"hits": hits - calls[0], "misses": misses - calls[1]}
+
+    def _score_history(self, history, compiled, labels, iterations, scenarios=None):
+        """A ScoreHistory for the `history` option of run/run_batch, or None when it is off."""
+        if not history:
+            return None
+        # The columns each node has a score in: its own labels and the ones it receives.
+        columns = {kind: compiled.key_order(self.network, kind, kind_labels) for kind, kind_labels in labels.items()}
+        return ScoreHistory(compiled.node_ids, labels, iterations + 1, None if history is True else int(history),
+                            scenarios, columns)
+
+    @staticmethod
+    def _convergence_report(method, iterations, residual, tol):
+        return {
+            "method": method,
+            "iterations": iterations,
+            "residual": residual,
+            "converged": residual < tol if tol is not None else method != 'iterate',
+        }
+
     def _propagate_scores(self, alpha, beta):
         last_f_scores = {nid: n.functionality_scores.copy() for nid, n in self.network.nodes.items()}
         last_v_scores = {nid: n.value_scores.copy() for nid, n in self.network.nodes.items()}
@@ -65,20 +556,18 @@ class SimulationEngine:
 
         for node_id, node in self.network.nodes.items():
             propagated = collections.defaultdict(float)
-            for edge in self.network.functionality_edges:
-                if edge.target == node_id:
-                    parent_score = last_f_scores.get(edge.source, {}).get(edge.label, 0.0)
-                    propagated[edge.label] += edge.weight * parent_score
+            for edge in self.network.in_edges(node_id, 'functionality'):
+                parent_score = last_f_scores.get(edge.source, {}).get(edge.label, 0.0)
+                propagated[edge.label] += edge.weight * parent_score
             for label, prop_score in propagated.items():
                 internal = last_f_scores[node_id].get(label, 0.0)
                 next_f_scores[node_id][label] = (alpha * internal) + ((1 - alpha) * prop_score)
 
         for node_id, node in self.network.nodes.items():
             propagated = collections.defaultdict(float)
-            for edge in self.network.value_edges:
-                 if edge.target == node_id:
-                    parent_score = last_v_scores.get(edge.source, {}).get(edge.label, 0.0)
-                    propagated[edge.label] += edge.weight * parent_score
+            for edge in self.network.in_edges(node_id, 'value'):
+                parent_score = last_v_scores.get(edge.source, {}).get(edge.label, 0.0)
+                propagated[edge.label] += edge.weight * parent_score
             for label, prop_score in propagated.items():
                 internal = last_v_scores[node_id].get(label, 0.0)
                 next_v_scores[node_id][label] = (beta * internal) + ((1 - beta) * prop_score)
@@ -89,18 +578,64 @@ class SimulationEngine:
 
     def _calculate_meta_score(self, weights=None):
         if weights is None:
-            weights = {
-                'technology_assessment': {'sustainability': 0.5, 'cost': 0.3},
-                'design_prediction': {'performance': 0.8, 'structural_rigidity': 0.6}
-            }
+            weights = self.meta_weights
         meta_score = 0
-        print("\nStep 3: Calculating final meta-score...")
+        log.info("\nStep 3: Calculating final meta-score...")
+        verbose = log.isEnabledFor(logging.DEBUG)
         for node_id, value_weights in weights.items():
             node = self.network.get_node(node_id)
             if node:
-                all_scores = {**node.functionality_scores, **node.value_scores}
                 for value_label, weight in value_weights.items():
-                    score = all_scores.get(value_label, 0.0)
+                    # Value scores shadow functionality scores of the same label.
+                    score = node.value_scores.get(value_label)
+                    if score is None:
+                        score = node.functionality_scores.get(value_label, 0.0)
                     meta_score += weight * score
-                    print(f"  - {node_id} '{value_label}' score: {score:.4f} (weight: {weight})")
-        return meta_score
\ No newline at end of file
+                    if verbose:
+                        event(log, 'meta_score_term', "  - %(node)s '%(label)s' score: %(score).4f (weight: %(weight)s)",
+                              logging.DEBUG, node=node_id, label=value_label, score=score, weight=weight)
+        return meta_score
+
+def _batch_change(old, new):
+    """Largest absolute score change per scenario of a (K x nodes x labels) array."""
+    if not old[0].size:
+        return np.zeros(len(old))
+    return np.max(np.abs(new - old).reshape(len(old), -1), axis=1)
+
+
+def _propagate_arrays(edges, internal, rates, iterations, tol, method, on_iteration=None, record=None):
+    """
+    Propagates per-kind (node x label) arrays over per-kind EdgeIndexes.
+    Returns the propagated arrays, the iteration count and the final residual;
+    `on_iteration(count, residual)` is called after every iteration and
+    `record(count, values)` with the starting arrays and after every iteration.
+    """
+    values = dict(internal)
+    count = 0
+    residual = 0.0
+    if record is not None:
+        record(0, values)
+    if method in ('fixed_point', 'sweep'):
+        solve = solve_fixed_point if method == 'fixed_point' else sweep
+        for kind, rate in rates.items():
+            values[kind] = solve(values[kind], edges[kind], rate)
+        count = 1 if method == 'sweep' else 0
+        residual = max(max_change(values[kind], propagate(values[kind], edges[kind], rate))
+                       for kind, rate in rates.items())
+        if on_iteration is not None:
+            on_iteration(count, residual)
+        if record is not None:
+            record(count, values)
+    else:
+        for i in range(iterations):
+            updated = {kind: propagate(values[kind], edges[kind], rate) for kind, rate in rates.items()}
+            residual = max(max_change(values[kind], updated[kind]) for kind in rates)
+            values = updated
+            count += 1
+            if on_iteration is not None:
+                on_iteration(count, residual)
+            if record is not None:
+                record(count, values)
+            if tol is not None and residual < tol:
+                break
+    return values, count, residual
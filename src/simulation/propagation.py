@@ -0,0 +1,316 @@
+import numpy as np
+
+from ..core.graph_components import EDGE_FIELDS, EdgeList
+from .scheduler import CycleError, topological_levels
+
+class EdgeIndex:
+    """
+    Index arrays for one kind of weighted edge (value or functionality).
+
+    Together the arrays describe one sparse weight matrix per label, with rows for
+    targets and columns for sources. Edges keep their list order so that scores are
+    accumulated exactly as the dict-based reference path does.
+    """
+    def __init__(self, edges, node_index):
+        self.node_ids = list(node_index)
+        self.labels = []
+        self.label_index = {}
+        sources, targets, label_ids, weights = [], [], [], []
+        # Labels each target receives, in order of their first incoming edge.
+        self.received_labels = {}
+        # An EdgeList is read from its columns, without creating edge objects.
+        if isinstance(edges, EdgeList):
+            columns = [edges.column(name) for name in EDGE_FIELDS]
+        else:
+            columns = [[getattr(edge, name) for edge in edges] for name in EDGE_FIELDS]
+        for source, target, label, weight in zip(*columns):
+            if label not in self.label_index:
+                self.label_index[label] = len(self.labels)
+                self.labels.append(label)
+            label_id = self.label_index[label]
+            target = node_index[target]
+            sources.append(node_index[source])
+            targets.append(target)
+            label_ids.append(label_id)
+            weights.append(weight)
+            received = self.received_labels.setdefault(target, [])
+            if label_id not in received:
+                received.append(label_id)
+
+        self.sources = np.array(sources, dtype=np.intp)
+        self.targets = np.array(targets, dtype=np.intp)
+        self.label_ids = np.array(label_ids, dtype=np.intp)
+        self.weights = np.array(weights, dtype=float)
+
+    def __len__(self):
+        return len(self.weights)
+
+    def label_levels(self):
+        """
+        Topological levels of every label's edge graph, as {label_id: [target arrays]}.
+        Only receiving nodes are listed; raises CycleError if a label's graph has a cycle.
+        """
+        if not hasattr(self, '_label_levels'):
+            self._label_levels = {}
+            for label, label_id in self.label_index.items():
+                selected = self.label_ids == label_id
+                edges = list(zip(self.sources[selected].tolist(), self.targets[selected].tolist()))
+                nodes = sorted(set(self.sources[selected].tolist()) | set(self.targets[selected].tolist()))
+                what = f"'{label}' propagation graph"
+                try:
+                    levels = topological_levels(nodes, edges, what)
+                except CycleError as error:
+                    raise CycleError([self.node_ids[n] for n in error.nodes], what) from None
+                receiving = set(self.targets[selected].tolist())
+                self._label_levels[label_id] = [np.array([n for n in level if n in receiving], dtype=np.intp)
+                                                for level in levels[1:]]
+        return self._label_levels
+
+    def restrict(self, rows):
+        """
+        The edges between the given (sorted) node indices, renumbered to positions in
+        `rows`. Edge order is kept, so sums over the subset match the full index.
+        """
+        position = np.full(len(self.node_ids), -1, dtype=np.intp)
+        position[rows] = np.arange(len(rows))
+        selected = (position[self.targets] >= 0) & (position[self.sources] >= 0)
+        subset = EdgeIndex([], {})
+        subset.node_ids = [self.node_ids[row] for row in rows]
+        subset.labels = self.labels
+        subset.label_index = self.label_index
+        subset.sources = position[self.sources[selected]]
+        subset.targets = position[self.targets[selected]]
+        subset.label_ids = self.label_ids[selected]
+        subset.weights = self.weights[selected]
+        subset.received_labels = {int(position[target]): labels for target, labels in self.received_labels.items()
+                                  if position[target] >= 0}
+        return subset
+
+    def receivers(self, width):
+        """Flat (target, label) positions that get a propagated score."""
+        return np.unique(self.targets * width + self.label_ids)
+
+    def weight_matrix(self, label, n_nodes, weights=None):
+        """Returns the SciPy CSR weight matrix W of one label (rows: targets, columns: sources)."""
+        from scipy import sparse
+        if weights is None:
+            weights = self.weights
+        selected = self.label_ids == self.label_index[label]
+        return sparse.csr_matrix(
+            (weights[selected], (self.targets[selected], self.sources[selected])),
+            shape=(n_nodes, n_nodes)
+        )
+
+class CompiledNetwork:
+    """
+    Array form of a DynamicNetwork's propagation edges.
+
+    Scores live in dense (node x label) float arrays while propagating. The first
+    columns of every array are the edge labels of that kind, in EdgeIndex order.
+    """
+    KINDS = ('functionality', 'value')
+
+    def __init__(self, network):
+        self.node_ids = list(network.nodes)
+        self.node_index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.edges = {
+            'functionality': EdgeIndex(network.functionality_edges, self.node_index),
+            'value': EdgeIndex(network.value_edges, self.node_index),
+        }
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def reachable(self, rows, downstream=True):
+        """
+        Sorted indices of the nodes reachable from `rows` (inclusive) along value and
+        functionality edges, following them downstream or upstream.
+        """
+        if not hasattr(self, '_neighbours'):
+            self._neighbours = {True: {}, False: {}}
+            for edge_index in self.edges.values():
+                for source, target in zip(edge_index.sources.tolist(), edge_index.targets.tolist()):
+                    self._neighbours[True].setdefault(source, []).append(target)
+                    self._neighbours[False].setdefault(target, []).append(source)
+        neighbours = self._neighbours[downstream]
+        seen = set(rows)
+        pending = list(seen)
+        while pending:
+            for neighbour in neighbours.get(pending.pop(), ()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    pending.append(neighbour)
+        return np.array(sorted(seen), dtype=np.intp)
+
+    def gather(self, network, kind):
+        """Copies the score dicts of one kind into a (labels, values) dense table."""
+        labels = list(self.edges[kind].labels)
+        label_index = dict(self.edges[kind].label_index)
+        rows = []
+        for node_id in self.node_ids:
+            scores = getattr(network.nodes[node_id], f"{kind}_scores")
+            for label in scores:
+                if label not in label_index:
+                    label_index[label] = len(labels)
+                    labels.append(label)
+            rows.append(scores)
+
+        values = np.zeros((len(rows), len(labels)))
+        for i, scores in enumerate(rows):
+            for label, score in scores.items():
+                values[i, label_index[label]] = score
+        return labels, values
+
+    def scatter(self, network, kind, labels, values, rows=None):
+        """Writes propagated scores back into the node dicts, mirroring the reference key order."""
+        received_labels = self.edges[kind].received_labels
+        attr = f"{kind}_scores"
+        for i in (range(len(self.node_ids)) if rows is None else rows):
+            node_id = self.node_ids[i]
+            if i not in received_labels:
+                continue
+            node = network.nodes[node_id]
+            scores = getattr(node, attr).copy()
+            row = values[i]
+            for label_id in received_labels[i]:
+                scores[labels[label_id]] = float(row[label_id])
+            setattr(node, attr, scores)
+
+    def step(self, kind, values, rate, weights=None):
+        """One propagation step: rate * internal + (1 - rate) * W @ x on the receiving entries."""
+        return propagate(values, self.edges[kind], rate, weights)
+
+    def weights_from_config(self, config):
+        """
+        Reads the weights of a scenario config that shares this network's topology.
+
+        Returns {kind: weight array} in EdgeIndex order, so that the weights of many
+        weighting variants can be stacked for batched propagation.
+        """
+        weights = {kind: [] for kind in self.KINDS}
+        for edge_data in config.get('edges', []):
+            if edge_data['type'] in weights:
+                weights[edge_data['type']].append(edge_data)
+
+        arrays = {}
+        for kind, edge_list in weights.items():
+            edge_index = self.edges[kind]
+            topology = [(self.node_index.get(e['source']), self.node_index.get(e['target']),
+                         edge_index.label_index.get(e['label'])) for e in edge_list]
+            expected = list(zip(edge_index.sources.tolist(), edge_index.targets.tolist(),
+                                edge_index.label_ids.tolist()))
+            if topology != expected:
+                raise ValueError(f"Scenario '{config.get('name')}' does not share the {kind} edges of the network")
+            arrays[kind] = np.array([e['weight'] for e in edge_list], dtype=float)
+        return arrays
+
+    def key_order(self, network, kind, labels):
+        """
+        Column indices of each node's scores in the order the node's dict lists them
+        after propagation: its own labels first, then newly received ones.
+        """
+        label_index = {label: i for i, label in enumerate(labels)}
+        received_labels = self.edges[kind].received_labels
+        order = []
+        for i, node_id in enumerate(self.node_ids):
+            columns = [label_index[label] for label in getattr(network.nodes[node_id], f"{kind}_scores")]
+            columns += [c for c in received_labels.get(i, []) if c not in columns]
+            order.append(columns)
+        return order
+
+def propagate(values, edge_index, rate, weights=None):
+    """
+    Applies one propagation step to a dense (node x label) score array.
+
+    `values` may carry leading batch dimensions, e.g. (scenario x node x label),
+    in which case `weights` holds one weight vector per scenario (K x edges).
+    The weighted parent scores are summed with np.bincount, which adds them in edge
+    order, so every scenario matches the dict-based path bit for bit.
+    """
+    *batch, n_nodes, width = values.shape
+    result = values.copy()
+    if not len(edge_index):
+        return result
+    if weights is None:
+        weights = edge_index.weights
+    count = int(np.prod(batch, dtype=np.intp))
+    block = n_nodes * width
+    flat_targets = edge_index.targets * width + edge_index.label_ids
+    contributions = np.broadcast_to(weights * values[..., edge_index.sources, edge_index.label_ids],
+                                    tuple(batch) + (len(edge_index),))
+    offsets = np.arange(count, dtype=np.intp)[:, None] * block
+    propagated = np.bincount((offsets + flat_targets).reshape(-1), weights=contributions.reshape(-1),
+                             minlength=count * block).reshape(count, block)
+
+    receivers = edge_index.receivers(width)
+    flat_result = result.reshape(count, block)
+    internal = flat_result[:, receivers]
+    flat_result[:, receivers] = (rate * internal) + ((1 - rate) * propagated[:, receivers])
+    return result
+
+def sweep(values, edge_index, rate, weights=None):
+    """
+    Solves acyclic propagation in one pass, target by target in topological order.
+
+    Like `solve_fixed_point` this yields the scores the iteration converges to
+    (x_r = W x for every receiving entry, independent of rate < 1), but it only
+    needs one sweep over the edges. Raises CycleError if a label graph has cycles.
+    """
+    result = values.copy()
+    if rate >= 1 or not len(edge_index):
+        return result
+    if weights is None:
+        weights = edge_index.weights
+    n_nodes, width = values.shape
+    flat_result = result.reshape(-1)
+    for label_id, levels in edge_index.label_levels().items():
+        of_label = edge_index.label_ids == label_id
+        for level in levels:
+            selected = of_label & np.isin(edge_index.targets, level)
+            flat_targets = edge_index.targets[selected] * width + label_id
+            contributions = weights[selected] * result[edge_index.sources[selected], label_id]
+            propagated = np.bincount(flat_targets, weights=contributions, minlength=n_nodes * width)
+            receivers = level * width + label_id
+            flat_result[receivers] = propagated[receivers]
+    return result
+
+def solve_fixed_point(values, edge_index, rate, weights=None):
+    """
+    Solves for the scores the propagation converges to, label by label.
+
+    At the fixed point of x = rate * x + (1 - rate) * W @ x every receiving entry
+    satisfies x_r = W_rr @ x_r + W_rf @ x_f, where f are the entries that never
+    receive a score for that label. That is the sparse linear system
+    (I - W_rr) x_r = W_rf @ x_f. It does not depend on the rate, as long as rate < 1.
+    """
+    import warnings
+    from scipy import sparse
+    from scipy.sparse import linalg
+
+    result = values.copy()
+    if rate >= 1 or not len(edge_index):
+        return result
+    n_nodes = values.shape[0]
+    for label, label_id in edge_index.label_index.items():
+        matrix = edge_index.weight_matrix(label, n_nodes, weights)
+        receivers = np.unique(edge_index.targets[edge_index.label_ids == label_id])
+        fixed = np.setdiff1d(np.arange(n_nodes), receivers)
+        coupled = matrix[receivers][:, receivers]
+        system = (sparse.identity(len(receivers), format='csc') - coupled).tocsc()
+        rhs = matrix[receivers][:, fixed] @ values[fixed, label_id]
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', linalg.MatrixRankWarning)
+            try:
+                solution = np.atleast_1d(linalg.spsolve(system, rhs))
+            except linalg.MatrixRankWarning:
+                solution = np.full(len(receivers), np.nan)
+        if not np.all(np.isfinite(solution)):
+            raise ValueError(f"Propagation of '{label}' has no unique fixed point (I - W is singular)")
+        result[receivers, label_id] = solution
+    return result
+
+def max_change(old, new):
+    """Largest absolute difference between two score arrays (0.0 if they are empty)."""
+    if not old.size:
+        return 0.0
+    return float(np.max(np.abs(new - old)))
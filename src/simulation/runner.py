@@ -0,0 +1,211 @@
+import collections
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from ..core.network import DynamicNetwork
+from ..models.function_registry import MODEL_FUNCTIONS, registry_version
+from .cache import scenario_key
+from .engine import SimulationEngine
+
+def run_scenario(config, model_functions=None, **engine_options):
+    """Builds and runs a single scenario and returns its picklable result payload."""
+    network = DynamicNetwork()
+    network.load_from_config(config)
+    engine = SimulationEngine(network, model_functions or MODEL_FUNCTIONS)
+    results = engine.run(scenario_name=config['name'], **engine_options)
+    return to_payload(results, config)
+
+def run_batch(configs, model_functions=None, **engine_options):
+    """Runs scenario configs that share one topology as a single batched simulation."""
+    if not configs:
+        return []
+    network = DynamicNetwork()
+    network.load_from_config(configs[0])
+    engine = SimulationEngine(network, model_functions or MODEL_FUNCTIONS)
+    all_results = engine.run_batch([config['name'] for config in configs],
+                                   engine.stack_weights(configs), **engine_options)
+    return [to_payload(results, config) for results, config in zip(all_results, configs)]
+
+def to_payload(results, config=None):
+    """
+    Strips a results dict down to plain, picklable data.
+
+    The live network is dropped; each node state keeps its domain so the results can
+    be plotted without it. The network can be rebuilt from payload['config'].
+    """
+    payload = {key: value for key, value in results.items() if key != 'final_network'}
+    payload['node_states'] = {
+        node_id: {
+            "domain": state['domain'],
+            "attributes": dict(state['attributes']),
+            "final_value_scores": dict(state['final_value_scores']),
+            "final_functionality_scores": dict(state['final_functionality_scores'])
+        } for node_id, state in results['node_states'].items()
+    }
+    payload['overall_scores'] = {name: float(score) for name, score in results['overall_scores'].items()}
+    payload['meta_score'] = float(results['meta_score'])
+    payload['config'] = config
+    return payload
+
+def run_scenarios(configs, model_functions=None, workers=None, cache=None, **engine_options):
+    """
+    Runs scenario configs across a process pool, one task per scenario.
+
+    Results come back in the order of `configs`. workers=None uses every CPU;
+    workers=1 runs everything in this process. With a ResultCache, scenarios it
+    already holds (or that repeat within `configs`) are not simulated again.
+    """
+    task = partial(run_scenario, model_functions=model_functions, **engine_options)
+    configs = list(configs)
+    if cache is None:
+        return _map(task, configs, workers)
+    keys, found = _lookup(cache, configs, model_functions, engine_options)
+    missing = _claim(configs, keys, set(found))
+    for (key, _), payload in zip(missing, _map(task, [config for _, config in missing], workers)):
+        cache.put(key, payload)
+        found[key] = payload
+    return _assemble(configs, keys, found)
+
+def iter_scenarios(configs, model_functions=None, workers=None, **engine_options):
+    """
+    Like `run_scenarios`, but yields the payloads one by one (in the order of
+    `configs`, which may be a generator), so a sweep can stream them to a
+    ResultWriter without holding them all.
+    """
+    task = partial(run_scenario, model_functions=model_functions, **engine_options)
+    return _imap(task, configs, workers)
+
+def run_batches(config_groups, model_functions=None, workers=None, cache=None, **engine_options):
+    """
+    Runs groups of scenarios sharing a topology (e.g. the weighting variants of one
+    design) across a process pool, one batched simulation per group. The payloads are
+    returned flattened, in group order. With a ResultCache, only the scenarios it
+    does not hold yet are simulated, each group's missing ones as one batch; a
+    scenario repeated across groups is simulated once, in its first group.
+    """
+    task = partial(run_batch, model_functions=model_functions, **engine_options)
+    config_groups = [list(group) for group in config_groups]
+    if cache is None:
+        return [payload for group in _map(task, config_groups, workers) for payload in group]
+    configs = [config for group in config_groups for config in group]
+    keys, found = _lookup(cache, configs, model_functions, engine_options)
+    claimed = set(found)
+    batches, start = [], 0
+    for group in config_groups:
+        batch = _claim(group, keys[start:start + len(group)], claimed)
+        start += len(group)
+        if batch:
+            batches.append(batch)
+    results = _map(task, [[config for _, config in batch] for batch in batches], workers)
+    for batch, payloads in zip(batches, results):
+        for (key, _), payload in zip(batch, payloads):
+            cache.put(key, payload)
+            found[key] = payload
+    return _assemble(configs, keys, found)
+
+def iter_batches(config_groups, model_functions=None, workers=None, cache=None, **engine_options):
+    """
+    Like `run_batches`, but lazily: `config_groups` may be a generator (of
+    generators), and the payloads of each group are yielded as soon as it is done,
+    so a sweep can stream them to reducers. With a ResultCache, each group only
+    simulates the scenarios the cache does not hold yet and no earlier group still
+    in flight is simulating.
+    """
+    task = partial(run_batch, model_functions=model_functions, **engine_options)
+    if cache is None:
+        for payloads in _imap(task, (list(group) for group in config_groups), workers):
+            yield from payloads
+        return
+
+    # Payloads by key, shared by the groups in flight; `refs` counts the groups
+    # in flight that use each key, so a key is dropped once none does.
+    lookups = collections.deque()
+    found, used, refs = {}, set(), collections.Counter()
+    def missing_configs():
+        for group in config_groups:
+            group = list(group)
+            keys, group_found = _lookup(cache, group, model_functions, engine_options, known=refs)
+            found.update(group_found)
+            missing = _claim(group, keys, set(refs) | set(group_found))
+            refs.update(set(keys))
+            lookups.append((group, keys, missing))
+            yield [config for _, config in missing]
+
+    for payloads in _imap(task, missing_configs(), workers):
+        group, keys, missing = lookups.popleft()
+        for (key, _), payload in zip(missing, payloads):
+            cache.put(key, payload)
+            found[key] = payload
+        yield from _assemble(group, keys, found, used)
+        for key in set(keys):
+            refs[key] -= 1
+            if not refs[key]:
+                del refs[key]
+                del found[key]
+                used.discard(key)
+
+def _lookup(cache, configs, model_functions, engine_options, known=()):
+    """The cache key of every config and the payloads the cache already holds (keys in `known` are skipped)."""
+    tag = registry_version(model_functions or MODEL_FUNCTIONS)
+    keys = [scenario_key(config, engine_options, tag) for config in configs]
+    found = {}
+    for key in dict.fromkeys(keys):
+        if key in known:
+            continue
+        payload = cache.get(key)
+        if payload is not None:
+            found[key] = payload
+    return keys, found
+
+def _claim(configs, keys, claimed):
+    """(key, config) of the first config of every key not in `claimed`, which those keys are added to."""
+    missing = []
+    for key, config in zip(keys, configs):
+        if key not in claimed:
+            claimed.add(key)
+            missing.append((key, config))
+    return missing
+
+def _assemble(configs, keys, found, used=None):
+    """
+    One payload per config, named after it; repeated keys get their own copies.
+    `used` carries the keys already handed out across calls.
+    """
+    payloads = []
+    used = set() if used is None else used
+    for key, config in zip(keys, configs):
+        payload = copy.deepcopy(found[key]) if key in used else found[key]
+        used.add(key)
+        payload['scenario_name'] = config['name']
+        payload['config'] = config
+        payloads.append(payload)
+    return payloads
+
+def _imap(task, items, workers):
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for item in items:
+            yield task(item)
+        return
+    # A bounded window of tasks in flight: `items` may be a generator, and finished
+    # payloads are handed on in order instead of piling up.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for item in items:
+            pending.append(executor.submit(task, item))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _map(task, items, workers):
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(items))
+    if workers <= 1:
+        return [task(item) for item in items]
+    # A few chunks per worker keeps the pool busy without paying IPC per scenario.
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(task, items, chunksize=chunksize))
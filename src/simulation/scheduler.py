@@ -0,0 +1,144 @@
+import collections
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ..core.graph_components import Node
+
+class CycleError(ValueError):
+    """Raised when a graph that must be acyclic has cycles; `nodes` holds every node on one."""
+    def __init__(self, nodes, what="graph"):
+        self.nodes = set(nodes)
+        super().__init__(f"The {what} has a cycle through: {', '.join(sorted(map(str, self.nodes)))}")
+
+def topological_levels(nodes, edges, what="graph"):
+    """
+    Groups `nodes` into levels so that every edge (source, target) points from a
+    lower level to a higher one. Nodes within a level are independent and keep the
+    order of `nodes`. Raises CycleError naming the nodes on cycles.
+    """
+    nodes = list(nodes)
+    successors = collections.defaultdict(list)
+    in_degree = {node: 0 for node in nodes}
+    for source, target in edges:
+        successors[source].append(target)
+        in_degree[target] += 1
+
+    levels = []
+    current = [node for node in nodes if in_degree[node] == 0]
+    placed = 0
+    while current:
+        levels.append(current)
+        placed += len(current)
+        ready = set()
+        for node in current:
+            for target in successors[node]:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    ready.add(target)
+        current = [node for node in nodes if node in ready]
+
+    if placed < len(nodes):
+        remaining = [node for node in nodes if in_degree[node] > 0]
+        raise CycleError(find_cycle_nodes(remaining, edges), what)
+    return levels
+
+def find_cycle_nodes(nodes, edges):
+    """Returns the nodes that lie on a cycle (strongly connected components with a loop)."""
+    nodes = set(nodes)
+    successors = collections.defaultdict(list)
+    for source, target in edges:
+        if source in nodes and target in nodes:
+            successors[source].append(target)
+
+    # Iterative Tarjan, so deep chains do not hit the recursion limit.
+    index, lowlink, on_stack, stack = {}, {}, set(), []
+    cyclic = set()
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(successors[root]))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors[child])))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in successors[node]:
+                        cyclic.update(component)
+    return cyclic
+
+class DependencyScheduler:
+    """
+    Runs model functions in the order given by the network's DependencyHyperedges.
+
+    A hyperedge {A, B} -> C means C runs after A and B. Nodes on the same level do
+    not depend on each other and can run in parallel.
+    """
+    EXECUTORS = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+
+    def __init__(self, network):
+        self.network = network
+        edges = [(source, dependency.target) for dependency in network.dependencies
+                 for source in dependency.sources]
+        self.levels = topological_levels(network.nodes, edges, what="dependency hypergraph")
+
+    def run(self, model_functions, workers=None, executor='thread'):
+        """
+        Evaluates the model functions level by level. With workers > 1 each level is
+        spread over a thread or process pool; workers score detached copies of the
+        nodes and send the scores back.
+        """
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {tuple(self.EXECUTORS)}")
+        pool = self.EXECUTORS[executor](max_workers=workers) if workers and workers > 1 else None
+        try:
+            for level in self.levels:
+                nodes = [self.network.nodes[node_id] for node_id in level]
+                tasks = [(model_functions[node.function_path], node) for node in nodes
+                         if node.function_path and node.function_path in model_functions]
+                if pool is None:
+                    for function, node in tasks:
+                        function(node)
+                else:
+                    # The network's ScoreStore is not thread-safe, so threads get copies too.
+                    remote = [(function, _detached(node)) for function, node in tasks] if executor == 'thread' else tasks
+                    for (function, node), scores in zip(tasks, pool.map(_evaluate_remote, remote)):
+                        node.functionality_scores, node.value_scores = scores
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+def _detached(node):
+    # A copy of the node with its scores in a private store.
+    copy = Node(node.id, node.domain, node.type, node.attributes, node.function_path)
+    copy.functionality_scores = dict(node.functionality_scores.items())
+    copy.value_scores = dict(node.value_scores.items())
+    return copy
+
+def _evaluate_remote(task):
+    function, node = task
+    function(node)
+    return node.functionality_scores, node.value_scores
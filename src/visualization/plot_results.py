@@ -1,15 +1,12 @@
-def print_value_propagation(network):
-    """Prints the history of all value scores for each node."""
-    print("\n--- Value Score Propagation History ---")
-    for node_id, node in network.nodes.items():
-        print(f"[{node.id.ljust(25)}]")
-        all_labels = set()
-        for history_point in node.value_score_history:
-            all_labels.update(history_point.keys())
-        
-        if not all_labels:
-            continue
-            
-        for label in sorted(list(all_labels)):
-            history_str = " -> ".join([f"{s.get(label, 0.0):.3f}" for s in node.value_score_history])
-            print(f"  {label.ljust(15)}: {history_str}")
\ No newline at end of file
+from ..instrumentation.history import node_series
+
+def print_value_propagation(history, kind='value', scenario_name=None):
+    """Prints the recorded history of every node's scores (results['history'], see instrumentation.history)."""
+    print(f"\n--- {kind.capitalize()} Score Propagation History{f': {scenario_name}' if scenario_name else ''} ---")
+    if history['dropped']:
+        print(f"(first {history['dropped']} iterations not kept)")
+    for node_id in history['node_ids']:
+        print(f"[{node_id.ljust(25)}]")
+        for label, scores in sorted(node_series(history, node_id, kind).items()):
+            history_str = " -> ".join(f"{score:.3f}" for score in scores)
+            print(f"  {label.ljust(15)}: {history_str}")
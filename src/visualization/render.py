@@ -0,0 +1,167 @@
+"""
+The rendering stage: draws the figures of finished results, after simulation.
+
+A figure is a job (figure, output path, data), where `figure` names one of
+FIGURES and `data` is plain, picklable input (result payloads, configs). `render`
+fans the jobs out to worker processes and skips every job whose output file
+already holds a rendering of the same data by the same plotting code, as
+recorded in a manifest in `cache_dir`. Hypergraph layouts are cached there too,
+keyed by the network topology, so a topology is laid out once across scenarios
+and runs.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+from ..core.network import DynamicNetwork
+from ..models.function_registry import code_digest
+from . import visualize_graph
+
+log = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+
+def _network_figure(data, output_path, cache_dir=None):
+    config, scenario_name = data
+    network = DynamicNetwork()
+    network.load_from_config(config)
+    return visualize_graph.visualize_network_graph(network, scenario_name, output_path, cached_layout(network, cache_dir))
+
+def _domain_scores_figure(data, output_path, cache_dir=None):
+    results, scenario_name = data
+    return visualize_graph.plot_domain_scores(results, scenario_name, output_path)
+
+def _convergence_figure(data, output_path, cache_dir=None):
+    history, scenario_name = data
+    return visualize_graph.plot_convergence(history, scenario_name, output_path)
+
+def _base_comparison_figure(data, output_path, cache_dir=None):
+    return visualize_graph.plot_base_design_comparison(data, output_path)
+
+def _weighting_impact_figure(data, output_path, cache_dir=None):
+    return visualize_graph.plot_weighting_impact(data, output_path)
+
+FIGURES = {
+    'network': (_network_figure, visualize_graph.visualize_network_graph),
+    'domain_scores': (_domain_scores_figure, visualize_graph.plot_domain_scores),
+    'convergence': (_convergence_figure, visualize_graph.plot_convergence),
+    'base_comparison': (_base_comparison_figure, visualize_graph.plot_base_design_comparison),
+    'weighting_impact': (_weighting_impact_figure, visualize_graph.plot_weighting_impact),
+}
+
+def _to_json(value):
+    # Config overlays and score maps, NumPy scalars and arrays.
+    if isinstance(value, Mapping):
+        return dict(value)
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+def _digest(*parts):
+    text = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=_to_json)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def topology_key(network):
+    """A hash of the hypergraph a network is drawn as (its nodes and edges, not the weights)."""
+    return _digest(visualize_graph.hypergraph_edges(network))[:16]
+
+def cached_layout(network, cache_dir=None):
+    """The network's hypergraph layout, read from or saved to `cache_dir` by topology."""
+    if cache_dir is None:
+        return visualize_graph.hypergraph_layout(network)
+    path = os.path.join(cache_dir, 'layouts', f"{topology_key(network)}.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            return {name: tuple(xy) for name, xy in json.load(f).items()}
+    pos = visualize_graph.hypergraph_layout(network)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename, so a worker never reads a half-written layout.
+    with open(f"{path}.{os.getpid()}", 'w') as f:
+        json.dump(pos, f)
+    os.replace(f"{path}.{os.getpid()}", path)
+    return pos
+
+def figure_key(figure, data):
+    """A hash of a figure's input data and the code of its plotting functions."""
+    code = [code_digest(function.__code__) for function in FIGURES[figure]]
+    return _digest(figure, code, data)
+
+def scenario_jobs(all_results, plot_hypergraph=True, file_name=None):
+    """The per-scenario figures of result payloads: domain scores and, optionally, the network graph."""
+    jobs = []
+    for results in all_results:
+        name = file_name(results['scenario_name']) if file_name else results['scenario_name']
+        if plot_hypergraph:
+            jobs.append(('network', f"network_{name}.png", (results['config'], name)))
+        jobs.append(('domain_scores', f"detailed_scores_{name}.png",
+                     ({'node_states': results['node_states']}, name)))
+    return jobs
+
+def summary(all_results):
+    """The part of result payloads the comparison charts read."""
+    return [{key: results[key] for key in ('scenario_name', 'meta_score', 'overall_scores')} for results in all_results]
+
+def _run(job, cache_dir):
+    figure, output_path, data = job
+    return FIGURES[figure][0](data, output_path, cache_dir)
+
+def _run_in_memory(job, cache_dir):
+    figure, output_path, data = job
+    buffer = io.BytesIO()
+    return buffer.getvalue() if FIGURES[figure][0](data, buffer, cache_dir) is not None else None
+
+def render_images(jobs, workers=None, cache_dir=None):
+    """
+    Renders figure jobs to PNG bytes instead of files: {output path: bytes}, for
+    ReportBuilder / generate_pdf_report(images=...). Only layouts are cached.
+    """
+    jobs = list({job[1]: job for job in jobs}.values())
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        images = [_run_in_memory(job, cache_dir) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            images = list(executor.map(_run_in_memory, jobs, [cache_dir] * len(jobs)))
+    return {job[1]: image for job, image in zip(jobs, images) if image is not None}
+
+def render(jobs, workers=None, cache_dir=None):
+    """
+    Renders figure jobs on `workers` processes (default: all CPUs), skipping those
+    whose output is up to date. Returns the number of figures rendered.
+    """
+    manifest = {}
+    manifest_path = os.path.join(cache_dir, MANIFEST) if cache_dir else None
+    if manifest_path and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    # A later job for the same output file replaces an earlier one.
+    jobs = list({job[1]: job for job in jobs}.values())
+    stale = []
+    for job in jobs:
+        figure, output_path, data = job
+        key = figure_key(figure, data)
+        if manifest.get(output_path) == key and os.path.exists(output_path):
+            continue
+        stale.append((job, key))
+    log.info("\nRendering %d of %d figures (%d up to date).", len(stale), len(jobs), len(jobs) - len(stale))
+
+    workers = min(workers or os.cpu_count() or 1, len(stale))
+    if workers <= 1:
+        outputs = [_run(job, cache_dir) for job, _ in stale]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outputs = list(executor.map(_run, [job for job, _ in stale], [cache_dir] * len(stale)))
+
+    if manifest_path:
+        for (job, key), output in zip(stale, outputs):
+            if output is not None:
+                manifest[job[1]] = key
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+    return len(stale)
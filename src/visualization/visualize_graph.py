@@ -1,9 +1,18 @@
+import logging
+
 import hypernetx as hnx
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 import pandas as pd
-import numpy as np
-import seaborn as sns
+from hypernetx.drawing.rubber_band import layout_node_link
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+
+from ..instrumentation.history import convergence
+
+log = logging.getLogger(__name__)
+
+# Every function draws on its own Figure (Agg canvas) instead of pyplot's global
+# state, so figures can be rendered concurrently in worker processes.
 
 def plot_weighting_impact(all_results, output_path):
     """
@@ -15,34 +24,36 @@ def plot_weighting_impact(all_results, output_path):
         parts = res['scenario_name'].split('_')
         weight_strategy = parts[-1]
         base_design = "_".join(parts[:-1])
-        
+
         records.append({
             'Base Design': base_design,
             'Weighting Strategy': weight_strategy,
             'Meta Score': res['meta_score']
         })
-    
+
     df = pd.DataFrame(records)
     pivot_df = df.pivot_table(index='Base Design', columns='Weighting Strategy', values='Meta Score', aggfunc='mean')
-    
+
     ordered_cols = [col for col in ['Balanced', 'Cost-Focused', 'Sustain-Focused', 'Perf-Focused'] if col in pivot_df.columns]
     pivot_df = pivot_df[ordered_cols]
-    
-    ax = pivot_df.plot(kind='bar', figsize=(14, 8), rot=45)
-    plt.title('Impact of Weighting Strategies on Meta Score', fontsize=16)
-    plt.ylabel('Final Meta Score', fontsize=12)
-    plt.xlabel('Base Design Scenario', fontsize=12)
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.legend(title='Weighting Strategy')
-    
+
+    fig = Figure(figsize=(14, 8))
+    ax = fig.add_subplot()
+    pivot_df.plot(kind='bar', ax=ax, rot=45)
+    ax.set_title('Impact of Weighting Strategies on Meta Score', fontsize=16)
+    ax.set_ylabel('Final Meta Score', fontsize=12)
+    ax.set_xlabel('Base Design Scenario', fontsize=12)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.legend(title='Weighting Strategy')
+
     for p in ax.patches:
         ax.annotate(f"{p.get_height():.3f}", (p.get_x() + p.get_width() / 2., p.get_height()),
                     ha='center', va='center', xytext=(0, 9), textcoords='offset points', fontsize=9)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    print(f"\nSaved weighting impact summary chart to {output_path}")
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    log.info("\nSaved weighting impact summary chart to %s", output_path)
+    return output_path
 
 def plot_base_design_comparison(base_design_results, output_path):
     """
@@ -57,41 +68,42 @@ def plot_base_design_comparison(base_design_results, output_path):
             'Value': res['overall_scores']['Value'],
             'Sustainability': res['overall_scores']['Sustainability']
         })
-    
+
     df = pd.DataFrame(records)
     df.set_index('Scenario', inplace=True)
-    
-    ax = df.plot(kind='bar', figsize=(12, 7), rot=45)
-    plt.title('Overall Score Comparison Across Base Designs (Balanced Weights)', fontsize=16)
-    plt.ylabel('Average Score', fontsize=12)
-    plt.xlabel('Design Scenario', fontsize=12)
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    
+
+    fig = Figure(figsize=(12, 7))
+    ax = fig.add_subplot()
+    df.plot(kind='bar', ax=ax, rot=45)
+    ax.set_title('Overall Score Comparison Across Base Designs (Balanced Weights)', fontsize=16)
+    ax.set_ylabel('Average Score', fontsize=12)
+    ax.set_xlabel('Design Scenario', fontsize=12)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
     for p in ax.patches:
         ax.annotate(f"{p.get_height():.3f}", (p.get_x() + p.get_width() / 2., p.get_height()),
                     ha='center', va='center', xytext=(0, 9), textcoords='offset points', fontsize=9)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    print(f"\nSaved final summary comparison chart to {output_path}")
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    log.info("\nSaved final summary comparison chart to %s", output_path)
+    return output_path
 
-# ... (rest of the file is the same)
-def plot_domain_scores(results, scenario_name):
+def plot_domain_scores(results, scenario_name, output_path=None):
     key_metrics = {'total_cost': 'Cost', 'performance': 'Performance', 'sustainability': 'Sustainability'}
     records = []
-    network = results['final_network']
     for node_id, state in results['node_states'].items():
-        domain = network.get_node(node_id).domain
+        domain = state['domain']
         all_scores = {**state['final_functionality_scores'], **state['final_value_scores']}
         for metric_key, metric_name in key_metrics.items():
             if metric_key in all_scores:
                 records.append({'domain': domain, 'node': node_id, 'metric': metric_name, 'score': all_scores[metric_key]})
     if not records:
-        print("  - No data to plot for domain scores.")
-        return
+        log.info("  - No data to plot for domain scores.")
+        return None
     df = pd.DataFrame(records)
-    fig, axes = plt.subplots(len(key_metrics), 1, figsize=(8, 9), sharex=True)
+    fig = Figure(figsize=(8, 9))
+    axes = fig.subplots(len(key_metrics), 1, sharex=True)
     for i, metric_name in enumerate(key_metrics.values()):
         ax = axes[i]
         metric_df = df[df['metric'] == metric_name]
@@ -105,36 +117,70 @@ def plot_domain_scores(results, scenario_name):
         ax.set_ylabel("Aggregated Score")
         ax.legend(title='Contributing Models', bbox_to_anchor=(1.04, 1), loc="upper left")
         ax.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.xlabel("Domain", fontsize=12)
-    plt.tight_layout(rect=[0, 0, 0.85, 1.0])
-    filename = f"detailed_scores_{scenario_name}.png"
-    plt.savefig(filename, dpi=150, bbox_inches='tight')
-    print(f"  - Saved detailed scores plot to {filename}")
-    plt.close()
-
-def visualize_network_graph(network, scenario_name):
-    fig = plt.figure(figsize=(10, 12))
+    axes[-1].set_xlabel("Domain", fontsize=12)
+    fig.tight_layout(rect=[0, 0, 0.85, 1.0])
+    filename = output_path or f"detailed_scores_{scenario_name}.png"
+    fig.savefig(filename, dpi=150, bbox_inches='tight')
+    log.info("  - Saved detailed scores plot to %s", filename)
+    return filename
+
+def plot_convergence(history, scenario_name, output_path=None):
+    """Plots the largest score change per iteration of each kind from a recorded score history."""
+    iterations, changes = convergence(history)
+    if not len(iterations):
+        log.info("  - No iterations recorded for the convergence plot.")
+        return None
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+    for kind, kind_changes in changes.items():
+        # Exact zeros (converged kinds) cannot be drawn on a log axis.
+        ax.semilogy(iterations, kind_changes.clip(min=1e-12), marker='o', markersize=3, label=kind.capitalize())
+    ax.set_title(f"Score Convergence: {scenario_name}")
+    ax.set_xlabel("Iteration")
+    ax.set_ylabel("Largest score change")
+    ax.grid(which='both', linestyle='--', alpha=0.7)
+    ax.legend(title='Scores')
+    fig.tight_layout()
+    filename = output_path or f"convergence_{scenario_name}.png"
+    fig.savefig(filename, dpi=150, bbox_inches='tight')
+    log.info("  - Saved convergence plot to %s", filename)
+    return filename
+
+def hypergraph_edges(network):
+    """The hyperedges drawn for a network: {edge name: [node ids]}, dependencies first."""
+    edges = {}
+    for i, dep in enumerate(network.dependencies):
+        edges[f"Dep-{i+1}"] = list(dep.sources) + [dep.target]
+    for edge in network.value_edges:
+        edges[f"V:{edge.label[:4]}-{edge.source[:4]}"] = [edge.source, edge.target]
+    for edge in network.functionality_edges:
+        edges[f"F:{edge.label[:4]}-{edge.source[:4]}"] = [edge.source, edge.target]
+    return edges
+
+def hypergraph_layout(network):
+    """Positions {node or edge name: (x, y)} of the network's hypergraph drawing."""
+    pos = layout_node_link(hnx.Hypergraph(hypergraph_edges(network)))
+    return {name: (float(x), float(y)) for name, (x, y) in pos.items()}
+
+def visualize_network_graph(network, scenario_name, output_path=None, pos=None):
+    """Draws the network hypergraph and its weighted edges; `pos` reuses a layout from `hypergraph_layout`."""
+    fig = Figure(figsize=(10, 12))
     gs = fig.add_gridspec(2, 1, height_ratios=[3, 1.5])
     ax_graph = fig.add_subplot(gs[0])
     ax_table = fig.add_subplot(gs[1])
-    hypergraph_edges = {}
-    for i, dep in enumerate(network.dependencies):
-        hypergraph_edges[f"Dep-{i+1}"] = list(dep.sources) + [dep.target]
     simple_edges_data = []
     for edge in network.value_edges:
-        hypergraph_edges[f"V:{edge.label[:4]}-{edge.source[:4]}"] = [edge.source, edge.target]
         simple_edges_data.append(['Value', edge.source, edge.target, edge.label, f"{edge.weight:.2f}"])
     for edge in network.functionality_edges:
-        hypergraph_edges[f"F:{edge.label[:4]}-{edge.source[:4]}"] = [edge.source, edge.target]
         simple_edges_data.append(['Functionality', edge.source, edge.target, edge.label, f"{edge.weight:.2f}"])
-    H = hnx.Hypergraph(hypergraph_edges)
+    H = hnx.Hypergraph(hypergraph_edges(network))
     domain_colors = {'Material': '#ff9999', 'Design': '#99ccff', 'Manufacturing': '#99ff99', 'Unknown': '#cccccc'}
     node_facecolors = {node_id: domain_colors.get(node_obj.domain, '#cccccc') for node_id, node_obj in network.nodes.items()}
     nodes_kwargs = {'facecolor': node_facecolors}
-    hnx.draw(H, ax=ax_graph, nodes_kwargs=nodes_kwargs, node_radius=0.6,
+    hnx.draw(H, pos=pos, ax=ax_graph, nodes_kwargs=nodes_kwargs, node_radius=0.6,
              node_labels_kwargs={'fontsize': 9, 'fontweight': 'bold'},
              edge_labels_kwargs={'fontsize': 8, 'alpha': 0.8, 'color': '#003366'})
-    legend_handles = [mpatches.Patch(color=domain_colors['Material'], label='Material Domain'), mpatches.Patch(color=domain_colors['Design'], label='Design Domain'), mpatches.Patch(color=domain_colors['Manufacturing'], label='Manufacturing Domain'), plt.Line2D([0], [0], marker='o', color='w', label='Model Node', markerfacecolor='grey', markersize=10), plt.Line2D([0], [0], marker='s', color='w', label='Dependency Hyperedge', markerfacecolor='#ffcc66', markersize=10)]
+    legend_handles = [Patch(color=domain_colors['Material'], label='Material Domain'), Patch(color=domain_colors['Design'], label='Design Domain'), Patch(color=domain_colors['Manufacturing'], label='Manufacturing Domain'), Line2D([0], [0], marker='o', color='w', label='Model Node', markerfacecolor='grey', markersize=10), Line2D([0], [0], marker='s', color='w', label='Dependency Hyperedge', markerfacecolor='#ffcc66', markersize=10)]
     ax_graph.legend(handles=legend_handles, title="Legend", loc='upper left', bbox_to_anchor=(1.01, 1.0))
     ax_graph.set_title(f"Network Hypergraph for: {scenario_name}", size=16)
     ax_table.axis('off')
@@ -148,8 +194,8 @@ def visualize_network_graph(network, scenario_name):
         table.scale(1, 1.2)
     else:
         ax_table.text(0.5, 0.5, 'No weighted connections.', ha='center', va='center')
-    plt.tight_layout(rect=[0, 0, 0.85, 1])
-    filename = f"network_{scenario_name}.png"
-    plt.savefig(filename, dpi=150, bbox_inches='tight')
-    print(f"  - Saved network graph to {filename}")
-    plt.close()
\ No newline at end of file
+    fig.tight_layout(rect=[0, 0, 0.85, 1])
+    filename = output_path or f"network_{scenario_name}.png"
+    fig.savefig(filename, dpi=150, bbox_inches='tight')
+    log.info("  - Saved network graph to %s", filename)
+    return filename
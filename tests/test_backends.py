@@ -0,0 +1,53 @@
+import pytest
+
+from src.benchmarks.synthetic import synthetic_config
+from src.config.config import BASE_DESIGNS
+from src.core.network import DynamicNetwork
+from src.models.function_registry import MODEL_FUNCTIONS
+from src.simulation.engine import SimulationEngine
+
+CONFIGS = BASE_DESIGNS + [synthetic_config(200, edge_density=3.0, n_labels=5, seed=3, name='synthetic')]
+
+def run(config, **options):
+    network = DynamicNetwork()
+    network.load_from_config(config)
+    return SimulationEngine(network, MODEL_FUNCTIONS).run(config['name'], **options)
+
+def node_scores(results):
+    """Every node's final scores, in the order its dicts list them."""
+    return {node_id: (list(state['final_value_scores'].items()), list(state['final_functionality_scores'].items()))
+            for node_id, state in results['node_states'].items()}
+
+@pytest.mark.parametrize('config', CONFIGS, ids=lambda config: config['name'])
+@pytest.mark.parametrize('options', [{}, {'iterations': 3}, {'tol': 1e-9}, {'tol': 1e-4, 'max_iterations': 5}],
+                         ids=['fixed-count', 'short', 'tol', 'tol-capped'])
+def test_compiled_matches_reference(config, options):
+    reference = run(config, backend='reference', **options)
+    compiled = run(config, backend='compiled', **options)
+    assert compiled['convergence'] == reference['convergence']
+    assert compiled['meta_score'] == reference['meta_score']
+    assert compiled['overall_scores'] == reference['overall_scores']
+    assert node_scores(compiled) == node_scores(reference)
+
+@pytest.mark.parametrize('config', CONFIGS, ids=lambda config: config['name'])
+@pytest.mark.parametrize('method', ['sweep', 'fixed_point'])
+def test_direct_methods_reach_the_converged_scores(config, method):
+    converged = run(config, backend='reference', tol=1e-13, max_iterations=10000)
+    assert converged['convergence']['converged']
+    solved = run(config, method=method)
+    assert solved['convergence']['converged']
+    assert solved['meta_score'] == pytest.approx(converged['meta_score'], abs=1e-10)
+    expected = node_scores(converged)
+    for node_id, (value_scores, functionality_scores) in node_scores(solved).items():
+        for scores, reference in zip((value_scores, functionality_scores), expected[node_id]):
+            assert [label for label, _ in scores] == [label for label, _ in reference]
+            assert [score for _, score in scores] == pytest.approx([score for _, score in reference], abs=1e-10)
+
+@pytest.mark.parametrize('config', CONFIGS, ids=lambda config: config['name'])
+def test_sweep_matches_fixed_point(config):
+    sweep, fixed_point = run(config, method='sweep'), run(config, method='fixed_point')
+    assert sweep['meta_score'] == pytest.approx(fixed_point['meta_score'], abs=1e-12)
+    for (value_a, functionality_a), (value_b, functionality_b) in zip(node_scores(sweep).values(),
+                                                                      node_scores(fixed_point).values()):
+        assert dict(value_a) == pytest.approx(dict(value_b), abs=1e-12)
+        assert dict(functionality_a) == pytest.approx(dict(functionality_b), abs=1e-12)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from src.analysis.batch import AttributeParameter, BatchEvaluator, WeightParameter
+from src.config.config import BASE_DESIGNS
+from src.config.overlay import ScenarioOverlay
+from src.models.function_registry import MODEL_FUNCTIONS
+from src.simulation.runner import run_scenario
+
+PARAMETERS = [
+    AttributeParameter('material_assessment', 'face_sheet_modulus'),
+    AttributeParameter('material_assessment', 'cost_per_m2'),
+    AttributeParameter('technology_assessment', 'scrap_rate'),
+    AttributeParameter('design_creation', 'panel_thickness'),
+    WeightParameter('value', 'material_assessment', 'technology_assessment', 'total_cost'),
+]
+RANGES = [(60, 160), (80, 320), (0.0, 0.3), (10, 40), (0.3, 1.0)]
+OPTIONS = [{}, {'tol': 1e-9}, {'method': 'sweep'}]
+
+def sample_columns(n_samples, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.uniform(low, high, n_samples) for low, high in RANGES]
+
+def sample_config(base, columns, s):
+    """Sample `s` of the columns as a config of its own."""
+    attributes, weights = {}, {}
+    for parameter, column in zip(PARAMETERS, columns):
+        if isinstance(parameter, AttributeParameter):
+            attributes.setdefault(parameter.node_id, {})[parameter.attribute] = column[s].item()
+            continue
+        for position, edge in enumerate(base['edges']):
+            if (edge['type'], edge.get('source'), edge['target'], edge.get('label')) == (
+                    parameter.kind, parameter.source, parameter.target, parameter.label):
+                weights[position] = column[s].item()
+    return ScenarioOverlay(base, f"{base['name']}_sample_{s}", weights, attributes)
+
+@pytest.mark.parametrize('base', BASE_DESIGNS, ids=lambda config: config['name'])
+@pytest.mark.parametrize('options', OPTIONS, ids=['iterate', 'tol', 'sweep'])
+def test_vectorized_matches_scalar(base, options):
+    columns = sample_columns(16)
+    vectorized = BatchEvaluator(base, PARAMETERS, **options).evaluate(columns)
+    scalar = BatchEvaluator(base, PARAMETERS, vectorized_functions={}, **options).evaluate(columns)
+    assert np.array_equal(vectorized['meta_score'], scalar['meta_score'])
+    for name, scores in vectorized['overall_scores'].items():
+        assert np.array_equal(scores, scalar['overall_scores'][name])
+
+@pytest.mark.parametrize('base', BASE_DESIGNS, ids=lambda config: config['name'])
+@pytest.mark.parametrize('options', OPTIONS, ids=['iterate', 'tol', 'sweep'])
+def test_matches_engine_runs(base, options):
+    columns = sample_columns(6, seed=1)
+    evaluated = BatchEvaluator(base, PARAMETERS, **options).evaluate(columns)
+    for s in range(6):
+        expected = run_scenario(sample_config(base, columns, s), **options)
+        assert evaluated['meta_score'][s] == expected['meta_score']
+        for name, score in expected['overall_scores'].items():
+            assert evaluated['overall_scores'][name][s] == pytest.approx(score, abs=1e-12)
+
+def test_label_missing_from_the_base_run():
+    def with_premium(node):
+        MODEL_FUNCTIONS['models.system.material_assessment'](node)
+        if node.attributes['cost_per_m2'] > 500:
+            node.value_scores['premium'] = 1.0
+    model_functions = {**MODEL_FUNCTIONS, 'models.system.material_assessment': with_premium}
+    base = BASE_DESIGNS[0]
+    parameter = AttributeParameter('material_assessment', 'cost_per_m2')
+    evaluator = BatchEvaluator(base, [parameter], model_functions=model_functions)
+    evaluated = evaluator.evaluate([np.array([600.0, 700.0])])
+    for s, cost in enumerate((600.0, 700.0)):
+        config = ScenarioOverlay(base, f"premium_{s}", attributes={'material_assessment': {'cost_per_m2': cost}})
+        expected = run_scenario(config, model_functions=model_functions)
+        assert evaluated['meta_score'][s] == expected['meta_score']
+        for name, score in expected['overall_scores'].items():
+            assert evaluated['overall_scores'][name][s] == pytest.approx(score, abs=1e-12)
@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from src.config.config import BASE_DESIGNS, generate_weighting_scenarios
+from src.config.overlay import ScenarioOverlay
+from src.simulation.runner import run_batch, run_scenario
+
+def random_variants(base, n, seed=0):
+    rng = random.Random(seed)
+    weighted = [position for position, edge in enumerate(base['edges']) if 'weight' in edge]
+    return [ScenarioOverlay(base, f"{base['name']}_random_{i}", {p: rng.uniform(0.1, 1.0) for p in weighted})
+            for i in range(n)]
+
+GROUPS = ([generate_weighting_scenarios(base) for base in BASE_DESIGNS]
+          + [random_variants(BASE_DESIGNS[0], 6)])
+
+@pytest.mark.parametrize('configs', GROUPS, ids=lambda configs: configs[0]['name'])
+@pytest.mark.parametrize('options', [{}, {'tol': 1e-9}, {'method': 'sweep'}, {'method': 'fixed_point'}],
+                         ids=['iterate', 'tol', 'sweep', 'fixed_point'])
+def test_batch_matches_single_runs(configs, options):
+    batched = run_batch(configs, **options)
+    assert [results['scenario_name'] for results in batched] == [config['name'] for config in configs]
+    for results, config in zip(batched, configs):
+        expected = run_scenario(config, **options)
+        assert results['meta_score'] == expected['meta_score']
+        assert results['overall_scores'] == expected['overall_scores']
+        assert results['convergence'] == expected['convergence']
+        for node_id, state in expected['node_states'].items():
+            for scores in ('final_value_scores', 'final_functionality_scores'):
+                assert list(results['node_states'][node_id][scores].items()) == list(state[scores].items())
+
+def test_batch_results_are_independent():
+    configs = generate_weighting_scenarios(BASE_DESIGNS[0])
+    first, second = run_batch(configs)[:2]
+    first['node_states']['design_prediction']['final_value_scores']['performance'] = -1.0
+    assert second['node_states']['design_prediction']['final_value_scores'].get('performance') != -1.0
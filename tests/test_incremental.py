@@ -0,0 +1,68 @@
+import copy
+import random
+
+import pytest
+
+from src.benchmarks.synthetic import synthetic_config
+from src.config.config import BASE_DESIGNS
+from src.core.network import DynamicNetwork
+from src.models.function_registry import MODEL_FUNCTIONS
+from src.simulation.engine import SimulationEngine
+
+CONFIGS = BASE_DESIGNS + [synthetic_config(120, edge_density=2.0, n_labels=4, seed=5, name='synthetic')]
+OPTIONS = [{}, {'tol': 1e-9}, {'method': 'fixed_point'}, {'method': 'sweep'}]
+
+def run(config, **options):
+    network = DynamicNetwork()
+    network.load_from_config(config)
+    engine = SimulationEngine(network, MODEL_FUNCTIONS)
+    return engine, engine.run(config['name'], **options)
+
+def node_scores(network):
+    return {node_id: (list(node.value_scores.items()), list(node.functionality_scores.items()))
+            for node_id, node in network.nodes.items()}
+
+def random_update(config, engine, rng):
+    """Applies one random attribute or edge weight change to `config` and through `engine`."""
+    if rng.random() < 0.5:
+        node = rng.choice([node for node in config['nodes']
+                           if any(isinstance(value, float) for value in node['attributes'].values())])
+        key = rng.choice([key for key, value in node['attributes'].items() if isinstance(value, float)])
+        value = node['attributes'][key] * rng.uniform(0.5, 1.5)
+        node['attributes'][key] = value
+        return engine.update_attribute(node['node_id'], key, value)
+    edge = rng.choice([edge for edge in config['edges'] if edge['type'] != 'dependency'])
+    weight = rng.uniform(0.1, 0.9)
+    for other in config['edges']:
+        if other['type'] == edge['type'] and (other['source'], other['target'], other['label']) == (
+                edge['source'], edge['target'], edge['label']):
+            other['weight'] = weight
+    return engine.update_edge_weight(edge['type'], edge['source'], edge['target'], edge['label'], weight)
+
+@pytest.mark.parametrize('base', CONFIGS, ids=lambda config: config['name'])
+@pytest.mark.parametrize('options', OPTIONS, ids=['iterate', 'tol', 'fixed_point', 'sweep'])
+def test_updates_match_full_runs(base, options):
+    config = copy.deepcopy(base)
+    engine, _ = run(config, **options)
+    rng = random.Random(0)
+    for _ in range(8):
+        meta_score = random_update(config, engine, rng)
+        _, expected = run(config, **options)
+        updated, full = node_scores(engine.network), node_scores(expected['final_network'])
+        if 'method' in options:
+            # Direct solves of a part of the network differ from a whole-network solve in the last bits.
+            assert meta_score == pytest.approx(expected['meta_score'], abs=1e-12)
+            for node_id, (value_scores, functionality_scores) in updated.items():
+                assert dict(value_scores) == pytest.approx(dict(full[node_id][0]), abs=1e-12)
+                assert dict(functionality_scores) == pytest.approx(dict(full[node_id][1]), abs=1e-12)
+        else:
+            assert meta_score == expected['meta_score']
+            assert updated == full
+
+def test_updates_need_a_compiled_run():
+    network = DynamicNetwork()
+    network.load_from_config(BASE_DESIGNS[0])
+    engine = SimulationEngine(network, MODEL_FUNCTIONS)
+    engine.run(BASE_DESIGNS[0]['name'], backend='reference')
+    with pytest.raises(RuntimeError):
+        engine.update_attribute('material_assessment', 'cost_per_m2', 250)
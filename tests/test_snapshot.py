@@ -0,0 +1,71 @@
+import pytest
+
+from src.benchmarks.synthetic import synthetic_config
+from src.config.config import BASE_DESIGNS
+from src.core.graph_components import EDGE_FIELDS
+from src.core.network import EDGE_KINDS, DynamicNetwork
+from src.core.snapshot import Snapshot, write_snapshot
+from src.models.function_registry import MODEL_FUNCTIONS
+from src.simulation.engine import SimulationEngine
+
+CONFIGS = BASE_DESIGNS + [synthetic_config(300, edge_density=3.0, n_labels=6, seed=7, name='synthetic')]
+
+def load(config):
+    network = DynamicNetwork()
+    network.load_from_config(config)
+    return network
+
+def edge_fields(edges):
+    return [tuple(getattr(edge, field) for field in type(edge).__slots__) for edge in edges]
+
+@pytest.fixture(params=CONFIGS, ids=lambda config: config['name'])
+def networks(request, tmp_path):
+    """The network of a config, and the one loaded from its snapshot."""
+    config = request.param
+    snapshot = Snapshot(write_snapshot(config, tmp_path / f"{config['name']}.snap"))
+    return config, snapshot, load(config), load(snapshot)
+
+def test_nodes_and_attributes(networks):
+    _, _, expected, loaded = networks
+    assert list(loaded.nodes) == list(expected.nodes)
+    for node_id, node in expected.nodes.items():
+        other = loaded.nodes[node_id]
+        assert (other.domain, other.type, other.function_path) == (node.domain, node.type, node.function_path)
+        assert list(other.attributes.items()) == list(node.attributes.items())
+
+def test_weighted_edge_columns(networks):
+    _, _, expected, loaded = networks
+    for kind in ('value', 'functionality'):
+        for field in EDGE_FIELDS:
+            assert loaded.edge_list(kind).column(field) == expected.edge_list(kind).column(field), (kind, field)
+
+def test_dependencies(networks):
+    _, _, expected, loaded = networks
+    assert edge_fields(loaded.dependencies) == edge_fields(expected.dependencies)
+
+def test_adjacency_lookups(networks):
+    _, _, expected, loaded = networks
+    for node_id in expected.nodes:
+        for kind in EDGE_KINDS:
+            assert edge_fields(loaded.in_edges(node_id, kind)) == edge_fields(expected.in_edges(node_id, kind))
+            assert edge_fields(loaded.out_edges(node_id, kind)) == edge_fields(expected.out_edges(node_id, kind))
+    for kind in ('value', 'functionality'):
+        for edge in expected.edge_list(kind)[:50]:
+            assert (edge_fields(loaded.in_edges(edge.target, kind, edge.label))
+                    == edge_fields(expected.in_edges(edge.target, kind, edge.label)))
+
+def test_run_matches_dict_config(networks):
+    config, snapshot, _, _ = networks
+    expected = SimulationEngine(load(config), MODEL_FUNCTIONS).run(config['name'])
+    results = SimulationEngine(load(snapshot), MODEL_FUNCTIONS).run(snapshot['name'])
+    assert results['meta_score'] == expected['meta_score']
+    assert results['overall_scores'] == expected['overall_scores']
+    for node_id, state in expected['node_states'].items():
+        for scores in ('final_value_scores', 'final_functionality_scores'):
+            assert list(results['node_states'][node_id][scores].items()) == list(state[scores].items())
+
+def test_config_view_round_trips(tmp_path):
+    config = BASE_DESIGNS[0]
+    snapshot = Snapshot(write_snapshot(config, tmp_path / 'design.snap'))
+    assert snapshot['name'] == config['name']
+    assert snapshot['edges'] == config['edges']